@@ -0,0 +1,34 @@
+"""evento aprovado flag
+
+Revision ID: a7c3e5f91d24
+Revises: f1a6d3e8b920
+Create Date: 2026-10-18 18:03:41.518820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f91d24'
+down_revision: Union[str, Sequence[str], None] = 'f1a6d3e8b920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # evento.aprovado nunca era marcado na aprovação; passa a ser o indicador
+    # usado pelos filtros, então os eventos já aprovados são marcados aqui
+    op.execute(
+        sa.text("UPDATE evento SET aprovado = :aprovado WHERE id IN (SELECT evento_id FROM eventoaprovado)")
+        .bindparams(aprovado=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Nada a desfazer: o indicador marcado continua coerente com eventoaprovado
+    pass
@@ -0,0 +1,38 @@
+"""eventos sincronizacao
+
+Revision ID: b3d8f2a6c415
+Revises: a7c3e5f91d24
+Create Date: 2026-10-18 19:26:12.084337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d8f2a6c415'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e5f91d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('eventoremovido',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('evento_id', sa.Integer(), nullable=False),
+    sa.Column('removido_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_eventoremovido_removido_at'), 'eventoremovido', ['removido_at'], unique=False)
+    # Mesma expressão usada por /api/eventos/changes
+    op.create_index('ix_evento_alterado_em', 'evento', [sa.text('coalesce(updated_at, created_at)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_evento_alterado_em', table_name='evento')
+    op.drop_index(op.f('ix_eventoremovido_removido_at'), table_name='eventoremovido')
+    op.drop_table('eventoremovido')
@@ -0,0 +1,84 @@
+"""resumo mensal
+
+Revision ID: b7e2c41a9d3f
+Revises: 44c84f47ed2c
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c41a9d3f'
+down_revision: Union[str, Sequence[str], None] = '44c84f47ed2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Preços vigentes na criação da tabela (service/precos.py); depois disso o
+# resumo é mantido pela aplicação e pode ser recalculado com
+# `python -m service.resumo_service reconstruir`.
+CUSTO_SQL = """
+    CASE WHEN {t}.coffee_break_manha THEN {t}.quantidade_pessoas * 50 ELSE 0 END
+    + CASE WHEN {t}.coffee_break_tarde THEN {t}.quantidade_pessoas * 50 ELSE 0 END
+    + CASE WHEN {t}.almoco THEN {t}.quantidade_pessoas * 70 ELSE 0 END
+    + CASE WHEN {t}.jantar THEN {t}.quantidade_pessoas * 70 ELSE 0 END
+    + CASE WHEN {t}.cerimonial THEN 990 ELSE 0 END
+"""
+
+BACKFILL_SQL = """
+    INSERT INTO resumomensal (
+        variante, mes_previsto, unidade_id, eventos, pessoas, coffee_break_manha,
+        coffee_break_tarde, almoco, jantar, cerimonial, custo
+    )
+    SELECT
+        '{variante}', e.mes_previsto, COALESCE(e.unidade_id, 0), COUNT(*),
+        COALESCE(SUM({t}.quantidade_pessoas), 0),
+        COUNT(*) FILTER (WHERE {t}.coffee_break_manha),
+        COUNT(*) FILTER (WHERE {t}.coffee_break_tarde),
+        COUNT(*) FILTER (WHERE {t}.almoco),
+        COUNT(*) FILTER (WHERE {t}.jantar),
+        COUNT(*) FILTER (WHERE {t}.cerimonial),
+        COALESCE(SUM({custo}), 0)
+    FROM evento e
+    {join}
+    GROUP BY e.mes_previsto, COALESCE(e.unidade_id, 0)
+"""
+
+JOIN_ULTIMA_APROVACAO = """
+    JOIN eventoaprovado a
+      ON a.id = (SELECT MAX(id) FROM eventoaprovado WHERE evento_id = e.id)
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resumomensal',
+        sa.Column('variante', sa.Enum('SOLICITADO', 'APROVADO', name='varianteresumo'), nullable=False),
+        sa.Column('mes_previsto', postgresql.ENUM(name='monthenum', create_type=False), nullable=False),
+        sa.Column('unidade_id', sa.Integer(), nullable=False),
+        sa.Column('eventos', sa.Integer(), nullable=False),
+        sa.Column('pessoas', sa.Integer(), nullable=False),
+        sa.Column('coffee_break_manha', sa.Integer(), nullable=False),
+        sa.Column('coffee_break_tarde', sa.Integer(), nullable=False),
+        sa.Column('almoco', sa.Integer(), nullable=False),
+        sa.Column('jantar', sa.Integer(), nullable=False),
+        sa.Column('cerimonial', sa.Integer(), nullable=False),
+        sa.Column('custo', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('variante', 'mes_previsto', 'unidade_id'),
+    )
+    op.execute(BACKFILL_SQL.format(variante='SOLICITADO', t='e', custo=CUSTO_SQL.format(t='e'), join=''))
+    op.execute(BACKFILL_SQL.format(
+        variante='APROVADO', t='a', custo=CUSTO_SQL.format(t='a'), join=JOIN_ULTIMA_APROVACAO
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resumomensal')
+    sa.Enum(name='varianteresumo').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,59 @@
+"""unidade nome unico
+
+Revision ID: c3f18a7d2b54
+Revises: b7e2c41a9d3f
+Create Date: 2026-10-18 10:02:11.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f18a7d2b54'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c41a9d3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CONTADORES = (
+    "eventos", "pessoas", "coffee_break_manha", "coffee_break_tarde", "almoco", "jantar", "cerimonial", "custo"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Unidades duplicadas (mesmo nome) são fundidas na de menor id
+    op.execute("""
+        CREATE TEMPORARY TABLE unidade_duplicada AS
+        SELECT id, manter FROM (
+            SELECT id, MIN(id) OVER (PARTITION BY nome_unidade) AS manter FROM unidade
+        ) d
+        WHERE id <> manter
+    """)
+    op.execute("""
+        UPDATE evento SET unidade_id = d.manter
+        FROM unidade_duplicada d
+        WHERE evento.unidade_id = d.id
+    """)
+    # Agrupado antes do upsert: com três ou mais unidades de mesmo nome, várias linhas
+    # cairiam na mesma chave e o ON CONFLICT não pode atualizar a mesma linha duas vezes
+    op.execute(f"""
+        INSERT INTO resumomensal (variante, mes_previsto, unidade_id, {", ".join(CONTADORES)})
+        SELECT r.variante, r.mes_previsto, d.manter, {", ".join(f"SUM(r.{c})" for c in CONTADORES)}
+        FROM resumomensal r JOIN unidade_duplicada d ON d.id = r.unidade_id
+        GROUP BY r.variante, r.mes_previsto, d.manter
+        ON CONFLICT (variante, mes_previsto, unidade_id) DO UPDATE SET
+        {", ".join(f"{c} = resumomensal.{c} + excluded.{c}" for c in CONTADORES)}
+    """)
+    op.execute("DELETE FROM resumomensal WHERE unidade_id IN (SELECT id FROM unidade_duplicada)")
+    op.execute("DELETE FROM unidade WHERE id IN (SELECT id FROM unidade_duplicada)")
+    op.execute("DROP TABLE unidade_duplicada")
+    op.create_index(op.f('ix_unidade_nome_unidade'), 'unidade', ['nome_unidade'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_unidade_nome_unidade'), table_name='unidade')
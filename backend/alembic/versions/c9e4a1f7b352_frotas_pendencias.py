@@ -0,0 +1,55 @@
+"""frotas pendencias
+
+Revision ID: c9e4a1f7b352
+Revises: b3d8f2a6c415
+Create Date: 2026-10-18 21:04:37.518220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a1f7b352'
+down_revision: Union[str, Sequence[str], None] = 'b3d8f2a6c415'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PLACA_NORMALIZADA = "UPPER(REPLACE(REPLACE(placa, '-', ''), ' ', ''))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Placas que colidem depois de normalizadas impedem o índice único. Não há
+    # como escolher automaticamente qual cadastro vale (quilometragem, limpeza),
+    # então a migração para e lista os veículos para acerto manual.
+    conflitos = op.get_bind().execute(sa.text(f"""
+        SELECT {PLACA_NORMALIZADA} AS normalizada, id, placa FROM veiculo
+        WHERE {PLACA_NORMALIZADA} IN (
+            SELECT {PLACA_NORMALIZADA} FROM veiculo GROUP BY {PLACA_NORMALIZADA} HAVING COUNT(*) > 1
+        )
+        ORDER BY normalizada, id
+    """)).all()
+    if conflitos:
+        linhas = "\n".join(f"  {normalizada}: veículo {id} (placa {placa!r})" for normalizada, id, placa in conflitos)
+        raise RuntimeError(
+            "Veículos com a mesma placa (ignorando maiúsculas, espaços e hífen). "
+            "Remova ou corrija os cadastros repetidos e rode a migração de novo:\n" + linhas
+        )
+    # Placas no formato gravado pela API (sem espaços nem hífen, maiúsculas)
+    op.execute(f"UPDATE veiculo SET placa = {PLACA_NORMALIZADA}")
+    op.create_index(op.f('ix_veiculo_placa'), 'veiculo', ['placa'], unique=True)
+    op.create_index(op.f('ix_veiculo_ultima_limpeza'), 'veiculo', ['ultima_limpeza'], unique=False)
+    # Mesma expressão usada por /api/frotas/pendencias
+    op.create_index('ix_veiculo_km_restantes', 'veiculo', [sa.text('(proxima_manutencao - quilometragem)')],
+                    unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_veiculo_km_restantes', table_name='veiculo')
+    op.drop_index(op.f('ix_veiculo_ultima_limpeza'), table_name='veiculo')
+    op.drop_index(op.f('ix_veiculo_placa'), table_name='veiculo')
@@ -0,0 +1,75 @@
+"""resumo pessoas por servico
+
+Revision ID: d4b7e2a9c610
+Revises: c9e4a1f7b352
+Create Date: 2026-10-18 23:41:09.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7e2a9c610'
+down_revision: Union[str, Sequence[str], None] = 'c9e4a1f7b352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SERVICOS = ("coffee_break_manha", "coffee_break_tarde", "almoco", "jantar", "cerimonial")
+CONTADORES = ("eventos", "pessoas", *SERVICOS, *[f"pessoas_{servico}" for servico in SERVICOS])
+
+BACKFILL_SQL = """
+    INSERT INTO resumomensal (variante, mes_previsto, unidade_id, {contadores})
+    SELECT
+        '{variante}', e.mes_previsto, COALESCE(e.unidade_id, 0), COUNT(*),
+        COALESCE(SUM({t}.quantidade_pessoas), 0),
+        {contagens},
+        {pessoas}
+    FROM evento e
+    {join}
+    GROUP BY e.mes_previsto, COALESCE(e.unidade_id, 0)
+"""
+
+JOIN_ULTIMA_APROVACAO = """
+    JOIN eventoaprovado a
+      ON a.id = (SELECT MAX(id) FROM eventoaprovado WHERE evento_id = e.id)
+"""
+
+# Preços da migração b7e2c41a9d3f, para devolver a coluna custo no downgrade
+CUSTO_DOWNGRADE_SQL = """
+    UPDATE resumomensal SET custo =
+        pessoas_coffee_break_manha * 50 + pessoas_coffee_break_tarde * 50
+        + pessoas_almoco * 70 + pessoas_jantar * 70 + cerimonial * 990
+"""
+
+
+def _backfill(variante: str, t: str, join: str) -> str:
+    return BACKFILL_SQL.format(
+        variante=variante, t=t, join=join,
+        contadores=", ".join(CONTADORES),
+        contagens=", ".join(f"COUNT(*) FILTER (WHERE {t}.{s})" for s in SERVICOS),
+        pessoas=", ".join(f"COALESCE(SUM({t}.quantidade_pessoas) FILTER (WHERE {t}.{s}), 0)" for s in SERVICOS),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # O custo passa a ser calculado na leitura com os preços atuais
+    for servico in SERVICOS:
+        op.add_column('resumomensal', sa.Column(f'pessoas_{servico}', sa.Integer(), nullable=False,
+                                                server_default='0'))
+    op.drop_column('resumomensal', 'custo')
+    op.execute("DELETE FROM resumomensal")
+    op.execute(_backfill('SOLICITADO', 'e', ''))
+    op.execute(_backfill('APROVADO', 'a', JOIN_ULTIMA_APROVACAO))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('resumomensal', sa.Column('custo', sa.Float(), nullable=False, server_default='0'))
+    op.execute(CUSTO_DOWNGRADE_SQL)
+    for servico in reversed(SERVICOS):
+        op.drop_column('resumomensal', f'pessoas_{servico}')
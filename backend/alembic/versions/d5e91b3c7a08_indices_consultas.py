@@ -0,0 +1,39 @@
+"""indices consultas
+
+Revision ID: d5e91b3c7a08
+Revises: c3f18a7d2b54
+Create Date: 2026-10-18 14:21:47.206113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e91b3c7a08'
+down_revision: Union[str, Sequence[str], None] = 'c3f18a7d2b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_evento_mes_previsto'), 'evento', ['mes_previsto'], unique=False)
+    op.create_index(op.f('ix_evento_unidade_id'), 'evento', ['unidade_id'], unique=False)
+    # Só a aprovação mais recente de cada evento era considerada; as anteriores
+    # saem antes do índice único (o resumo já usa apenas a mais recente)
+    op.execute("""
+        DELETE FROM eventoaprovado
+        WHERE id NOT IN (SELECT MAX(id) FROM eventoaprovado GROUP BY evento_id)
+    """)
+    op.create_index(op.f('ix_eventoaprovado_evento_id'), 'eventoaprovado', ['evento_id'], unique=True)
+    # unidade.nome_unidade já tem índice único desde c3f18a7d2b54
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_eventoaprovado_evento_id'), table_name='eventoaprovado')
+    op.drop_index(op.f('ix_evento_unidade_id'), table_name='evento')
+    op.drop_index(op.f('ix_evento_mes_previsto'), table_name='evento')
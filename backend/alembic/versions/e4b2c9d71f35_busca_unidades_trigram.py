@@ -0,0 +1,40 @@
+"""busca unidades trigram
+
+Revision ID: e4b2c9d71f35
+Revises: d5e91b3c7a08
+Create Date: 2026-10-18 15:08:33.418260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b2c9d71f35'
+down_revision: Union[str, Sequence[str], None] = 'd5e91b3c7a08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # unaccent() é STABLE; o índice de expressão exige uma função IMMUTABLE
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent', $1) $$
+    """)
+    op.execute("""
+        CREATE INDEX ix_unidade_nome_unidade_trgm ON unidade
+        USING gin (f_unaccent(lower(nome_unidade)) gin_trgm_ops)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_unidade_nome_unidade_trgm")
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
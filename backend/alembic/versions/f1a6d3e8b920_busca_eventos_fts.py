@@ -0,0 +1,38 @@
+"""busca eventos fts
+
+Revision ID: f1a6d3e8b920
+Revises: e4b2c9d71f35
+Create Date: 2026-10-18 16:12:05.772431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a6d3e8b920'
+down_revision: Union[str, Sequence[str], None] = 'e4b2c9d71f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Coluna gerada: o Postgres mantém o tsvector atualizado em todo INSERT/UPDATE
+    # (f_unaccent vem de e4b2c9d71f35)
+    op.execute("""
+        ALTER TABLE evento ADD COLUMN busca tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('portuguese', f_unaccent(coalesce(nome, ''))), 'A') ||
+            setweight(to_tsvector('portuguese', f_unaccent(coalesce(nome_solicitante, ''))), 'B') ||
+            setweight(to_tsvector('portuguese', f_unaccent(coalesce(unidade_responsavel, ''))), 'B')
+        ) STORED
+    """)
+    op.create_index('ix_evento_busca', 'evento', ['busca'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_evento_busca', table_name='evento')
+    op.drop_column('evento', 'busca')
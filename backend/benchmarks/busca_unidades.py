@@ -0,0 +1,61 @@
+"""Latência do índice de trigramas em memória usado na busca/autocomplete de unidades.
+
+Gera N nomes de unidade sintéticos (com acentos), carrega o `IndiceNgram` e
+mede a busca de termos curtos (autocomplete) e completos, sem acento.
+
+Uso:
+
+    python benchmarks/busca_unidades.py --unidades 1000 5000 20000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from service.busca_unidades import IndiceNgram, normalizar  # noqa: E402
+
+PREFIXOS = ["Secretaria", "Coordenação", "Diretoria", "Gerência", "Núcleo", "Superintendência"]
+AREAS = [
+    "Saúde", "Educação", "Administração", "Finanças", "Tecnologia da Informação", "Gestão de Pessoas",
+    "Licitações", "Patrimônio", "Comunicação", "Planejamento", "Logística", "Jurídico", "Obras",
+]
+REGIOES = ["Norte", "Sul", "Leste", "Oeste", "Centro", "Metropolitana", "Interior"]
+
+
+def nomes(total: int):
+    aleatorio = random.Random(42)
+    for i in range(total):
+        yield i + 1, f"{aleatorio.choice(PREFIXOS)} de {aleatorio.choice(AREAS)} {aleatorio.choice(REGIOES)} {i}"
+
+
+def main(args) -> None:
+    print(f"{'unidades':>9} {'termo':<28} {'p50 (ms)':>9} {'p99 (ms)':>9} {'resultados':>10}")
+    for total in args.unidades:
+        indice = IndiceNgram()
+        inicio = time.perf_counter()
+        indice.carregar(nomes(total))
+        carga_ms = (time.perf_counter() - inicio) * 1000
+        termos = ["sa", "saude", "coord educ", "tecnologia informacao", "gerencia logistica sul"]
+        for termo in termos:
+            tempos = []
+            for _ in range(args.repeticoes):
+                inicio = time.perf_counter()
+                resultado = indice.buscar(termo, args.limite)
+                tempos.append((time.perf_counter() - inicio) * 1000)
+            tempos.sort()
+            p99 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.99))]
+            print(f"{total:>9} {normalizar(termo):<28} {statistics.median(tempos):>9.3f} {p99:>9.3f} {len(resultado):>10}")
+        print(f"{total:>9} {'(carga do índice)':<28} {carga_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--unidades", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--limite", type=int, default=10)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,255 @@
+"""Teste de carga de todos os endpoints da API, com baseline em JSON para comparar execuções.
+
+Para cada cenário dispara `--requisicoes` requisições com `--clientes` em
+paralelo e mede vazão (req/s) e latência p50/p95/p99. Ids, meses e termos
+variam a cada requisição (amostrados da própria API no início), para que o
+resultado não seja só o cache de respostas; para medir sem o cache, suba a
+API com CACHE_MAX_ENTRADAS=0.
+
+Cenários de escrita (POST/PUT) só rodam com --escritas, pois alteram os dados.
+
+Uso (com a API rodando sobre um banco gerado por benchmarks/gerar_dados.py):
+
+    python benchmarks/carga.py --url http://localhost:2095 --salvar baseline.json
+    python benchmarks/carga.py --comparar baseline.json --tolerancia 15
+    python benchmarks/carga.py --cenarios eventos_listagem eventos_busca --clientes 32
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import httpx
+
+MESES = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro",
+]
+TERMOS_EVENTOS = ["seminario", "saude", "gestao publica", "workshop inov", "reuniao", "formatura", "silva"]
+TERMOS_UNIDADES = ["saude", "secretaria", "coord educ", "logist", "diretoria norte", "tecno"]
+
+
+class Amostras:
+    """Ids e nomes reais do banco, usados para montar as requisições"""
+
+    def __init__(self, eventos, unidades):
+        self.eventos = eventos or [1]
+        self.unidades = unidades or [{"id": 1, "nome_unidade": "Unidade"}]
+
+    @classmethod
+    async def carregar(cls, client: httpx.AsyncClient) -> "Amostras":
+        eventos = (await client.get("/api/eventos", params={"limit": 1000})).json()
+        unidades = (await client.get("/api/unidades/", params={"limit": 1000})).json()
+        return cls([evento["id"] for evento in eventos], unidades)
+
+    def evento_id(self) -> int:
+        return random.choice(self.eventos)
+
+    def unidade(self) -> dict:
+        return random.choice(self.unidades)
+
+
+def formulario(amostras: Amostras, eventos: int) -> dict:
+    nome_unidade = amostras.unidade()["nome_unidade"]
+    return {
+        "nome_unidade": nome_unidade,
+        "nome_solicitante": "Teste de Carga",
+        "eventos": [
+            {
+                "nome": f"Evento de carga {random.randint(1, 10**6)}",
+                "unidade_responsavel": nome_unidade,
+                "nome_solicitante": "Teste de Carga",
+                "quantidade_pessoas": random.randint(5, 200),
+                "mes_previsto": random.choice(MESES),
+                "coffee_break_manha": random.random() < 0.5,
+                "coffee_break_tarde": random.random() < 0.5,
+                "almoco": random.random() < 0.3,
+                "jantar": False,
+                "cerimonial": random.random() < 0.1,
+            }
+            for _ in range(eventos)
+        ],
+    }
+
+
+# nome -> (método, função que recebe as amostras e devolve (path, params, json), escrita?)
+CENARIOS = {
+    "raiz": ("GET", lambda a: ("/", None, None), False),
+    "health": ("GET", lambda a: ("/health", None, None), False),
+    "eventos_listagem": ("GET", lambda a: ("/api/eventos", {"limit": 100}, None), False),
+    "eventos_filtrados": ("GET", lambda a: (
+        "/api/eventos", {"limit": 100, "mes": random.choice(MESES), "unidade_id": a.unidade()["id"]}, None
+    ), False),
+    "eventos_pagina_grande": ("GET", lambda a: ("/api/eventos", {"limit": 2000}, None), False),
+    "eventos_detalhe": ("GET", lambda a: (f"/api/eventos/{a.evento_id()}", None, None), False),
+    "eventos_mes": ("GET", lambda a: (f"/api/eventos/mes/{random.choice(MESES)}", {"limit": 100}, None), False),
+    "eventos_busca": ("GET", lambda a: (
+        "/api/eventos/search", {"q": random.choice(TERMOS_EVENTOS), "limit": 20}, None
+    ), False),
+    "eventos_stats": ("GET", lambda a: ("/api/eventos/stats/resumo", None, None), False),
+    "eventos_stats_aprovados": ("GET", lambda a: ("/api/eventos/stats/resumo/aprovados", None, None), False),
+    "eventos_export_csv": ("GET", lambda a: (
+        "/api/eventos/export/csv", {"unidade_id": a.unidade()["id"]}, None
+    ), False),
+    "unidades_listagem": ("GET", lambda a: ("/api/unidades/", {"limit": 100}, None), False),
+    "unidades_detalhe": ("GET", lambda a: (f"/api/unidades/{a.unidade()['id']}", None, None), False),
+    "unidades_por_nome": ("GET", lambda a: (f"/api/unidades/nome/{a.unidade()['nome_unidade']}", None, None), False),
+    "unidades_busca": ("GET", lambda a: (f"/api/unidades/search/{random.choice(TERMOS_UNIDADES)}", None, None), False),
+    "unidades_autocomplete": ("GET", lambda a: (
+        "/api/unidades/autocomplete", {"q": random.choice(TERMOS_UNIDADES)[:random.randint(2, 6)]}, None
+    ), False),
+    "frotas_listagem": ("GET", lambda a: ("/api/frotas", {"limit": 100}, None), False),
+    "frotas_pendencias": ("GET", lambda a: ("/api/frotas/pendencias", None, None), False),
+    "custos_precos": ("GET", lambda a: ("/api/custos/precos", None, None), False),
+    "custos_eventos": ("GET", lambda a: ("/api/custos/eventos", {"limit": 100}, None), False),
+    "custos_mes": ("GET", lambda a: ("/api/custos/mes", None, None), False),
+    "custos_unidades": ("GET", lambda a: ("/api/custos/unidades", None, None), False),
+    "custos_total": ("GET", lambda a: ("/api/custos/total", None, None), False),
+    "monitoramento_pool": ("GET", lambda a: ("/api/monitoramento/pool", None, None), False),
+    "monitoramento_cache": ("GET", lambda a: ("/api/monitoramento/cache", None, None), False),
+    "eventos_criar": ("POST", lambda a: ("/api/eventos", None, formulario(a, 3)), True),
+    "eventos_lote": ("POST", lambda a: ("/api/eventos/lote", None, [formulario(a, 5) for _ in range(4)]), True),
+    "eventos_atualizar": ("PUT", lambda a: (
+        f"/api/eventos/{a.evento_id()}", None, {"quantidade_pessoas": random.randint(5, 200)}
+    ), True),
+    "eventos_aprovar": ("POST", lambda a: (
+        "/api/eventos/aprovados", None, {"evento_id": a.evento_id(), "quantidade_pessoas": random.randint(5, 200)}
+    ), True),
+    "eventos_aprovar_lote": ("POST", lambda a: (
+        "/api/eventos/aprovados/lote", None,
+        [{"evento_id": evento_id} for evento_id in random.sample(a.eventos, min(500, len(a.eventos)))]
+    ), True),
+    "unidades_criar": ("POST", lambda a: (
+        "/api/unidades/", None, {"nome_unidade": f"Unidade de carga {random.randint(1, 10**9)}"}
+    ), True),
+    "frotas_criar": ("POST", lambda a: ("/api/frotas", None, {
+        "modelo": "Carga", "placa": f"CRG{random.randint(0, 9_999_999):07d}", "quilometragem": 1000,
+        "proxima_manutencao": 5000, "ultima_limpeza": datetime.now().isoformat(),
+    }), True),
+}
+
+
+def percentil(ordenados: list, p: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+async def executar_cenario(client, amostras, metodo, montar, clientes: int, requisicoes: int) -> dict:
+    latencias = []
+    erros = 0
+    restantes = requisicoes
+
+    async def cliente():
+        nonlocal restantes, erros
+        while restantes > 0:
+            restantes -= 1
+            path, params, corpo = montar(amostras)
+            inicio = time.perf_counter()
+            try:
+                response = await client.request(metodo, path, params=params, json=corpo)
+                await response.aread()
+                # Escritas respondem ApiResponse com success=False em vez de status de erro
+                if response.status_code >= 400 or (metodo != "GET" and response.json().get("success") is False):
+                    erros += 1
+            except httpx.HTTPError:
+                erros += 1
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(clientes)))
+    duracao = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "requisicoes": len(latencias),
+        "erros": erros,
+        "req_s": round(len(latencias) / duracao, 2),
+        "p50_ms": round(statistics.median(latencias), 3),
+        "p95_ms": round(percentil(latencias, 95), 3),
+        "p99_ms": round(percentil(latencias, 99), 3),
+        "max_ms": round(latencias[-1], 3),
+    }
+
+
+def comparar(atual: dict, baseline: dict, tolerancia: float) -> int:
+    """Imprime a variação em relação ao baseline e devolve o número de regressões"""
+    regressoes = 0
+    print(f"\n{'cenário':<26} {'req/s':>16} {'p95 (ms)':>20} {'p99 (ms)':>20}")
+    for nome, resultado in atual.items():
+        anterior = baseline.get(nome)
+        if not anterior:
+            continue
+        var_vazao = (resultado["req_s"] / anterior["req_s"] - 1) * 100 if anterior["req_s"] else 0.0
+        var_p95 = (resultado["p95_ms"] / anterior["p95_ms"] - 1) * 100 if anterior["p95_ms"] else 0.0
+        var_p99 = (resultado["p99_ms"] / anterior["p99_ms"] - 1) * 100 if anterior["p99_ms"] else 0.0
+        regressao = var_vazao < -tolerancia or var_p95 > tolerancia
+        regressoes += regressao
+        print(
+            f"{nome:<26} {resultado['req_s']:>9.1f} ({var_vazao:+5.1f}%)"
+            f" {resultado['p95_ms']:>12.2f} ({var_p95:+5.1f}%)"
+            f" {resultado['p99_ms']:>12.2f} ({var_p99:+5.1f}%)"
+            f"{'  REGRESSÃO' if regressao else ''}"
+        )
+    return regressoes
+
+
+async def main(args) -> int:
+    random.seed(args.seed)
+    nomes = args.cenarios or [nome for nome, (_, _, escrita) in CENARIOS.items() if args.escritas or not escrita]
+    desconhecidos = set(nomes) - CENARIOS.keys()
+    if desconhecidos:
+        print(f"Cenários desconhecidos: {', '.join(sorted(desconhecidos))}")
+        return 2
+
+    limits = httpx.Limits(max_connections=args.clientes)
+    resultados = {}
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=120) as client:
+        amostras = await Amostras.carregar(client)
+        print(f"{'cenário':<26} {'req/s':>9} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'erros':>6}")
+        for nome in nomes:
+            metodo, montar, _ = CENARIOS[nome]
+            await executar_cenario(client, amostras, metodo, montar, 1, args.aquecimento)
+            resultado = await executar_cenario(client, amostras, metodo, montar, args.clientes, args.requisicoes)
+            resultados[nome] = resultado
+            print(
+                f"{nome:<26} {resultado['req_s']:>9.1f} {resultado['p50_ms']:>10.2f}"
+                f" {resultado['p95_ms']:>10.2f} {resultado['p99_ms']:>10.2f} {resultado['erros']:>6}"
+            )
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "gerado_em": datetime.now().isoformat(timespec="seconds"),
+                "url": args.url,
+                "clientes": args.clientes,
+                "requisicoes": args.requisicoes,
+                "python": platform.python_version(),
+                "resultados": resultados,
+            }, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nBaseline salvo em {args.salvar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            baseline = json.load(arquivo)["resultados"]
+        regressoes = comparar(resultados, baseline, args.tolerancia)
+        print(f"\n{regressoes} regressão(ões) acima de {args.tolerancia:.0f}%")
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:2095")
+    parser.add_argument("--cenarios", nargs="+", help=f"Subconjunto de: {', '.join(CENARIOS)}")
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--requisicoes", type=int, default=200)
+    parser.add_argument("--aquecimento", type=int, default=5)
+    parser.add_argument("--escritas", action="store_true", help="Incluir os cenários de escrita")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--salvar", help="Arquivo JSON para gravar os resultados (baseline)")
+    parser.add_argument("--comparar", help="Baseline JSON para comparar")
+    parser.add_argument("--tolerancia", type=float, default=20.0, help="Variação (%%) considerada regressão")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,53 @@
+"""Vazão de um endpoint com número crescente de clientes concorrentes.
+
+Com handlers async sobre AsyncSession, a vazão deve crescer com a
+concorrência até saturar o banco/pool; com sessões síncronas dentro de
+`async def` ela fica plana, porque cada consulta bloqueia o event loop.
+
+Uso (com a API rodando):
+
+    python benchmarks/concorrencia.py --url http://localhost:2095 \
+        --path "/api/eventos?limit=100" --clientes 1 2 4 8 16 32
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+async def medir(client: httpx.AsyncClient, path: str, clientes: int, requisicoes: int) -> float:
+    """Dispara `requisicoes` GETs com `clientes` em paralelo e devolve req/s"""
+    restantes = requisicoes
+
+    async def cliente():
+        nonlocal restantes
+        while restantes > 0:
+            restantes -= 1
+            response = await client.get(path)
+            response.raise_for_status()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(clientes)))
+    return requisicoes / (time.perf_counter() - inicio)
+
+
+async def main(args) -> None:
+    limits = httpx.Limits(max_connections=max(args.clientes))
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        await medir(client, args.path, 1, 5)  # aquecimento
+        base = None
+        print(f"{'clientes':>8} {'req/s':>10} {'escala':>8}")
+        for clientes in args.clientes:
+            vazao = await medir(client, args.path, clientes, args.requisicoes)
+            base = base or vazao
+            print(f"{clientes:>8} {vazao:>10.1f} {vazao / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:2095")
+    parser.add_argument("--path", default="/api/eventos?limit=100")
+    parser.add_argument("--clientes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--requisicoes", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
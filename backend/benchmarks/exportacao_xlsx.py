@@ -0,0 +1,65 @@
+"""Memória e tempo da exportação da planilha consolidada (.xlsx).
+
+Gera a planilha a partir do banco de DATABASE_URL (ex.: o populado por
+gerar_dados.py) limitando o número de eventos, e mostra o pico de memória
+residente do processo (RSS) acima do valor de antes da exportação. Com o
+workbook write-only o pico deve ficar estável entre 20 mil e 200 mil linhas.
+
+Uso:
+
+    DATABASE_URL=sqlite:///bench.db python benchmarks/exportacao_xlsx.py --eventos 20000 100000 200000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import engine  # noqa: E402
+from service.export_service import gerar_xlsx, select_planilha  # noqa: E402
+
+
+def rss_mb() -> float:
+    """RSS atual (Linux, /proc/self/statm)"""
+    with open("/proc/self/statm") as f:
+        paginas = int(f.read().split()[1])
+    return paginas * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+async def exportar(total: int, destino: str) -> None:
+    base = rss_mb()
+    pico = base
+    terminou = asyncio.Event()
+
+    async def amostrar():
+        nonlocal pico
+        while not terminou.is_set():
+            pico = max(pico, rss_mb())
+            await asyncio.sleep(0.05)
+
+    amostragem = asyncio.create_task(amostrar())
+    inicio = time.perf_counter()
+    linhas = await gerar_xlsx(select_planilha().limit(total), destino)
+    duracao = time.perf_counter() - inicio
+    terminou.set()
+    await amostragem
+    pico = max(pico, rss_mb())
+    tamanho = os.path.getsize(destino) / 2**20
+    print(f"{linhas:>9} {duracao:>9.1f} {linhas / duracao:>10,.0f} {pico - base:>13.1f} {tamanho:>12.1f}")
+
+
+async def main(args) -> None:
+    print(f"{'eventos':>9} {'tempo (s)':>9} {'linhas/s':>10} {'pico RSS (MB)':>13} {'arquivo (MB)':>12}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for total in args.eventos:
+            await exportar(total, os.path.join(pasta, f"eventos_{total}.xlsx"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eventos", type=int, nargs="+", default=[20_000, 100_000, 200_000])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,208 @@
+"""Popula o banco com dados sintéticos realistas e reproduzíveis (mesma semente, mesmos dados).
+
+Usa o banco de DATABASE_URL (SQLite local ou Postgres já migrado com
+`alembic upgrade head`). As tabelas que faltarem são criadas, como na subida
+da aplicação; o resumo mensal é reconstruído no final.
+
+Uso:
+
+    DATABASE_URL=sqlite:///bench.db python benchmarks/gerar_dados.py \
+        --unidades 2000 --eventos 200000 --aprovados 0.3 --seed 42
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, insert  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from db import engine  # noqa: E402
+from models import (  # noqa: E402
+    Evento, EventoAprovado, EventoRemovido, MonthEnum, ResumoMensal, Unidade, Veiculo
+)
+from service.busca_eventos import criar_indice_fts  # noqa: E402
+from service.evento_service import LOTE_INSERT  # noqa: E402
+from service.resumo_service import reconstruir_resumo  # noqa: E402
+
+PREFIXOS = ["Secretaria", "Coordenação", "Diretoria", "Gerência", "Núcleo", "Superintendência", "Assessoria"]
+AREAS = [
+    "Saúde", "Educação", "Administração", "Finanças", "Tecnologia da Informação", "Gestão de Pessoas",
+    "Licitações", "Patrimônio", "Comunicação", "Planejamento", "Logística", "Jurídico", "Obras",
+    "Assistência Social", "Meio Ambiente", "Cultura", "Esportes", "Segurança", "Transportes", "Turismo",
+]
+REGIOES = ["Norte", "Sul", "Leste", "Oeste", "Centro", "Metropolitana", "Interior", "Litoral"]
+TIPOS_EVENTO = [
+    "Seminário", "Workshop", "Reunião", "Capacitação", "Palestra", "Congresso", "Formatura",
+    "Audiência Pública", "Encontro", "Fórum", "Treinamento", "Cerimônia",
+]
+TEMAS = [
+    "Saúde Mental", "Gestão Pública", "Inovação", "Transparência", "Orçamento", "Planejamento Anual",
+    "Educação Inclusiva", "Segurança do Trabalho", "Sustentabilidade", "Governo Digital", "Compras Públicas",
+]
+NOMES = ["Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+         "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vanessa", "Wagner"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Costa", "Rodrigues", "Almeida",
+              "Nascimento", "Araújo", "Ribeiro", "Carvalho", "Gomes", "Martins", "Rocha"]
+MODELOS = ["Fiat Strada", "VW Gol", "Chevrolet Onix", "Toyota Hilux", "Renault Master", "Fiat Ducato"]
+# Peso de cada mês (mais eventos no segundo semestre)
+PESOS_MESES = [4, 6, 8, 8, 9, 7, 6, 9, 10, 11, 12, 10]
+
+
+def gerar_unidades(aleatorio: random.Random, total: int, agora: datetime):
+    nomes = set()
+    while len(nomes) < total:
+        nome = f"{aleatorio.choice(PREFIXOS)} de {aleatorio.choice(AREAS)}"
+        if aleatorio.random() < 0.8:
+            nome += f" {aleatorio.choice(REGIOES)}"
+        if nome in nomes:
+            nome += f" {len(nomes) + 1}"
+        nomes.add(nome)
+    return [
+        {"nome_unidade": nome, "created_at": agora - timedelta(days=aleatorio.randint(0, 720)), "updated_at": None}
+        for nome in sorted(nomes)
+    ]
+
+
+def gerar_eventos(aleatorio: random.Random, total: int, unidades: dict, agora: datetime):
+    meses = list(MonthEnum)
+    ids_unidades = list(unidades.items())
+    for _ in range(total):
+        nome_unidade, unidade_id = aleatorio.choice(ids_unidades)
+        pessoas = int(min(aleatorio.lognormvariate(3.3, 0.8), 2000)) + 1
+        yield {
+            "nome": f"{aleatorio.choice(TIPOS_EVENTO)} de {aleatorio.choice(TEMAS)}",
+            "unidade_responsavel": nome_unidade,
+            "nome_solicitante": f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)}",
+            "quantidade_pessoas": pessoas,
+            "mes_previsto": aleatorio.choices(meses, PESOS_MESES)[0],
+            "coffee_break_manha": aleatorio.random() < 0.55,
+            "coffee_break_tarde": aleatorio.random() < 0.45,
+            "almoco": aleatorio.random() < 0.3,
+            "jantar": aleatorio.random() < 0.08,
+            "cerimonial": aleatorio.random() < 0.15,
+            "aprovado": False,
+            "unidade_id": unidade_id,
+            "created_at": agora - timedelta(minutes=aleatorio.randint(0, 365 * 24 * 60)),
+            "updated_at": None,
+        }
+
+
+def gerar_aprovacao(aleatorio: random.Random, evento_id: int, evento: dict, agora: datetime) -> dict:
+    """Aprovação com os valores pedidos, às vezes com menos pessoas ou serviços cortados"""
+    return {
+        "evento_id": evento_id,
+        "nome": evento["nome"],
+        "quantidade_pessoas": max(1, int(evento["quantidade_pessoas"] * aleatorio.choice([1, 1, 1, 0.8, 0.5]))),
+        **{
+            servico: evento[servico] and aleatorio.random() < 0.9
+            for servico in ("coffee_break_manha", "coffee_break_tarde", "almoco", "jantar", "cerimonial")
+        },
+        "aprovado_at": agora - timedelta(minutes=aleatorio.randint(0, 180 * 24 * 60)),
+    }
+
+
+def gerar_veiculos(aleatorio: random.Random, total: int, agora: datetime):
+    letras = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    placas = set()
+    for i in range(total):
+        quilometragem = aleatorio.randint(1_000, 250_000)
+        placa = None
+        # Placa é única (ix_veiculo_placa)
+        while placa is None or placa in placas:
+            placa = f"{''.join(aleatorio.choices(letras, k=3))}{i % 10}{aleatorio.choice(letras)}{i % 100:02d}"
+        placas.add(placa)
+        yield {
+            "modelo": aleatorio.choice(MODELOS),
+            "placa": placa,
+            "quilometragem": quilometragem,
+            "proxima_manutencao": quilometragem + aleatorio.randint(-5_000, 10_000),
+            "ultima_limpeza": agora - timedelta(days=aleatorio.randint(0, 90)),
+        }
+
+
+async def inserir_em_lotes(session, tabela, linhas, retornar_id: bool = False) -> list:
+    ids = []
+    lote = []
+
+    async def enviar():
+        statement = insert(tabela).values(lote)
+        if retornar_id:
+            ids.extend((await session.exec(statement.returning(tabela.c.id))).scalars())
+        else:
+            await session.exec(statement)
+        lote.clear()
+
+    for linha in linhas:
+        lote.append(linha)
+        if len(lote) >= LOTE_INSERT:
+            await enviar()
+    if lote:
+        await enviar()
+    return ids
+
+
+async def gerar(args) -> None:
+    aleatorio = random.Random(args.seed)
+    # Referência fixa para que a mesma semente gere exatamente os mesmos dados
+    agora = datetime(2026, 1, 1)
+    inicio = time.perf_counter()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(criar_indice_fts)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        if args.limpar:
+            for modelo in (ResumoMensal, EventoAprovado, EventoRemovido, Evento, Unidade, Veiculo):
+                await session.exec(delete(modelo))
+
+        linhas_unidades = gerar_unidades(aleatorio, args.unidades, agora)
+        ids = await inserir_em_lotes(session, Unidade.__table__, linhas_unidades, retornar_id=True)
+        unidades = {linha["nome_unidade"]: unidade_id for linha, unidade_id in zip(linhas_unidades, ids)}
+        print(f"{len(unidades)} unidades")
+
+        aprovacoes = []
+        total_eventos = 0
+        eventos = gerar_eventos(aleatorio, args.eventos, unidades, agora)
+        while True:
+            lote = [evento for _, evento in zip(range(LOTE_INSERT), eventos)]
+            if not lote:
+                break
+            ids = await inserir_em_lotes(session, Evento.__table__, lote, retornar_id=True)
+            total_eventos += len(ids)
+            aprovacoes.extend(
+                gerar_aprovacao(aleatorio, evento_id, evento, agora)
+                for evento_id, evento in zip(ids, lote)
+                if aleatorio.random() < args.aprovados
+            )
+        print(f"{total_eventos} eventos")
+
+        await inserir_em_lotes(session, EventoAprovado.__table__, aprovacoes)
+        print(f"{len(aprovacoes)} aprovações")
+
+        await inserir_em_lotes(session, Veiculo.__table__, gerar_veiculos(aleatorio, args.veiculos, agora))
+        print(f"{args.veiculos} veículos")
+
+        await reconstruir_resumo(session)
+        await session.commit()
+
+    await engine.dispose()
+    print(f"Concluído em {time.perf_counter() - inicio:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--unidades", type=int, default=2000)
+    parser.add_argument("--eventos", type=int, default=200_000)
+    parser.add_argument("--aprovados", type=float, default=0.3, help="Fração dos eventos com aprovação")
+    parser.add_argument("--veiculos", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--limpar", action="store_true", help="Apagar os dados existentes antes de gerar")
+    asyncio.run(gerar(parser.parse_args()))
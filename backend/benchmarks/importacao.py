@@ -0,0 +1,118 @@
+"""Importação em massa (service/importacao.py) x um formulário por unidade (submit_form).
+
+Gera um CSV sintético com N eventos espalhados por U unidades, com uma
+fração de linhas inválidas, e importa no banco de DATABASE_URL de dois
+jeitos, cada um numa transação desfeita no final (o banco não muda):
+
+- importação: leitura em lotes, validação, upsert de unidades e COPY/INSERT em lote;
+- formularios: o mesmo conteúdo agrupado em FormSubmissionData, um por
+  unidade, gravados como o submit_form grava (inserir_formularios + resumo).
+
+Uso:
+
+    DATABASE_URL=sqlite:///bench.db python benchmarks/importacao.py --eventos 20000 100000 --unidades 500
+"""
+import argparse
+import asyncio
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import SQLModel  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from db import engine  # noqa: E402
+from models import Evento, EventoFormData, FormSubmissionData, MonthEnum  # noqa: E402
+from service.evento_service import inserir_formularios  # noqa: E402
+from service.importacao import importar_eventos  # noqa: E402
+from service.resumo_service import ajustar_resumo  # noqa: E402
+
+CABECALHO = ["Nome", "Unidade Responsável", "Nome Solicitante", "Quantidade Pessoas", "Mês Previsto",
+             "Coffee Break Manhã", "Coffee Break Tarde", "Almoço", "Jantar", "Cerimonial", "Unidade"]
+
+
+def gerar_csv(caminho: str, total: int, unidades: int, invalidas: float, seed: int) -> None:
+    aleatorio = random.Random(seed)
+    meses = [mes.value for mes in MonthEnum]
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(CABECALHO)
+        for i in range(total):
+            unidade = f"Unidade Importada {aleatorio.randrange(unidades)}"
+            pessoas = aleatorio.randint(5, 300) if aleatorio.random() >= invalidas else 0
+            writer.writerow([
+                f"Evento importado {i}", unidade, f"Solicitante {i % 97}", pessoas, aleatorio.choice(meses),
+                *["Sim" if aleatorio.random() < 0.4 else "Não" for _ in range(5)], unidade,
+            ])
+
+
+def ler_formularios(caminho: str) -> list[FormSubmissionData]:
+    """O mesmo CSV agrupado por unidade, como o frontend enviaria"""
+    por_unidade = defaultdict(list)
+    with open(caminho, newline="", encoding="utf-8") as f:
+        leitor = csv.reader(f, delimiter=";")
+        next(leitor)
+        for nome, responsavel, solicitante, pessoas, mes, *servicos, unidade in leitor:
+            if int(pessoas) <= 0:
+                continue
+            por_unidade[unidade].append(EventoFormData(
+                nome=nome, unidade_responsavel=responsavel, nome_solicitante=solicitante,
+                quantidade_pessoas=int(pessoas), mes_previsto=mes,
+                **dict(zip(("coffee_break_manha", "coffee_break_tarde", "almoco", "jantar", "cerimonial"),
+                           (servico == "Sim" for servico in servicos))),
+            ))
+    return [
+        FormSubmissionData(nome_unidade=unidade, nome_solicitante=eventos[0].nome_solicitante, eventos=eventos)
+        for unidade, eventos in por_unidade.items()
+    ]
+
+
+async def por_importacao(caminho: str) -> int:
+    async with AsyncSession(engine) as session:
+        with open(caminho, "rb") as arquivo:
+            resultado = await importar_eventos(session, arquivo, "csv")
+        await session.rollback()
+    return resultado["importados"]
+
+
+async def por_formularios(caminho: str) -> int:
+    total = 0
+    async with AsyncSession(engine) as session:
+        for formulario in ler_formularios(caminho):
+            _, ids = await inserir_formularios(session, [formulario])
+            await ajustar_resumo(session, Evento.id.in_(ids), 1)
+            total += len(ids)
+        await session.rollback()
+    return total
+
+
+async def main(args) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    print(f"banco: {engine.dialect.name}, {args.unidades} unidades, {args.invalidas:.0%} de linhas inválidas")
+    print(f"{'eventos':>9} {'caminho':>12} {'gravados':>9} {'tempo (s)':>9} {'linhas/s':>10}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for total in args.eventos:
+            caminho = os.path.join(pasta, f"eventos_{total}.csv")
+            gerar_csv(caminho, total, args.unidades, args.invalidas, args.seed)
+            for nome, funcao in (("importacao", por_importacao), ("formularios", por_formularios)):
+                inicio = time.perf_counter()
+                gravados = await funcao(caminho)
+                duracao = time.perf_counter() - inicio
+                print(f"{total:>9} {nome:>12} {gravados:>9} {duracao:>9.1f} {total / duracao:>10,.0f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eventos", type=int, nargs="+", default=[20_000, 100_000])
+    parser.add_argument("--unidades", type=int, default=500)
+    parser.add_argument("--invalidas", type=float, default=0.01, help="Fração de linhas com erro")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
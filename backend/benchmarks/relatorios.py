@@ -0,0 +1,88 @@
+"""Renderização de PDFs por unidade: pool de processos x thread do processo da API.
+
+Gera N relatórios sintéticos (sem banco) ao mesmo tempo e mede o tempo total
+e o atraso do event loop enquanto eles são renderizados: é o atraso que
+todas as outras requisições do worker sofreriam. TAREFAS_PROCESSOS=0 é o
+backend local, que renderiza numa thread e disputa o GIL com o event loop.
+
+Uso:
+
+    python benchmarks/relatorios.py --relatorios 8 --eventos 2000 --processos 0 2 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from models import MonthEnum  # noqa: E402
+from service.relatorio_pdf import renderizar_relatorio_unidade  # noqa: E402
+from service.tarefas import SIGLAS_SERVICOS, FilaTarefas  # noqa: E402
+
+
+def dados_sinteticos(unidade: int, total: int) -> dict:
+    meses = [mes.value for mes in MonthEnum]
+    eventos = [
+        (f"Evento {i} da unidade {unidade}", meses[i * 12 // total], 10 + i % 90,
+         i % 2 == 0, i % 3 == 0, i % 4 == 0, i % 5 == 0, i % 7 == 0, i % 3 == 1, 1000.0 + i, 900.0 + i)
+        for i in range(total)
+    ]
+    return {
+        "unidade": f"Unidade {unidade}",
+        "gerado_em": "01/01/2025 00:00",
+        "meses": meses,
+        "servicos": {sigla: servico for servico, sigla in SIGLAS_SERVICOS.items()},
+        "eventos": eventos,
+    }
+
+
+async def medir(processos: int, relatorios: int, eventos: int, pasta: str) -> None:
+    fila = FilaTarefas(Path(pasta), 3600, processos, relatorios)
+    atrasos = []
+    terminou = asyncio.Event()
+
+    async def amostrar():
+        while not terminou.is_set():
+            inicio = time.perf_counter()
+            await asyncio.sleep(0.01)
+            atrasos.append((time.perf_counter() - inicio - 0.01) * 1000)
+
+    # Aquece o pool (criação dos processos) fora da medição
+    await asyncio.gather(*[
+        fila.renderizar(renderizar_relatorio_unidade, dados_sinteticos(0, 10), os.path.join(pasta, f"aquece{n}.pdf"))
+        for n in range(max(processos, 1))
+    ])
+    amostragem = asyncio.create_task(amostrar())
+    inicio = time.perf_counter()
+    await asyncio.gather(*[
+        fila.renderizar(renderizar_relatorio_unidade, dados_sinteticos(n, eventos), os.path.join(pasta, f"{n}.pdf"))
+        for n in range(relatorios)
+    ])
+    duracao = time.perf_counter() - inicio
+    terminou.set()
+    await amostragem
+    fila.encerrar()
+    atrasos.sort()
+    p99 = atrasos[int(len(atrasos) * 0.99)] if atrasos else 0
+    print(f"{processos:>9} {duracao:>9.2f} {relatorios / duracao:>11.2f} {p99:>15.1f} {atrasos[-1] if atrasos else 0:>15.1f}")
+
+
+def main(args) -> None:
+    print(f"{args.relatorios} relatórios de {args.eventos} eventos")
+    print(f"{'processos':>9} {'tempo (s)':>9} {'relat./s':>11} {'p99 atraso (ms)':>15} {'max atraso (ms)':>15}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for processos in args.processos:
+            asyncio.run(medir(processos, args.relatorios, args.eventos, pasta))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--relatorios", type=int, default=8)
+    parser.add_argument("--eventos", type=int, default=2000)
+    parser.add_argument("--processos", type=int, nargs="+", default=[0, 2, 4])
+    main(parser.parse_args())
@@ -0,0 +1,127 @@
+"""Serialização das listagens de eventos: caminho antigo x caminho atual.
+
+Monta N linhas (Evento + Unidade + EventoAprovado em metade delas) em memória
+e mede linhas/s de:
+
+- antes: model_dump + EventoWithUnidade(**) por linha, depois a validação do
+  response_model pelo FastAPI (serialize_response) e o json.dumps do JSONResponse;
+- depois: dict direto dos atributos do ORM (to_evento_with_unidade), com os
+  valores efetivos já resolvidos pela consulta, + orjson.
+
+Os dois JSONs são comparados no final para garantir que a resposta não mudou.
+
+Uso:
+
+    python benchmarks/serializacao.py --linhas 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from models import Evento, EventoAprovado, EventoWithUnidade, MonthEnum, Unidade  # noqa: E402
+from service.evento_service import CAMPOS_APROVADOS, to_evento_with_unidade  # noqa: E402
+from service.serializacao import resposta_json  # noqa: E402
+
+
+def gerar_linhas(total: int, total_unidades: int = 500):
+    agora = datetime(2026, 1, 1, 12, 30, 15, 123456)
+    meses = list(MonthEnum)
+    unidades = [
+        Unidade(id=i + 1, nome_unidade=f"Secretaria de Saúde {i}", created_at=agora - timedelta(days=i))
+        for i in range(total_unidades)
+    ]
+    linhas = []
+    for i in range(total):
+        unidade = unidades[i % total_unidades]
+        evento = Evento(
+            id=i + 1, nome=f"Seminário de Gestão {i}", unidade_responsavel=unidade.nome_unidade,
+            nome_solicitante="Ana Silva", quantidade_pessoas=10 + i % 300, mes_previsto=meses[i % 12],
+            coffee_break_manha=bool(i % 2), almoco=bool(i % 3), aprovado=False,
+            unidade_id=unidade.id, created_at=agora - timedelta(minutes=i),
+        )
+        evento.unidade = unidade
+        aprovado = None
+        if i % 2:
+            evento.aprovado = True
+            aprovado = EventoAprovado(
+                id=i, evento_id=evento.id, nome=evento.nome, quantidade_pessoas=evento.quantidade_pessoas // 2,
+                coffee_break_manha=True, coffee_break_tarde=False, almoco=False, jantar=False, cerimonial=False,
+            )
+        linhas.append((evento, aprovado))
+    return linhas
+
+
+def antigo_to_evento_with_unidade(evento, aprovado=None) -> EventoWithUnidade:
+    """Cópia do caminho anterior: model_dump + validação do modelo de resposta"""
+    evento_dict = evento.model_dump()
+    if aprovado:
+        for campo in CAMPOS_APROVADOS:
+            evento_dict[campo] = getattr(aprovado, campo)
+        evento_dict["aprovado"] = True
+    if evento.unidade:
+        evento_dict["unidade"] = evento.unidade.model_dump()
+    return EventoWithUnidade(**evento_dict)
+
+
+def antes(linhas) -> bytes:
+    campo = create_model_field("resposta", List[EventoWithUnidade], mode="serialization")
+    itens = [antigo_to_evento_with_unidade(evento, aprovado) for evento, aprovado in linhas]
+    conteudo = asyncio.run(serialize_response(field=campo, response_content=itens, is_coroutine=True))
+    return JSONResponse(conteudo).body
+
+
+def valores_efetivos(linhas):
+    """O que o COALESCE de select_eventos_com_aprovacao devolve junto de cada evento"""
+    return [
+        (evento, tuple(getattr(aprovado or evento, campo) for campo in CAMPOS_APROVADOS))
+        for evento, aprovado in linhas
+    ]
+
+
+def depois(linhas) -> bytes:
+    unidades = {}
+    itens = [to_evento_with_unidade(evento, efetivos, unidades) for evento, efetivos in linhas]
+    return resposta_json(itens).body
+
+
+def medir(funcao, linhas, repeticoes: int):
+    melhor, corpo = float("inf"), b""
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        corpo = funcao(linhas)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, corpo
+
+
+def main(args) -> None:
+    linhas = gerar_linhas(args.linhas)
+    tempo_antes, corpo_antes = medir(antes, linhas, args.repeticoes)
+    tempo_depois, corpo_depois = medir(depois, valores_efetivos(linhas), args.repeticoes)
+
+    print(f"{'caminho':<8} {'tempo (s)':>10} {'linhas/s':>12} {'bytes':>12}")
+    for nome, tempo, corpo in (("antes", tempo_antes, corpo_antes), ("depois", tempo_depois, corpo_depois)):
+        print(f"{nome:<8} {tempo:>10.3f} {args.linhas / tempo:>12,.0f} {len(corpo):>12,}")
+    print(f"ganho: {tempo_antes / tempo_depois:.1f}x")
+
+    if json.loads(corpo_antes) != json.loads(corpo_depois):
+        sys.exit("ERRO: as respostas antes e depois são diferentes")
+    print("respostas idênticas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+"""Custo de publicação do hub de SSE com milhares de clientes conectados.
+
+Conecta N clientes em memória (sem HTTP e sem banco), dos quais uma fração
+nunca lê a fila (clientes lentos), publica M deltas e mede o tempo de cada
+publicação, quantas mensagens os clientes ativos receberam e quantos lentos
+foram descartados.
+
+Uso:
+
+    python benchmarks/transmissao.py --clientes 1000 5000 10000 --lentos 0.01
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from service.transmissao import TAMANHO_FILA, HubResumo, formatar_sse  # noqa: E402
+
+
+async def medir(total: int, fracao_lentos: float, mensagens: int, intervalo: float) -> None:
+    hub = HubResumo()
+    hub.totais = {}  # retrato já em memória: assinar não consulta o banco
+    recebidas = 0
+    lentos = int(total * fracao_lentos)
+
+    async def cliente(ativo: bool):
+        nonlocal recebidas
+        stream = hub.assinar()
+        await stream.__anext__()  # retrato inicial
+        if not ativo:
+            await asyncio.sleep(3600)
+        async for _ in stream:
+            recebidas += 1
+
+    tarefas = [asyncio.create_task(cliente(i >= lentos)) for i in range(total)]
+    await asyncio.sleep(0)
+    while len(hub.assinantes) < total:
+        await asyncio.sleep(0.01)
+
+    tempos = []
+    for seq in range(1, mensagens + 1):
+        mensagem = formatar_sse("delta", {"seq": seq, "deltas": {"solicitado": {"Março": {"eventos": 1}}}}, seq)
+        inicio = time.perf_counter()
+        hub.publicar(mensagem)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        await asyncio.sleep(intervalo)  # as escritas chegam espaçadas (SSE_AGRUPAR_MS)
+
+    await asyncio.sleep(0.1)
+    for tarefa in tarefas:
+        tarefa.cancel()
+    await asyncio.gather(*tarefas, return_exceptions=True)
+    tempos.sort()
+    print(
+        f"{total:>8} {lentos:>6} {statistics.median(tempos):>12.3f} {tempos[-1]:>12.3f} "
+        f"{recebidas / (total - lentos):>10.1f} {hub.descartados:>11}"
+    )
+
+
+def main(args) -> None:
+    print(f"fila por cliente: {TAMANHO_FILA} mensagens, {args.mensagens} publicações")
+    print(f"{'clientes':>8} {'lentos':>6} {'p50 pub (ms)':>12} {'max pub (ms)':>12} {'msg/ativo':>10} {'descartados':>11}")
+    for total in args.clientes:
+        asyncio.run(medir(total, args.lentos, args.mensagens, args.intervalo_ms / 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--lentos", type=float, default=0.01, help="Fração de clientes que nunca leem")
+    parser.add_argument("--mensagens", type=int, default=100)
+    parser.add_argument("--intervalo-ms", type=float, default=10, help="Intervalo entre publicações")
+    main(parser.parse_args())
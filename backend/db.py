@@ -1,21 +1,70 @@
 import os
-from sqlmodel import Session, create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from dotenv import load_dotenv
 
+from service.pool_metrics import InstrumentedAsyncPool, instrumentar
+from service.profiling import instrumentar_sql
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Converte postgres:// para postgresql:// para usar psycopg2
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(
-    DATABASE_URL, 
-    echo=True,
-    pool_pre_ping=True,
+
+def async_database_url(url: str) -> str:
+    """Troca o driver síncrono da URL pelo equivalente assíncrono (asyncpg / aiosqlite).
+
+    O alembic continua usando DATABASE_URL com o driver síncrono.
+    """
+    if url.startswith("postgresql://") or url.startswith("postgresql+psycopg2://"):
+        url = "postgresql+asyncpg://" + url.split("://", 1)[1]
+        # asyncpg não entende sslmode
+        return url.replace("sslmode=", "ssl=")
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def env_bool(nome: str, padrao: bool) -> bool:
+    return os.getenv(nome, str(padrao)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def pool_options(url: str) -> dict:
+    """Configuração do pool vinda do ambiente (SQLite em memória usa StaticPool, sem tamanho)"""
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith("sqlite+aiosqlite:")):
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+
+
+ASYNC_DATABASE_URL = async_database_url(DATABASE_URL)
+
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=env_bool("DB_ECHO", False),
+    pool_pre_ping=env_bool("DB_POOL_PRE_PING", True),
+    **pool_options(ASYNC_DATABASE_URL),
 )
+instrumentar(engine)
+instrumentar_sql(engine)
+
+
+async def get_session():
+    # expire_on_commit=False: atributos lidos depois do commit não disparam I/O implícito
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
 
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+# insert() com ON CONFLICT (upsert) do dialeto em uso
+if engine.dialect.name == "postgresql":
+    from sqlalchemy.dialects.postgresql import insert as upsert_insert
+else:
+    from sqlalchemy.dialects.sqlite import insert as upsert_insert
@@ -0,0 +1,70 @@
+"""Importa eventos de um .csv ou .xlsx direto no banco de DATABASE_URL (já migrado).
+
+Mesmas regras de POST /api/eventos/importar, sem limite de tamanho do
+upload. As linhas rejeitadas vão, todas, para o relatório --erros (CSV com
+aba, linha e mensagens); o resumo da importação sai no terminal.
+
+Uso:
+
+    DATABASE_URL=postgresql://... python importar.py eventos.xlsx --erros rejeitadas.csv
+    DATABASE_URL=sqlite:///local.db python importar.py eventos.csv --simular
+"""
+import argparse
+import asyncio
+import csv
+import sys
+import time
+from contextlib import nullcontext
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import engine
+from service.importacao import ArquivoInvalido, formato_arquivo, importar_eventos
+
+
+async def main(args) -> int:
+    with open(args.arquivo, "rb") as arquivo, (
+        open(args.erros, "w", newline="", encoding="utf-8") if args.erros else nullcontext()
+    ) as saida_erros:
+        registrar_erro = None
+        if saida_erros is not None:
+            writer = csv.writer(saida_erros)
+            writer.writerow(["aba", "linha", "erros"])
+
+            def registrar_erro(erro: dict) -> None:
+                writer.writerow([erro.get("aba", ""), erro["linha"], "; ".join(erro["erros"])])
+
+        inicio = time.perf_counter()
+        async with AsyncSession(engine) as session:
+            try:
+                resultado = await importar_eventos(
+                    session, arquivo, formato_arquivo(args.arquivo), args.simular, registrar_erro
+                )
+            except ArquivoInvalido as e:
+                print(f"Arquivo inválido: {e}", file=sys.stderr)
+                return 2
+            if args.simular:
+                await session.rollback()
+            else:
+                await session.commit()
+        duracao = time.perf_counter() - inicio
+    await engine.dispose()
+
+    acao = "seriam importados" if args.simular else "importados"
+    print(f"{resultado['importados']} eventos {acao} em {duracao:.1f}s "
+          f"({resultado['importados'] / duracao:,.0f} linhas/s)")
+    print(f"{len(resultado['unidades_criadas'])} unidades novas, {resultado['rejeitados']} linhas rejeitadas")
+    if resultado["rejeitados"] and not args.erros:
+        for erro in resultado["erros"][:20]:
+            print(f"  {erro.get('aba', '')}{' ' if erro.get('aba') else ''}linha {erro['linha']}: "
+                  f"{'; '.join(erro['erros'])}")
+        print("  (use --erros arquivo.csv para o relatório completo)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivo", help="Arquivo .csv ou .xlsx")
+    parser.add_argument("--erros", help="Grava o relatório de linhas rejeitadas neste CSV")
+    parser.add_argument("--simular", action="store_true", help="Só valida e conta, sem gravar")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -1,17 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import SQLModel
 
 from db import engine
-from routers import evento, unidade, frotas
+from routers import evento, unidade, frotas, custos, monitoramento, relatorios
+from service.busca_eventos import criar_indice_fts
+from service.paginacao import NEXT_CURSOR_HEADER
+from service.profiling import PerfilMiddleware
+from service.tarefas import fila_tarefas
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Criar tabelas no banco
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(criar_indice_fts)
+    # Relatórios expirados enquanto a API estava parada
+    fila_tarefas.limpar()
+    yield
+    fila_tarefas.encerrar()
+    await engine.dispose()
 
-# Criar tabelas no banco
-SQLModel.metadata.create_all(engine)
 
 app = FastAPI(
     title="SEAD Calendario Eventos API",
     description="API for managing events in SEAD",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configurar CORS para permitir requisições do frontend
@@ -27,12 +45,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing"],
 )
 
+# Server-Timing e log de requisições lentas / com muitas consultas
+app.add_middleware(PerfilMiddleware)
+
 # Incluir as rotas
 app.include_router(evento.router)
 app.include_router(unidade.router)
 app.include_router(frotas.router)
+app.include_router(custos.router)
+app.include_router(monitoramento.router)
+app.include_router(relatorios.router)
 
 # Rota de health check
 @app.get("/")
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List
+from sqlalchemy import Index, func
 from sqlmodel import SQLModel, Field, Relationship
 from enum import Enum
 from zoneinfo import ZoneInfo
@@ -32,6 +33,7 @@ class UnidadeBase(SQLModel):
 
 class Unidade(UnidadeBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+    nome_unidade: str = Field(max_length=255, unique=True, index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = Field(default=None)
     
@@ -53,6 +55,11 @@ class UnidadeUpdate(SQLModel):
     nome_unidade: Optional[str] = None
 
 
+class UnidadeSugestao(SQLModel):
+    id: int
+    nome_unidade: str
+
+
 # Modelo base para Evento
 class EventoBase(SQLModel):
     nome: str = Field(max_length=255)
@@ -69,7 +76,8 @@ class EventoBase(SQLModel):
 
 class Evento(EventoBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    unidade_id: Optional[int] = Field(default=None, foreign_key="unidade.id")
+    mes_previsto: MonthEnum = Field(index=True)
+    unidade_id: Optional[int] = Field(default=None, foreign_key="unidade.id", index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = Field(default=None)
     
@@ -78,7 +86,7 @@ class Evento(EventoBase, table=True):
 
 class EventoAprovado(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    evento_id: int = Field(foreign_key="evento.id")
+    evento_id: int = Field(foreign_key="evento.id", unique=True, index=True)
     nome: str = Field(max_length=255)  
     quantidade_pessoas: int
     coffee_break_manha: bool
@@ -88,6 +96,18 @@ class EventoAprovado(SQLModel, table=True):
     cerimonial: bool
     aprovado_at: datetime = Field(default_factory=brasilia_now)
 
+
+# Momento da última alteração do evento, usado pela sincronização incremental
+Index("ix_evento_alterado_em", func.coalesce(Evento.updated_at, Evento.created_at))
+
+
+class EventoRemovido(SQLModel, table=True):
+    """Registro (tombstone) de evento deletado, para a sincronização incremental"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    evento_id: int
+    removido_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
 class EventoCreate(EventoBase):
     unidade_id: Optional[int] = None
 
@@ -112,6 +132,18 @@ class EventoUpdate(SQLModel):
     cerimonial: Optional[bool] = None
     aprovado: Optional[bool] = None
 
+class AprovacaoLoteItem(SQLModel):
+    """Evento a aprovar; campos omitidos ficam com o valor solicitado"""
+    evento_id: int
+    nome: Optional[str] = None
+    quantidade_pessoas: Optional[int] = Field(default=None, gt=0)
+    coffee_break_manha: Optional[bool] = None
+    coffee_break_tarde: Optional[bool] = None
+    almoco: Optional[bool] = None
+    jantar: Optional[bool] = None
+    cerimonial: Optional[bool] = None
+
+
 class EventoFormData(SQLModel):
     nome: str
     unidade_responsavel: str
@@ -132,10 +164,41 @@ class FormSubmissionData(SQLModel):
 
 
 # Schemas de resposta
+class FiltrosEvento(SQLModel):
+    mes: Optional[MonthEnum] = None
+    unidade_id: Optional[int] = None
+    aprovado: Optional[bool] = None
+    solicitante: Optional[str] = None
+    data_inicio: Optional[datetime] = None
+    data_fim: Optional[datetime] = None
+
+
+class SelecaoEventos(FiltrosEvento):
+    """Eventos de uma operação em lote: por ids e/ou pelos filtros da listagem"""
+    ids: Optional[List[int]] = None
+
+
+class EventoLoteUpdate(SQLModel):
+    selecao: SelecaoEventos
+    valores: EventoUpdate
+
+
 class EventoWithUnidade(EventoRead):
     unidade: Optional[UnidadeRead] = None
 
 
+class EventoRemovidoRead(SQLModel):
+    evento_id: int
+    removido_at: datetime
+
+
+class EventoAlteracoes(SQLModel):
+    eventos: List[EventoWithUnidade]
+    removidos: List[EventoRemovidoRead]
+    token: str
+    mais: bool
+
+
 class UnidadeWithEventos(UnidadeRead):
     eventos: List[EventoRead] = []
 
@@ -147,9 +210,101 @@ class EventoStats(SQLModel):
     eventos_por_mes: dict[str, int]
     pessoas_por_mes: dict[str, int]
     servicos_mais_solicitados: dict[str, int]
+    custo_por_mes: dict[str, float] = {}
+
+
+class VarianteResumo(str, Enum):
+    SOLICITADO = "solicitado"
+    APROVADO = "aprovado"
+
+
+class ResumoMensal(SQLModel, table=True):
+    """Totais por mês e unidade mantidos a cada escrita em evento/aprovação.
+
+    unidade_id = 0 agrupa eventos sem unidade. O custo não é gravado: sai das
+    contagens e das pessoas por serviço com os preços atuais (custo_resumo).
+    """
+    variante: VarianteResumo = Field(primary_key=True)
+    mes_previsto: MonthEnum = Field(primary_key=True)
+    unidade_id: int = Field(primary_key=True)
+    eventos: int = Field(default=0)
+    pessoas: int = Field(default=0)
+    coffee_break_manha: int = Field(default=0)
+    coffee_break_tarde: int = Field(default=0)
+    almoco: int = Field(default=0)
+    jantar: int = Field(default=0)
+    cerimonial: int = Field(default=0)
+    pessoas_coffee_break_manha: int = Field(default=0)
+    pessoas_coffee_break_tarde: int = Field(default=0)
+    pessoas_almoco: int = Field(default=0)
+    pessoas_jantar: int = Field(default=0)
+    pessoas_cerimonial: int = Field(default=0)
 
 
 # Schema para resposta de API padronizada
+class Preco(SQLModel):
+    servico: str
+    descricao: str
+    valor: float
+    por_pessoa: bool
+
+
+class CustoEvento(SQLModel):
+    id: int
+    nome: str
+    mes_previsto: MonthEnum
+    unidade_id: Optional[int] = None
+    custo_solicitado: float
+    custo_aprovado: Optional[float] = None
+
+
+class CustoTotal(SQLModel):
+    eventos: int
+    custo_solicitado: float
+    eventos_aprovados: int
+    custo_aprovado: float
+
+
+class CustoMes(CustoTotal):
+    mes_previsto: MonthEnum
+
+
+class CustoUnidade(CustoTotal):
+    unidade_id: Optional[int] = None
+    nome_unidade: Optional[str] = None
+
+
+# Relatórios gerados em segundo plano
+class TipoRelatorio(str, Enum):
+    PDF_UNIDADE = "pdf_unidade"
+    XLSX = "xlsx"
+
+
+class StatusTarefa(str, Enum):
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDA = "concluida"
+    ERRO = "erro"
+
+
+class RelatorioPedido(SQLModel):
+    """pdf_unidade exige filtros.unidade_id; xlsx aceita os mesmos filtros da listagem"""
+    tipo: TipoRelatorio
+    filtros: FiltrosEvento = Field(default_factory=FiltrosEvento)
+
+
+class TarefaRead(SQLModel):
+    id: str
+    tipo: TipoRelatorio
+    status: StatusTarefa
+    criada_em: datetime
+    concluida_em: Optional[datetime] = None
+    do_cache: bool = False
+    arquivo: Optional[str] = None
+    tamanho: Optional[int] = None
+    erro: Optional[str] = None
+
+
 class ApiResponse(SQLModel):
     success: bool
     message: Optional[str] = None
@@ -157,11 +312,44 @@ class ApiResponse(SQLModel):
     errors: Optional[dict] = None
 
 #region Frotas
-class Veiculo (SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
+class VeiculoBase(SQLModel):
     modelo: str = Field(max_length=255)
     placa: str = Field(max_length=10)
     quilometragem: int
-    proxima_manutencao: int  
-    ultima_limpeza: datetime 
+    proxima_manutencao: int
+    ultima_limpeza: datetime
+
+
+class Veiculo(VeiculoBase, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    placa: str = Field(max_length=10, unique=True, index=True)
+    ultima_limpeza: datetime = Field(index=True)
+
+
+# Km até a próxima manutenção: filtro e ordenação de /api/frotas/pendencias
+Index("ix_veiculo_km_restantes", Veiculo.proxima_manutencao - Veiculo.quilometragem)
+
+
+class VeiculoCreate(VeiculoBase):
+    quilometragem: int = Field(ge=0)
+    proxima_manutencao: int = Field(ge=0)
+
+
+class VeiculoRead(VeiculoBase):
+    id: int
+
+
+class StatusPendencia(str, Enum):
+    VENCIDA = "vencida"
+    PROXIMA = "proxima"
+    EM_DIA = "em_dia"
+
+
+class VeiculoPendencia(VeiculoRead):
+    km_restantes: int
+    dias_desde_limpeza: int
+    manutencao: StatusPendencia
+    limpeza: StatusPendencia
+    # Fração da margem de aviso que ainda resta (a menor entre manutenção e limpeza); negativa = vencida
+    urgencia: float
 #endregion
\ No newline at end of file
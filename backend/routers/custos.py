@@ -0,0 +1,52 @@
+from typing import List
+from fastapi import APIRouter, Depends, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import get_session
+from models import CustoEvento, CustoMes, CustoTotal, CustoUnidade, Evento, FiltrosEvento, Preco
+from service.custo_service import (
+    custo_total, custos_eventos, custos_por_mes, custos_por_unidade, select_custos_eventos
+)
+from service.paginacao import Paginacao, fechar_pagina, get_paginacao, paginar
+from service.precos import PRECOS
+from service.serializacao import resposta_json
+from service.profiling import RotaPerfilada
+
+router = APIRouter(prefix="/api/custos", tags=["custos"], route_class=RotaPerfilada)
+
+
+@router.get("/precos", response_model=List[Preco])
+async def get_precos():
+    """Tabela de preços vigente"""
+    return list(PRECOS.values())
+
+
+@router.get("/eventos", response_model=List[CustoEvento])
+async def get_custos_eventos(
+    response: Response,
+    filtros: FiltrosEvento = Depends(),
+    paginacao: Paginacao = Depends(get_paginacao),
+    session: AsyncSession = Depends(get_session)
+):
+    """Custo solicitado e aprovado de cada evento (paginado, próxima página em X-Next-Cursor)"""
+    statement = paginar(select_custos_eventos(filtros), Evento.id, paginacao)
+    custos = fechar_pagina(await custos_eventos(session, statement), paginacao, response)
+    return resposta_json(custos, response)
+
+
+@router.get("/mes", response_model=List[CustoMes])
+async def get_custos_por_mes(filtros: FiltrosEvento = Depends(), session: AsyncSession = Depends(get_session)):
+    """Custos solicitado e aprovado por mês"""
+    return await custos_por_mes(session, filtros)
+
+
+@router.get("/unidades", response_model=List[CustoUnidade])
+async def get_custos_por_unidade(filtros: FiltrosEvento = Depends(), session: AsyncSession = Depends(get_session)):
+    """Custos solicitado e aprovado por unidade"""
+    return await custos_por_unidade(session, filtros)
+
+
+@router.get("/total", response_model=CustoTotal)
+async def get_custo_total(filtros: FiltrosEvento = Depends(), session: AsyncSession = Depends(get_session)):
+    """Custo total solicitado e aprovado"""
+    return await custo_total(session, filtros)
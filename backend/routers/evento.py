@@ -1,151 +1,288 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlmodel import Session, select
+import os
+import tempfile
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response, File, UploadFile
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime
-import csv
-from fastapi.responses import StreamingResponse
-from io import StringIO
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import delete, update
 
 from db import get_session
 from models import (
     Evento, EventoCreate, EventoRead, EventoUpdate, EventoWithUnidade,
     FormSubmissionData, EventoFormData, MonthEnum, ApiResponse, EventoStats,
-    Unidade, EventoAprovado
+    Unidade, EventoAprovado, FiltrosEvento, VarianteResumo, AprovacaoLoteItem, SelecaoEventos,
+    EventoLoteUpdate, EventoAlteracoes
 )
+from service.evento_service import (
+    aplicar_filtros, inserir_formularios, listar_eventos, select_eventos_com_aprovacao,
+    montar_aprovacoes, select_exportacao, upsert_aprovacoes, aprovar_solicitados, blocos, condicao_selecao,
+    remover_aprovacoes, travar_eventos
+)
+from service.export_service import gerar_csv, gerar_xlsx, select_planilha
+from service.importacao import ArquivoInvalido, formato_arquivo, importar_eventos
+from service.resumo_service import ajustar_resumo
+from service.serializacao import resposta_json
+from service.stats_service import calcular_stats, calcular_stats_aprovados
+from service.paginacao import (
+    MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, PAGE_SIZE, Paginacao, fechar_pagina, get_paginacao, paginar
+)
+from service.busca_eventos import buscar_eventos
+from service.sincronizacao import buscar_alteracoes, registrar_remocoes
+from service.transmissao import hub_resumo
+from service.cache import RotaCacheada, cacheado, invalidar
 
-router = APIRouter(prefix="/api/eventos", tags=["eventos"])
+router = APIRouter(prefix="/api/eventos", tags=["eventos"], route_class=RotaCacheada)
 
+# Itens aceitos por chamada de aprovação em lote
+MAX_APROVACOES_LOTE = 5000
 
-@router.post("", response_model=ApiResponse)
-async def submit_form(form_data: FormSubmissionData, session: Session = Depends(get_session)):
-    """Submeter formulário completo com unidade e eventos"""
-    try:
-        # Verificar se unidade já existe
-        statement = select(Unidade).where(Unidade.nome_unidade == form_data.nome_unidade)
-        existing_unidade = session.exec(statement).first()
-        
-        if existing_unidade:
-            unidade = existing_unidade
-        else:
-            # Criar nova unidade
-            unidade = Unidade(nome_unidade=form_data.nome_unidade)
-            session.add(unidade)
-            session.commit()
-            session.refresh(unidade)
-        
-        # Criar eventos
-        eventos_criados = []
+# Tabelas lidas pelas consultas de eventos (listagens, detalhe e estatísticas)
+TABELAS_EVENTOS = ("evento", "eventoaprovado", "unidade")
+
+
+def validar_meses(formularios: List[FormSubmissionData]) -> None:
+    """Converter string do mês para enum antes de gravar qualquer linha"""
+    for form_data in formularios:
         for evento_data in form_data.eventos:
-            # Converter string do mês para enum
             try:
-                mes_enum = MonthEnum(evento_data.mes_previsto)
+                MonthEnum(evento_data.mes_previsto)
             except ValueError:
                 raise HTTPException(
                     status_code=400, 
                     detail=f"Mês inválido: {evento_data.mes_previsto}"
                 )
-            
-            evento = Evento(
-                nome=evento_data.nome,
-                unidade_responsavel=evento_data.unidade_responsavel,
-                nome_solicitante=evento_data.nome_solicitante,  # Incluir nome do solicitante
-                quantidade_pessoas=evento_data.quantidade_pessoas,
-                mes_previsto=mes_enum,
-                coffee_break_manha=evento_data.coffee_break_manha,
-                coffee_break_tarde=evento_data.coffee_break_tarde,
-                almoco=evento_data.almoco,
-                jantar=evento_data.jantar,
-                cerimonial=evento_data.cerimonial,
-                unidade_id=unidade.id
-            )
-            
-            session.add(evento)
-            eventos_criados.append(evento)
-        
-        session.commit()
+
+
+def exigir_selecao(selecao: SelecaoEventos):
+    """Condição da seleção em lote; sem ids nem filtros a operação atingiria todos os eventos"""
+    filtro = condicao_selecao(selecao)
+    if filtro is None:
+        raise HTTPException(status_code=400, detail="Informe ids ou ao menos um filtro")
+    return filtro
+
+
+async def salvar_formularios(session: AsyncSession, formularios: List[FormSubmissionData]):
+    """Upsert das unidades + INSERT em lote dos eventos + resumo, numa única transação"""
+    validar_meses(formularios)
+    unidades, evento_ids = await inserir_formularios(session, formularios)
+    await ajustar_resumo(session, Evento.id.in_(evento_ids), 1)
+    await session.commit()
+    invalidar("evento", "unidade")
+    hub_resumo.notificar()
+    return unidades, evento_ids
+
+
+@router.post("", response_model=ApiResponse)
+async def submit_form(form_data: FormSubmissionData, session: AsyncSession = Depends(get_session)):
+    """Submeter formulário completo com unidade e eventos"""
+    try:
+        unidades, evento_ids = await salvar_formularios(session, [form_data])
         
         return ApiResponse(
             success=True,
-            message=f"Formulário submetido com sucesso. {len(eventos_criados)} eventos criados.",
+            message=f"Formulário submetido com sucesso. {len(evento_ids)} eventos criados.",
             data={
-                "unidade_id": unidade.id,
-                "eventos_count": len(eventos_criados)
+                "unidade_id": unidades[form_data.nome_unidade],
+                "eventos_count": len(evento_ids)
             }
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         return ApiResponse(
             success=False,
             message="Erro ao processar formulário",
             errors={"detail": str(e)}
         )
 
+
+@router.post("/lote", response_model=ApiResponse)
+async def submit_forms_lote(
+    formularios: List[FormSubmissionData],
+    session: AsyncSession = Depends(get_session)
+):
+    """Submeter vários formulários de uma vez (tudo ou nada)"""
+    try:
+        unidades, evento_ids = await salvar_formularios(session, formularios)
+        
+        return ApiResponse(
+            success=True,
+            message=f"{len(formularios)} formulários submetidos com sucesso. {len(evento_ids)} eventos criados.",
+            data={
+                "unidades": unidades,
+                "eventos_count": len(evento_ids)
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await session.rollback()
+        return ApiResponse(
+            success=False,
+            message="Erro ao processar formulários",
+            errors={"detail": str(e)}
+        )
+
+@router.post("/importar", response_model=ApiResponse)
+async def importar_eventos_arquivo(
+    arquivo: UploadFile = File(...),
+    simular: bool = Query(False, description="Só validar e contar, sem gravar"),
+    session: AsyncSession = Depends(get_session)
+):
+    """Importar eventos de um arquivo .csv ou .xlsx.
+
+    Aceita o cabeçalho do CSV exportado ou o da planilha consolidada. Linhas
+    inválidas não interrompem a importação: são contadas em data.rejeitados
+    e listadas em data.erros (as primeiras IMPORTACAO_MAX_ERROS).
+    """
+    try:
+        formato = formato_arquivo(arquivo.filename)
+        resultado = await importar_eventos(session, arquivo.file, formato, simular)
+        criadas = resultado["unidades_criadas"]
+        if simular:
+            await session.rollback()
+        else:
+            await session.commit()
+            if resultado["importados"]:
+                invalidar("evento", "unidade")
+                hub_resumo.notificar()
+
+        acao = "seriam importados" if simular else "importados"
+        return ApiResponse(
+            success=resultado["importados"] > 0 or resultado["rejeitados"] == 0,
+            message=f"{resultado['importados']} eventos {acao}, {resultado['rejeitados']} linhas rejeitadas.",
+            data={**resultado, "unidades_criadas": list(criadas)}
+        )
+
+    except ArquivoInvalido as e:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await session.rollback()
+        return ApiResponse(
+            success=False,
+            message="Erro ao importar eventos",
+            errors={"detail": str(e)}
+        )
+
 @router.get("", response_model=List[EventoWithUnidade])
-async def get_eventos(session: Session = Depends(get_session)):
-    """Listar todos os eventos com informações da unidade e dados aprovados se existirem"""
-    eventos = session.exec(select(Evento)).all()
-    eventos_with_unidade = []
-    for evento in eventos:
-        evento_dict = evento.model_dump()
-        # Busca dados aprovados
-        aprovado = session.exec(
-            select(EventoAprovado).where(EventoAprovado.evento_id == evento.id)
-        ).first()
-        if aprovado:
-            # Sobrescreve campos aprovados
-            evento_dict.update({
-                "nome": aprovado.nome,
-                "quantidade_pessoas": aprovado.quantidade_pessoas,
-                "coffee_break_manha": aprovado.coffee_break_manha,
-                "coffee_break_tarde": aprovado.coffee_break_tarde,
-                "almoco": aprovado.almoco,
-                "jantar": aprovado.jantar,
-                "cerimonial": aprovado.cerimonial,
-                "aprovado": True
-            })
-        if evento.unidade:
-            evento_dict["unidade"] = evento.unidade.model_dump()
-        eventos_with_unidade.append(EventoWithUnidade(**evento_dict))
-    return eventos_with_unidade
+@cacheado(*TABELAS_EVENTOS)
+async def get_eventos(
+    response: Response,
+    filtros: FiltrosEvento = Depends(),
+    paginacao: Paginacao = Depends(get_paginacao),
+    session: AsyncSession = Depends(get_session)
+):
+    """Listar eventos com informações da unidade e dados aprovados se existirem.
+
+    Paginado por id: o token da próxima página vem no header X-Next-Cursor.
+    """
+    statement = aplicar_filtros(select_eventos_com_aprovacao(), filtros)
+    statement = paginar(statement, Evento.id, paginacao)
+    eventos = fechar_pagina(await listar_eventos(session, statement), paginacao, response)
+    return resposta_json(eventos, response)
+
+
+@router.get("/search", response_model=List[EventoWithUnidade])
+@cacheado(*TABELAS_EVENTOS)
+async def search_eventos(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Palavras (ou inícios de palavras) a buscar"),
+    filtros: FiltrosEvento = Depends(),
+    paginacao: Paginacao = Depends(get_paginacao),
+    session: AsyncSession = Depends(get_session)
+):
+    """Busca textual em nome, solicitante e unidade responsável, por relevância.
+
+    Aceita os filtros da listagem; a próxima página vem no header X-Next-Cursor.
+    """
+    eventos, proximo = await buscar_eventos(session, q, filtros, paginacao)
+    if proximo:
+        response.headers[NEXT_CURSOR_HEADER] = proximo
+    return resposta_json(eventos, response)
+
+
+@router.get("/changes", response_model=EventoAlteracoes)
+async def get_eventos_alteracoes(
+    since: Optional[str] = Query(None, description="Token da resposta anterior (ausente: carga completa)"),
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session)
+):
+    """Eventos criados, alterados e deletados desde o token, para atualização incremental.
+
+    Enquanto mais=true, chame de novo com o token recebido. Aplique os eventos
+    e depois os removidos; a mesma alteração pode vir mais de uma vez. Token
+    mais antigo que a retenção dos removidos: 410, refaça a carga completa.
+    """
+    return resposta_json(await buscar_alteracoes(session, since, limit))
+
+
+@router.get("/stream/resumo")
+async def stream_resumo():
+    """Totais por mês em tempo real (Server-Sent Events).
+
+    Envia o evento "resumo" com os totais atuais e, a cada escrita, "delta"
+    com as diferenças de eventos, pessoas e custo dos meses alterados.
+    """
+    return StreamingResponse(
+        hub_resumo.assinar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/{evento_id}", response_model=EventoWithUnidade)
-async def get_evento(evento_id: int, session: Session = Depends(get_session)):
+@cacheado(*TABELAS_EVENTOS)
+async def get_evento(evento_id: int, session: AsyncSession = Depends(get_session)):
     """Obter evento específico por ID"""
-    evento = session.get(Evento, evento_id)
-    if not evento:
+    statement = select_eventos_com_aprovacao().where(Evento.id == evento_id)
+    eventos = await listar_eventos(session, statement)
+    if not eventos:
         raise HTTPException(status_code=404, detail="Evento não encontrado")
     
-    evento_dict = evento.model_dump()
-    if evento.unidade:
-        evento_dict["unidade"] = evento.unidade.model_dump()
-    
-    return EventoWithUnidade(**evento_dict)
+    return resposta_json(eventos[0])
 
 
 @router.put("/{evento_id}", response_model=ApiResponse)
 async def update_evento(
     evento_id: int, 
     evento_update: EventoUpdate, 
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    """Atualizar evento existente"""
-    evento = session.get(Evento, evento_id)
+    """Atualizar evento existente.
+
+    Como no PATCH em lote, aprovado=false remove a aprovação e aprovado=true
+    aprova o evento com os valores solicitados, se ainda não houver aprovação.
+    """
+    # Travado até o commit (ver travar_eventos)
+    evento = await session.get(Evento, evento_id, with_for_update=True)
     if not evento:
         raise HTTPException(status_code=404, detail="Evento não encontrado")
     
     try:
+        filtro = Evento.id == evento_id
+        await ajustar_resumo(session, filtro, -1)
         evento_data = evento_update.model_dump(exclude_unset=True)
+        if evento_data.get("aprovado") is False:
+            await remover_aprovacoes(session, filtro)
         for field, value in evento_data.items():
             setattr(evento, field, value)
         
         evento.updated_at = datetime.utcnow()
         session.add(evento)
-        session.commit()
-        session.refresh(evento)
+        await session.flush()
+        if evento_data.get("aprovado"):
+            await aprovar_solicitados(session, filtro)
+        await ajustar_resumo(session, filtro, 1)
+        await session.commit()
+        invalidar("evento", "eventoaprovado")
+        hub_resumo.notificar()
+        await session.refresh(evento)
         
         return ApiResponse(
             success=True,
@@ -153,7 +290,7 @@ async def update_evento(
             data={"evento": evento.model_dump()}
         )
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         return ApiResponse(
             success=False,
             message="Erro ao atualizar evento",
@@ -161,16 +298,22 @@ async def update_evento(
         )
 
 @router.delete("/{evento_id}", response_model=ApiResponse)
-async def delete_evento(evento_id: int, session: Session = Depends(get_session)):
+async def delete_evento(evento_id: int, session: AsyncSession = Depends(get_session)):
     """Deletar evento"""
-    evento = session.get(Evento, evento_id)
+    # Travado até o commit (ver travar_eventos)
+    evento = await session.get(Evento, evento_id, with_for_update=True)
     if not evento:
         raise HTTPException(status_code=404, detail="Evento não encontrado")
     
     try:
         evento_json = evento.model_dump()  
-        session.delete(evento)
-        session.commit()
+        await ajustar_resumo(session, Evento.id == evento_id, -1)
+        await remover_aprovacoes(session, Evento.id == evento_id)
+        await session.delete(evento)
+        await registrar_remocoes(session, [evento_id])
+        await session.commit()
+        invalidar("evento", "eventoaprovado")
+        hub_resumo.notificar()
         
         return ApiResponse(
             success=True,
@@ -178,7 +321,7 @@ async def delete_evento(evento_id: int, session: Session = Depends(get_session))
             data={"evento": evento_json}
         )
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         return ApiResponse(
             success=False,
             message="Erro ao deletar evento",
@@ -186,128 +329,237 @@ async def delete_evento(evento_id: int, session: Session = Depends(get_session))
         )
 
 
+@router.patch("", response_model=ApiResponse)
+async def update_eventos_lote(dados: EventoLoteUpdate, session: AsyncSession = Depends(get_session)):
+    """Atualizar de uma vez os eventos selecionados (por ids e/ou filtros).
+
+    Os ids da seleção são lidos uma vez (travados) e o UPDATE vai por blocos
+    de ids. Com aprovado=false as aprovações são removidas; com aprovado=true
+    os eventos ainda sem aprovação são aprovados com os valores solicitados.
+    """
+    filtro = exigir_selecao(dados.selecao)
+    valores = dados.valores.model_dump(exclude_unset=True)
+    if not valores:
+        raise HTTPException(status_code=400, detail="Nenhum campo para atualizar")
+
+    try:
+        # Seleção resolvida uma vez, com as linhas travadas: resumo (-1), UPDATE e
+        # resumo (+1) usam exatamente os mesmos eventos
+        ids = await travar_eventos(session, filtro)
+        eventos = Evento.__table__
+        agora = datetime.utcnow()
+        for bloco in blocos(ids):
+            selecionados = Evento.id.in_(bloco)
+            await ajustar_resumo(session, selecionados, -1)
+            if valores.get("aprovado") is False:
+                await remover_aprovacoes(session, selecionados)
+            await session.exec(update(eventos).where(eventos.c.id.in_(bloco)).values(**valores, updated_at=agora))
+            if valores.get("aprovado"):
+                await aprovar_solicitados(session, selecionados)
+            await ajustar_resumo(session, selecionados, 1)
+        await session.commit()
+        invalidar("evento", "eventoaprovado")
+        hub_resumo.notificar()
+
+        return ApiResponse(
+            success=True,
+            message=f"{len(ids)} eventos atualizados",
+            data={"atualizados": len(ids), "ids": ids}
+        )
+    except Exception as e:
+        await session.rollback()
+        return ApiResponse(
+            success=False,
+            message="Erro ao atualizar eventos",
+            errors={"detail": str(e)}
+        )
+
+
+@router.delete("", response_model=ApiResponse)
+async def delete_eventos_lote(selecao: SelecaoEventos, session: AsyncSession = Depends(get_session)):
+    """Deletar de uma vez os eventos selecionados (por ids e/ou filtros), com as aprovações"""
+    filtro = exigir_selecao(selecao)
+
+    try:
+        ids = await travar_eventos(session, filtro)
+        eventos = Evento.__table__
+        for bloco in blocos(ids):
+            selecionados = Evento.id.in_(bloco)
+            await ajustar_resumo(session, selecionados, -1)
+            await remover_aprovacoes(session, selecionados)
+            await session.exec(delete(eventos).where(eventos.c.id.in_(bloco)))
+        await registrar_remocoes(session, ids)
+        await session.commit()
+        invalidar("evento", "eventoaprovado")
+        hub_resumo.notificar()
+
+        return ApiResponse(
+            success=True,
+            message=f"{len(ids)} eventos deletados",
+            data={"deletados": len(ids), "ids": ids}
+        )
+    except Exception as e:
+        await session.rollback()
+        return ApiResponse(
+            success=False,
+            message="Erro ao deletar eventos",
+            errors={"detail": str(e)}
+        )
+
+
 @router.get("/mes/{mes}", response_model=List[EventoWithUnidade])
-async def get_eventos_por_mes(mes: MonthEnum, session: Session = Depends(get_session)):
-    """Obter eventos de um mês específico"""
-    statement = select(Evento).where(Evento.mes_previsto == mes)
-    eventos = session.exec(statement).all()
-    
-    eventos_with_unidade = []
-    for evento in eventos:
-        evento_dict = evento.model_dump()
-        if evento.unidade:
-            evento_dict["unidade"] = evento.unidade.model_dump()
-        eventos_with_unidade.append(EventoWithUnidade(**evento_dict))
-    
-    return eventos_with_unidade
+@cacheado(*TABELAS_EVENTOS)
+async def get_eventos_por_mes(
+    mes: MonthEnum,
+    response: Response,
+    filtros: FiltrosEvento = Depends(),
+    paginacao: Paginacao = Depends(get_paginacao),
+    session: AsyncSession = Depends(get_session)
+):
+    """Obter eventos de um mês específico (paginado como a listagem geral)"""
+    filtros.mes = mes
+    statement = aplicar_filtros(select_eventos_com_aprovacao(), filtros)
+    statement = paginar(statement, Evento.id, paginacao)
+    eventos = fechar_pagina(await listar_eventos(session, statement), paginacao, response)
+    return resposta_json(eventos, response)
 
 
 @router.get("/stats/resumo", response_model=EventoStats)
-async def get_stats(session: Session = Depends(get_session)):
-    """Obter estatísticas dos eventos"""
-    # Total de eventos
-    eventos_statement = select(Evento)
-    eventos = session.exec(eventos_statement).all()
-    total_eventos = len(eventos)
-    
-    # Total de unidades
-    unidades_statement = select(Unidade)
-    unidades = session.exec(unidades_statement).all()
-    total_unidades = len(unidades)
-    
-    # Eventos por mês
-    eventos_por_mes = {}
-    pessoas_por_mes = {}
-    for evento in eventos:
-        mes = evento.mes_previsto.value
-        eventos_por_mes[mes] = eventos_por_mes.get(mes, 0) + 1
-        pessoas_por_mes[mes] = pessoas_por_mes.get(mes, 0) + evento.quantidade_pessoas
-    
-    # Serviços mais solicitados
-    servicos = {
-        "Coffee Break Manhã": sum(1 for e in eventos if e.coffee_break_manha),
-        "Coffee Break Tarde": sum(1 for e in eventos if e.coffee_break_tarde),
-        "Almoço": sum(1 for e in eventos if e.almoco),
-        "Jantar": sum(1 for e in eventos if e.jantar),
-        "Cerimonial": sum(1 for e in eventos if e.cerimonial)
-    }
-    
-    return EventoStats(
-        total_eventos=total_eventos,
-        total_unidades=total_unidades,
-        eventos_por_mes=eventos_por_mes,
-        pessoas_por_mes=pessoas_por_mes,
-        servicos_mais_solicitados=servicos
-    )
+@cacheado(*TABELAS_EVENTOS, "resumomensal")
+async def get_stats(session: AsyncSession = Depends(get_session)):
+    """Obter estatísticas dos eventos (agregadas no banco)"""
+    return await calcular_stats(session)
+
+
+@router.get("/stats/resumo/aprovados", response_model=EventoStats)
+@cacheado(*TABELAS_EVENTOS, "resumomensal")
+async def get_stats_aprovados(session: AsyncSession = Depends(get_session)):
+    """Obter estatísticas apenas dos eventos aprovados, com os valores aprovados"""
+    return await calcular_stats_aprovados(session)
 
 
 @router.get("/export/csv")
-async def export_eventos_csv(session: Session = Depends(get_session)):
-    """Exportar todos os eventos em formato CSV"""
-    eventos = session.exec(select(Evento)).all()
-    output = StringIO()
-    writer = csv.writer(output)
-    # Cabeçalho
-    writer.writerow([
-        "ID", "Nome", "Unidade Responsável", "Nome Solicitante", "Quantidade Pessoas",
-        "Mês Previsto", "Coffee Break Manhã", "Coffee Break Tarde", "Almoço", "Jantar", "Cerimonial", "Unidade"
-    ])
-    # Dados
-    for evento in eventos:
-        writer.writerow([
-            evento.id,
-            evento.nome,
-            evento.unidade_responsavel,
-            evento.nome_solicitante,
-            evento.quantidade_pessoas,
-            evento.mes_previsto.value if evento.mes_previsto else "",
-            evento.coffee_break_manha,
-            evento.coffee_break_tarde,
-            evento.almoco,
-            evento.jantar,
-            evento.cerimonial,
-            evento.unidade.nome_unidade if evento.unidade else ""
-        ])
-    output.seek(0)
-    return StreamingResponse(output, media_type="text/csv", headers={"Content-Disposition": "attachment; filename=eventos.csv"})
+async def export_eventos_csv(filtros: FiltrosEvento = Depends(), gzip: bool = False):
+    """Exportar eventos em CSV (com os dados aprovados), em streaming.
+
+    Aceita os mesmos filtros da listagem; com gzip=true o arquivo é comprimido durante o envio.
+    """
+    statement = aplicar_filtros(select_exportacao(), filtros)
+    if gzip:
+        return StreamingResponse(
+            gerar_csv(statement, comprimir=True),
+            media_type="application/gzip",
+            headers={"Content-Disposition": "attachment; filename=eventos.csv.gz"}
+        )
+    return StreamingResponse(gerar_csv(statement), media_type="text/csv", headers={"Content-Disposition": "attachment; filename=eventos.csv"})
+
+
+@router.get("/export/xlsx")
+async def export_eventos_xlsx(filtros: FiltrosEvento = Depends()):
+    """Exportar a planilha consolidada (.xlsx): aba Resumo e uma aba por mês.
+
+    Aceita os mesmos filtros da listagem. Os custos vêm calculados (sem
+    fórmulas); a planilha é montada em um arquivo temporário com memória
+    constante e removido depois do envio.
+    """
+    statement = aplicar_filtros(select_planilha(), filtros)
+    descritor, caminho = tempfile.mkstemp(suffix=".xlsx")
+    os.close(descritor)
+    try:
+        await gerar_xlsx(statement, caminho)
+    except Exception:
+        os.remove(caminho)
+        raise
+    return FileResponse(
+        caminho,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename="eventos.xlsx",
+        background=BackgroundTask(os.remove, caminho)
+    )
 
 
 @router.post("/aprovados", response_model=ApiResponse)
 async def create_evento_aprovado(
-    data: dict = Body(...),
-    session: Session = Depends(get_session)
+    item: AprovacaoLoteItem,
+    session: AsyncSession = Depends(get_session)
 ):
-    """Criar registro de evento aprovado"""
+    """Criar registro de evento aprovado (campos omitidos ficam com o valor solicitado)"""
     try:
-        evento_id = data.get("evento_id")
-        evento = session.get(Evento, evento_id)
-        if not evento:
+        aprovacoes, nao_encontrados = await montar_aprovacoes(session, [item])
+        if nao_encontrados:
             raise HTTPException(status_code=404, detail="Evento não encontrado")
 
-        aprovado = EventoAprovado(
-            evento_id=evento_id,
-            nome=data.get("nome", evento.nome),
-            quantidade_pessoas=data.get("quantidade_pessoas", evento.quantidade_pessoas),
-            coffee_break_manha=data.get("coffee_break_manha", evento.coffee_break_manha),
-            coffee_break_tarde=data.get("coffee_break_tarde", evento.coffee_break_tarde),
-            almoco=data.get("almoco", evento.almoco),
-            jantar=data.get("jantar", evento.jantar),
-            cerimonial=data.get("cerimonial", evento.cerimonial)
-        )
-        session.add(aprovado)
-        session.commit()
-        session.refresh(aprovado)
-        return ApiResponse(
+        filtro = Evento.id == item.evento_id
+        apenas_aprovados = (VarianteResumo.APROVADO,)
+        await ajustar_resumo(session, filtro, -1, apenas_aprovados)
+        # Uma aprovação por evento (índice único): reaprovar sobrescreve a anterior
+        ids = await upsert_aprovacoes(session, aprovacoes)
+        await ajustar_resumo(session, filtro, 1, apenas_aprovados)
+        resposta = ApiResponse(
             success=True,
             message="Evento aprovado registrado com sucesso",
-            data={"evento_aprovado_id": aprovado.id}
+            data={"evento_aprovado_id": ids[item.evento_id]}
         )
+        await session.commit()
+        invalidar("evento", "eventoaprovado")
+        hub_resumo.notificar()
+        return resposta
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         return ApiResponse(
             success=False,
             message="Erro ao aprovar evento",
             errors={"detail": str(e)}
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/aprovados/lote", response_model=ApiResponse)
+async def create_eventos_aprovados_lote(
+    itens: List[AprovacaoLoteItem],
+    session: AsyncSession = Depends(get_session)
+):
+    """Aprovar vários eventos de uma vez, numa única transação.
+
+    Cada item traz o evento_id e, opcionalmente, os valores aprovados que
+    diferem do solicitado. Eventos inexistentes são informados no resultado
+    do item e não impedem a aprovação dos demais.
+    """
+    if len(itens) > MAX_APROVACOES_LOTE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {MAX_APROVACOES_LOTE} aprovações por lote"
+        )
+    try:
+        aprovacoes, nao_encontrados = await montar_aprovacoes(session, itens)
+        ids = {}
+        if aprovacoes:
+            filtro = Evento.id.in_([aprovacao["evento_id"] for aprovacao in aprovacoes])
+            apenas_aprovados = (VarianteResumo.APROVADO,)
+            await ajustar_resumo(session, filtro, -1, apenas_aprovados)
+            ids = await upsert_aprovacoes(session, aprovacoes)
+            await ajustar_resumo(session, filtro, 1, apenas_aprovados)
+            await session.commit()
+            invalidar("evento", "eventoaprovado")
+            hub_resumo.notificar()
+
+        resultados = [
+            {"evento_id": evento_id, "success": True, "evento_aprovado_id": aprovado_id}
+            for evento_id, aprovado_id in ids.items()
+        ] + [
+            {"evento_id": evento_id, "success": False, "error": "Evento não encontrado"}
+            for evento_id in nao_encontrados
+        ]
+        return ApiResponse(
+            success=bool(ids),
+            message=f"{len(ids)} de {len(ids) + len(nao_encontrados)} eventos aprovados",
+            data={"aprovados": len(ids), "resultados": resultados}
+        )
+    except Exception as e:
+        await session.rollback()
+        return ApiResponse(
+            success=False,
+            message="Erro ao aprovar eventos",
+            errors={"detail": str(e)}
+        )
@@ -1,26 +1,54 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime
 
 from db import get_session
 from models import (
-    Veiculo
+    Veiculo, VeiculoCreate, VeiculoPendencia, VeiculoRead
 )
+from service.frotas_service import MARGEM_KM, MARGEM_LIMPEZA, listar_pendencias, normalizar_placa
+from service.paginacao import MAX_PAGE_SIZE, Paginacao, fechar_pagina, get_paginacao, paginar
+from service.profiling import RotaPerfilada
+from service.serializacao import resposta_json
 
-router = APIRouter(prefix="/api/frotas", tags=["frotas"])
+router = APIRouter(prefix="/api/frotas", tags=["frotas"], route_class=RotaPerfilada)
 
-@router.get("", response_model=List[Veiculo])
-async def get_frotas(session: Session = Depends(get_session)):
-    """Listar todos os veículos"""
-    statement = select(Veiculo)
-    veiculos = session.exec(statement).all()
-    return veiculos
+@router.get("", response_model=List[VeiculoRead])
+async def get_frotas(
+    response: Response,
+    paginacao: Paginacao = Depends(get_paginacao),
+    session: AsyncSession = Depends(get_session)
+):
+    """Listar veículos (paginado, próxima página em X-Next-Cursor)"""
+    statement = paginar(select(Veiculo), Veiculo.id, paginacao)
+    veiculos = [veiculo.model_dump() for veiculo in (await session.exec(statement)).all()]
+    return resposta_json(fechar_pagina(veiculos, paginacao, response), response)
 
-@router.post("", response_model=Veiculo)
-async def create_frota(veiculo: Veiculo, session: Session = Depends(get_session)):
+@router.get("/pendencias", response_model=List[VeiculoPendencia])
+async def get_pendencias(
+    margem_km: int = Query(MARGEM_KM, ge=1, description="Avisar quando faltarem até tantos km para a manutenção"),
+    margem_dias: int = Query(MARGEM_LIMPEZA, ge=1, description="Avisar tantos dias antes do prazo da limpeza"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session)
+):
+    """Veículos com manutenção ou limpeza vencida ou próxima, do mais urgente para o menos urgente"""
+    return resposta_json(await listar_pendencias(session, margem_km, margem_dias, limit))
+
+@router.post("", response_model=VeiculoRead)
+async def create_frota(veiculo: VeiculoCreate, session: AsyncSession = Depends(get_session)):
     """Criar um novo veículo"""
-    session.add(veiculo)
-    session.commit()
-    session.refresh(veiculo)
-    return veiculo
\ No newline at end of file
+    db_veiculo = Veiculo.model_validate(veiculo, update={"placa": normalizar_placa(veiculo.placa)})
+    session.add(db_veiculo)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Já existe um veículo com a placa {db_veiculo.placa}"
+        )
+    await session.refresh(db_veiculo)
+    return db_veiculo
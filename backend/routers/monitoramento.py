@@ -0,0 +1,48 @@
+from fastapi import APIRouter
+
+from db import engine
+from service.cache import cache
+from service.pool_metrics import metrics
+from service.profiling import RotaPerfilada
+from service.tarefas import fila_tarefas
+from service.transmissao import hub_resumo
+
+router = APIRouter(prefix="/api/monitoramento", tags=["monitoramento"], route_class=RotaPerfilada)
+
+
+@router.get("/pool")
+async def get_pool_metrics():
+    """Estado e métricas do pool de conexões do banco"""
+    return metrics.snapshot(engine.sync_engine.pool)
+
+
+@router.post("/pool/reset")
+async def reset_pool_metrics():
+    """Zerar os contadores e o histograma (o estado atual do pool não muda)"""
+    metrics.reset()
+    return metrics.snapshot(engine.sync_engine.pool)
+
+
+@router.get("/cache")
+async def get_cache_metrics():
+    """Estado do cache de respostas (entradas, bytes, acertos e versões das tabelas)"""
+    return cache.snapshot()
+
+
+@router.post("/cache/reset")
+async def reset_cache():
+    """Esvaziar o cache de respostas"""
+    cache.clear()
+    return cache.snapshot()
+
+
+@router.get("/sse")
+async def get_sse_metrics():
+    """Clientes conectados ao stream de resumo, releituras e clientes lentos descartados"""
+    return hub_resumo.snapshot()
+
+
+@router.get("/tarefas")
+async def get_tarefas_metrics():
+    """Fila de relatórios: tarefas em andamento, geradas, erros e uso do cache em disco"""
+    return fila_tarefas.snapshot()
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import get_session
+from models import RelatorioPedido, StatusTarefa, TarefaRead, TipoRelatorio, Unidade
+from service.profiling import RotaPerfilada
+from service.tarefas import MEDIA_TYPES, fila_tarefas
+
+router = APIRouter(prefix="/api/relatorios", tags=["relatorios"], route_class=RotaPerfilada)
+
+
+def obter_tarefa(tarefa_id: str):
+    tarefa = fila_tarefas.obter(tarefa_id)
+    if tarefa is None:
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    return tarefa
+
+
+@router.post("", response_model=TarefaRead, status_code=status.HTTP_202_ACCEPTED)
+async def criar_relatorio(pedido: RelatorioPedido, session: AsyncSession = Depends(get_session)):
+    """Agendar a geração de um relatório (PDF da unidade ou planilha xlsx).
+
+    Devolve a tarefa na hora; acompanhe em GET /api/relatorios/{id}. Se o
+    mesmo relatório, com os mesmos dados, já estiver em cache a tarefa já
+    vem concluída.
+    """
+    if pedido.tipo == TipoRelatorio.PDF_UNIDADE:
+        if pedido.filtros.unidade_id is None:
+            raise HTTPException(status_code=400, detail="Informe filtros.unidade_id para o relatório da unidade")
+        if not await session.get(Unidade, pedido.filtros.unidade_id):
+            raise HTTPException(status_code=404, detail="Unidade não encontrada")
+    tarefa = await fila_tarefas.enviar(session, pedido)
+    return tarefa.para_dict()
+
+
+@router.get("/{tarefa_id}", response_model=TarefaRead)
+async def get_relatorio(tarefa_id: str):
+    """Status da tarefa"""
+    return obter_tarefa(tarefa_id).para_dict()
+
+
+@router.get("/{tarefa_id}/download")
+async def download_relatorio(tarefa_id: str):
+    """Arquivo do relatório concluído (409 enquanto não termina, 410 depois de expirar)"""
+    tarefa = obter_tarefa(tarefa_id)
+    if tarefa.status != StatusTarefa.CONCLUIDA:
+        raise HTTPException(status_code=409, detail=f"Relatório não disponível: tarefa {tarefa.status.value}")
+    if not fila_tarefas.arquivo_disponivel(tarefa):
+        raise HTTPException(status_code=410, detail="Relatório expirado, solicite novamente")
+    return FileResponse(tarefa.caminho, media_type=MEDIA_TYPES[tarefa.tipo], filename=tarefa.arquivo)
@@ -1,24 +1,33 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime
 
 from db import get_session
 from models import (
-    Unidade, UnidadeCreate, UnidadeRead, UnidadeUpdate, 
-    UnidadeWithEventos, ApiResponse
+    Evento, Unidade, UnidadeCreate, UnidadeRead, UnidadeUpdate, 
+    UnidadeWithEventos, UnidadeSugestao, ApiResponse
 )
+from service.paginacao import Paginacao, fechar_pagina, get_paginacao_opcional, paginar
+from service.busca_unidades import buscar_unidades
+from service.cache import RotaCacheada, cacheado, invalidar
+from service.evento_service import evento_para_dict, unidade_para_dict
+from service.serializacao import resposta_json
+from service.sincronizacao import tocar_eventos
 
-router = APIRouter(prefix="/api/unidades", tags=["unidades"])
+router = APIRouter(prefix="/api/unidades", tags=["unidades"], route_class=RotaCacheada)
 
 
 @router.post("/", response_model=ApiResponse)
-async def create_unidade(unidade: UnidadeCreate, session: Session = Depends(get_session)):
+async def create_unidade(unidade: UnidadeCreate, session: AsyncSession = Depends(get_session)):
     """Criar uma nova unidade"""
     try:
         # Verificar se unidade já existe
         statement = select(Unidade).where(Unidade.nome_unidade == unidade.nome_unidade)
-        existing_unidade = session.exec(statement).first()
+        existing_unidade = (await session.exec(statement)).first()
         
         if existing_unidade:
             return ApiResponse(
@@ -31,8 +40,9 @@ async def create_unidade(unidade: UnidadeCreate, session: Session = Depends(get_
         db_unidade.updated_at = datetime.utcnow()
         
         session.add(db_unidade)
-        session.commit()
-        session.refresh(db_unidade)
+        await session.commit()
+        invalidar("unidade")
+        await session.refresh(db_unidade)
         
         return ApiResponse(
             success=True,
@@ -40,7 +50,7 @@ async def create_unidade(unidade: UnidadeCreate, session: Session = Depends(get_
             data={"unidade": db_unidade.model_dump()}
         )
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         return ApiResponse(
             success=False,
             message="Erro ao criar unidade",
@@ -49,34 +59,59 @@ async def create_unidade(unidade: UnidadeCreate, session: Session = Depends(get_
 
 
 @router.get("/", response_model=List[UnidadeRead])
-async def get_unidades(session: Session = Depends(get_session)):
-    """Listar todas as unidades"""
-    statement = select(Unidade)
-    unidades = session.exec(statement).all()
-    return [UnidadeRead.model_validate(unidade) for unidade in unidades]
+@cacheado("unidade")
+async def get_unidades(
+    response: Response,
+    paginacao: Optional[Paginacao] = Depends(get_paginacao_opcional),
+    session: AsyncSession = Depends(get_session)
+):
+    """Listar unidades.
+
+    Sem limit nem cursor devolve todas (os selects do frontend usam a lista
+    inteira); com eles, pagina por id e publica a próxima página em X-Next-Cursor.
+    """
+    if paginacao is None:
+        unidades = (await session.exec(select(Unidade).order_by(Unidade.id))).all()
+    else:
+        unidades = (await session.exec(paginar(select(Unidade), Unidade.id, paginacao))).all()
+        unidades = fechar_pagina(list(unidades), paginacao, response)
+    return resposta_json([unidade_para_dict(unidade) for unidade in unidades], response)
+
+
+@router.get("/autocomplete", response_model=List[UnidadeSugestao])
+@cacheado("unidade")
+async def autocomplete_unidades(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    session: AsyncSession = Depends(get_session)
+):
+    """Sugestões de unidades para o termo digitado (sem diferenciar acentos)"""
+    return await buscar_unidades(session, q, limit)
 
 
 @router.get("/{unidade_id}", response_model=UnidadeWithEventos)
-async def get_unidade(unidade_id: int, session: Session = Depends(get_session)):
+@cacheado("unidade", "evento")
+async def get_unidade(unidade_id: int, session: AsyncSession = Depends(get_session)):
     """Obter unidade específica por ID com seus eventos"""
-    unidade = session.get(Unidade, unidade_id)
+    statement = select(Unidade).where(Unidade.id == unidade_id).options(selectinload(Unidade.eventos))
+    unidade = (await session.exec(statement)).first()
     if not unidade:
         raise HTTPException(status_code=404, detail="Unidade não encontrada")
     
-    unidade_dict = unidade.model_dump()
-    unidade_dict["eventos"] = [evento.model_dump() for evento in unidade.eventos]
+    unidade_dict = unidade_para_dict(unidade)
+    unidade_dict["eventos"] = [evento_para_dict(evento) for evento in unidade.eventos]
     
-    return UnidadeWithEventos(**unidade_dict)
+    return resposta_json(unidade_dict)
 
 
 @router.put("/{unidade_id}", response_model=ApiResponse)
 async def update_unidade(
     unidade_id: int, 
     unidade_update: UnidadeUpdate, 
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """Atualizar unidade existente"""
-    unidade = session.get(Unidade, unidade_id)
+    unidade = await session.get(Unidade, unidade_id)
     if not unidade:
         raise HTTPException(status_code=404, detail="Unidade não encontrada")
     
@@ -87,7 +122,7 @@ async def update_unidade(
                 Unidade.nome_unidade == unidade_update.nome_unidade,
                 Unidade.id != unidade_id
             )
-            existing_unidade = session.exec(statement).first()
+            existing_unidade = (await session.exec(statement)).first()
             
             if existing_unidade:
                 return ApiResponse(
@@ -102,8 +137,11 @@ async def update_unidade(
         
         unidade.updated_at = datetime.utcnow()
         session.add(unidade)
-        session.commit()
-        session.refresh(unidade)
+        # Os eventos trazem a unidade: voltam na sincronização incremental com o nome novo
+        await tocar_eventos(session, Evento.unidade_id == unidade_id, unidade.updated_at)
+        await session.commit()
+        invalidar("unidade", "evento")
+        await session.refresh(unidade)
         
         return ApiResponse(
             success=True,
@@ -111,7 +149,7 @@ async def update_unidade(
             data={"unidade": unidade.model_dump()}
         )
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         return ApiResponse(
             success=False,
             message="Erro ao atualizar unidade",
@@ -120,30 +158,34 @@ async def update_unidade(
 
 
 @router.delete("/{unidade_id}", response_model=ApiResponse)
-async def delete_unidade(unidade_id: int, session: Session = Depends(get_session)):
+async def delete_unidade(unidade_id: int, session: AsyncSession = Depends(get_session)):
     """Deletar unidade"""
-    unidade = session.get(Unidade, unidade_id)
+    unidade = await session.get(Unidade, unidade_id)
     if not unidade:
         raise HTTPException(status_code=404, detail="Unidade não encontrada")
     
     try:
         # Verificar se há eventos associados
-        if unidade.eventos:
+        total_eventos = (await session.exec(
+            select(func.count(Evento.id)).where(Evento.unidade_id == unidade_id)
+        )).one()
+        if total_eventos:
             return ApiResponse(
                 success=False,
                 message="Não é possível deletar unidade com eventos associados",
-                errors={"eventos": f"Esta unidade possui {len(unidade.eventos)} evento(s) associado(s)"}
+                errors={"eventos": f"Esta unidade possui {total_eventos} evento(s) associado(s)"}
             )
         
-        session.delete(unidade)
-        session.commit()
+        await session.delete(unidade)
+        await session.commit()
+        invalidar("unidade")
         
         return ApiResponse(
             success=True,
             message="Unidade deletada com sucesso"
         )
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         return ApiResponse(
             success=False,
             message="Erro ao deletar unidade",
@@ -152,23 +194,40 @@ async def delete_unidade(unidade_id: int, session: Session = Depends(get_session
 
 
 @router.get("/nome/{nome_unidade}", response_model=UnidadeWithEventos)
-async def get_unidade_by_name(nome_unidade: str, session: Session = Depends(get_session)):
+@cacheado("unidade", "evento")
+async def get_unidade_by_name(nome_unidade: str, session: AsyncSession = Depends(get_session)):
     """Obter unidade por nome"""
-    statement = select(Unidade).where(Unidade.nome_unidade == nome_unidade)
-    unidade = session.exec(statement).first()
+    statement = (
+        select(Unidade)
+        .where(Unidade.nome_unidade == nome_unidade)
+        .options(selectinload(Unidade.eventos))
+    )
+    unidade = (await session.exec(statement)).first()
     
     if not unidade:
         raise HTTPException(status_code=404, detail="Unidade não encontrada")
     
-    unidade_dict = unidade.model_dump()
-    unidade_dict["eventos"] = [evento.model_dump() for evento in unidade.eventos]
+    unidade_dict = unidade_para_dict(unidade)
+    unidade_dict["eventos"] = [evento_para_dict(evento) for evento in unidade.eventos]
     
-    return UnidadeWithEventos(**unidade_dict)
+    return resposta_json(unidade_dict)
 
 
 @router.get("/search/{term}", response_model=List[UnidadeRead])
-async def search_unidades(term: str, session: Session = Depends(get_session)):
-    """Buscar unidades por termo no nome"""
-    statement = select(Unidade).where(Unidade.nome_unidade.contains(term))
-    unidades = session.exec(statement).all()
-    return [UnidadeRead.model_validate(unidade) for unidade in unidades]
\ No newline at end of file
+@cacheado("unidade")
+async def search_unidades(
+    term: str,
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_session)
+):
+    """Buscar unidades por termo no nome, ordenadas por relevância (sem diferenciar acentos)"""
+    sugestoes = await buscar_unidades(session, term, limit)
+    if not sugestoes:
+        return []
+    statement = select(Unidade).where(Unidade.id.in_([sugestao.id for sugestao in sugestoes]))
+    por_id = {unidade.id: unidade for unidade in (await session.exec(statement)).all()}
+    return resposta_json([
+        unidade_para_dict(por_id[sugestao.id])
+        for sugestao in sugestoes
+        if sugestao.id in por_id
+    ])
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""Assinatura do conteúdo das tabelas, lida do banco.
+
+Muda a cada escrita, venha ela de um router deste processo, de outro worker
+ou de um script que grava direto no banco (importar.py, resumo_service
+reconstruir, benchmarks/gerar_dados.py). Usada como chave do cache de
+respostas, do cache de relatórios e para recarregar o índice de unidades.
+
+- evento: inserções aumentam count/max(id), remoções diminuem count e
+  alterações (inclusive de aprovação, que atualiza evento.updated_at) avançam
+  coalesce(updated_at, created_at), pelo índice ix_evento_alterado_em;
+- eventoaprovado, unidade: count e o horário da última gravação;
+- resumomensal (poucas linhas): count e a soma de cada contador.
+
+Todas as tabelas pedidas saem numa única consulta de subconsultas escalares.
+"""
+from typing import Iterable
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from db import engine
+from models import Evento, EventoAprovado, ResumoMensal, Unidade
+from service.resumo_service import CONTADORES
+from service.sincronizacao import alterado_em
+
+
+def _agregados(tabela, *expressoes) -> list:
+    return [select(expressao).select_from(tabela).scalar_subquery() for expressao in expressoes]
+
+
+ASSINATURAS = {
+    "evento": _agregados(Evento, func.count(Evento.id), func.max(Evento.id), func.max(alterado_em)),
+    "eventoaprovado": _agregados(EventoAprovado, func.count(EventoAprovado.id), func.max(EventoAprovado.aprovado_at)),
+    "unidade": _agregados(
+        Unidade, func.count(Unidade.id), func.max(func.coalesce(Unidade.updated_at, Unidade.created_at))
+    ),
+    "resumomensal": _agregados(
+        ResumoMensal, func.count(), *[func.sum(getattr(ResumoMensal, contador)) for contador in CONTADORES]
+    ),
+}
+
+
+def select_assinatura(tabelas: Iterable[str]):
+    return select(*[subconsulta for tabela in tabelas for subconsulta in ASSINATURAS[tabela]])
+
+
+async def assinatura(tabelas: Iterable[str], session=None) -> tuple:
+    """Assinatura das tabelas (na sessão informada ou numa conexão própria)"""
+    statement = select_assinatura(tabelas)
+    if session is not None:
+        return tuple((await session.exec(statement)).one())
+    async with engine.connect() as conn:
+        return tuple((await conn.execute(statement)).one())
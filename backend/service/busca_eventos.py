@@ -0,0 +1,123 @@
+"""Busca textual de eventos por nome, solicitante e unidade responsável.
+
+- Postgres: coluna gerada `evento.busca` (tsvector 'portuguese', sem acentos,
+  nome com peso A) com índice GIN, criada na migração f1a6d3e8b920;
+- SQLite: tabela FTS5 `evento_fts` (external content sobre evento) mantida
+  por triggers, criada na subida da aplicação por `criar_indice_fts`.
+
+Nos dois casos cada palavra do termo vira um prefixo ("saud" acha "Saúde") e
+todas precisam aparecer. O resultado vem do mais para o menos relevante e é
+paginado por (relevância, id).
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, column, func, literal_column, or_, table, text
+from sqlmodel import select
+
+from db import engine
+from models import Evento, FiltrosEvento
+from service.evento_service import aplicar_filtros, select_eventos_com_aprovacao, to_evento_with_unidade
+from service.paginacao import Paginacao, decode_cursor_chaves, encode_cursor
+
+# Palavras consideradas por busca (o resto é ignorado)
+MAX_PALAVRAS = 10
+
+evento_fts = table("evento_fts", column("rowid"))
+
+FTS_SQLITE = (
+    """
+    CREATE VIRTUAL TABLE evento_fts USING fts5(
+        nome, nome_solicitante, unidade_responsavel,
+        content='evento', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER evento_fts_ai AFTER INSERT ON evento BEGIN
+        INSERT INTO evento_fts(rowid, nome, nome_solicitante, unidade_responsavel)
+        VALUES (new.id, new.nome, new.nome_solicitante, new.unidade_responsavel);
+    END
+    """,
+    """
+    CREATE TRIGGER evento_fts_ad AFTER DELETE ON evento BEGIN
+        INSERT INTO evento_fts(evento_fts, rowid, nome, nome_solicitante, unidade_responsavel)
+        VALUES ('delete', old.id, old.nome, old.nome_solicitante, old.unidade_responsavel);
+    END
+    """,
+    """
+    CREATE TRIGGER evento_fts_au AFTER UPDATE OF nome, nome_solicitante, unidade_responsavel ON evento BEGIN
+        INSERT INTO evento_fts(evento_fts, rowid, nome, nome_solicitante, unidade_responsavel)
+        VALUES ('delete', old.id, old.nome, old.nome_solicitante, old.unidade_responsavel);
+        INSERT INTO evento_fts(rowid, nome, nome_solicitante, unidade_responsavel)
+        VALUES (new.id, new.nome, new.nome_solicitante, new.unidade_responsavel);
+    END
+    """,
+    "INSERT INTO evento_fts(evento_fts) VALUES ('rebuild')",
+)
+
+
+def criar_indice_fts(connection) -> None:
+    """Cria a tabela FTS5 e os triggers no SQLite (no Postgres a migração cuida do índice)"""
+    if connection.dialect.name != "sqlite":
+        return
+    existe = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'evento_fts'")
+    ).first()
+    if existe:
+        return
+    for comando in FTS_SQLITE:
+        connection.execute(text(comando))
+
+
+def palavras_busca(termo: str) -> List[str]:
+    return re.findall(r"\w+", termo)[:MAX_PALAVRAS]
+
+
+def _relevancia(palavras: List[str]):
+    """(condição de busca, relevância); menor relevância = melhor resultado"""
+    if engine.dialect.name == "postgresql":
+        consulta = func.to_tsquery(
+            literal_column("'portuguese'"),
+            func.f_unaccent(" & ".join(f"{palavra}:*" for palavra in palavras)),
+        )
+        busca = literal_column("evento.busca")
+        return busca.op("@@")(consulta), -func.ts_rank(busca, consulta)
+    fts = literal_column("evento_fts")
+    consulta = " ".join(f'"{palavra}"*' for palavra in palavras)
+    # bm25 com peso 2 para o nome (colunas na ordem da tabela FTS)
+    return fts.op("MATCH")(consulta), func.bm25(fts, 2.0, 1.0, 1.0)
+
+
+def select_busca(palavras: List[str], filtros: FiltrosEvento, paginacao: Paginacao):
+    condicao, relevancia = _relevancia(palavras)
+    relevancia = relevancia.label("relevancia")
+    statement = select_eventos_com_aprovacao().add_columns(relevancia).where(condicao)
+    if engine.dialect.name != "postgresql":
+        statement = statement.join(evento_fts, evento_fts.c.rowid == Evento.id)
+    statement = aplicar_filtros(statement, filtros)
+    if paginacao.cursor:
+        ultimo = decode_cursor_chaves(paginacao.cursor)
+        anterior = ultimo.get("relevancia", 0.0)
+        statement = statement.where(or_(
+            relevancia > anterior,
+            and_(relevancia == anterior, Evento.id > ultimo["id"]),
+        ))
+    return statement.order_by(None).order_by(relevancia, Evento.id).limit(paginacao.limit + 1)
+
+
+async def buscar_eventos(
+    session, termo: str, filtros: FiltrosEvento, paginacao: Paginacao
+) -> Tuple[List[dict], Optional[str]]:
+    """Eventos que casam com o termo, do mais relevante, e o cursor da próxima página"""
+    palavras = palavras_busca(termo)
+    if not palavras:
+        return [], None
+    rows = (await session.exec(select_busca(palavras, filtros, paginacao))).all()
+    proximo = None
+    if len(rows) > paginacao.limit:
+        rows = rows[:paginacao.limit]
+        ultimo = rows[-1]
+        proximo = encode_cursor(ultimo[0].id, relevancia=ultimo.relevancia)
+    unidades = {}
+    return [to_evento_with_unidade(row[0], row[1:-1], unidades) for row in rows], proximo
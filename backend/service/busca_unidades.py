@@ -0,0 +1,179 @@
+"""Busca de unidades por nome, sem diferenciar maiúsculas nem acentos ("saude" acha "Saúde").
+
+No Postgres a busca usa pg_trgm sobre f_unaccent(lower(nome_unidade)), com o
+índice GIN criado na migração e4b2c9d71f35. Nos outros bancos (SQLite local)
+usa `IndiceNgram`, um índice de trigramas em memória do processo. Cada busca
+confere a assinatura da tabela unidade (service/assinatura.py) e recarrega o
+índice quando ela mudou, venha a escrita deste worker, de outro ou de um
+script.
+
+O ranking segue a mesma ordem nos dois casos: nome igual ao termo, nome
+começando pelo termo, alguma palavra começando pelo termo, termo contido no
+nome e, por fim, a similaridade de trigramas (no índice em memória, termos
+com várias palavras também casam quando cada palavra inicia uma palavra do nome).
+"""
+import bisect
+import heapq
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import String, case, func, literal, or_
+from sqlmodel import select
+
+from db import engine
+from models import Unidade, UnidadeSugestao
+from service.assinatura import assinatura
+
+# Fração mínima dos trigramas do termo que o nome precisa ter para entrar no resultado
+SIMILARIDADE_MINIMA = 0.5
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sem acentos e com espaços colapsados"""
+    decomposto = unicodedata.normalize("NFKD", texto.casefold())
+    sem_acento = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acento.split())
+
+
+def trigramas_nome(normalizado: str) -> Set[str]:
+    """Trigramas de cada palavra com o preenchimento do pg_trgm ("  palavra ")"""
+    return {
+        palavra[i:i + 3]
+        for palavra in (f"  {p} " for p in normalizado.split())
+        for i in range(len(palavra) - 2)
+    }
+
+
+def trigramas_termo(normalizado: str) -> Set[str]:
+    """Trigramas do termo sem o espaço final, para casar prefixos (autocomplete)"""
+    return {
+        palavra[i:i + 3]
+        for palavra in (f"  {p}" for p in normalizado.split())
+        for i in range(len(palavra) - 2)
+    }
+
+
+class IndiceNgram:
+    """Índice em memória dos nomes de unidade.
+
+    `sufixos` guarda, em ordem, o nome normalizado a partir de cada início de
+    palavra: os nomes que começam pelo termo ou têm palavra começando por ele
+    saem de uma busca binária. Os trigramas -> ids só são percorridos quando
+    nada casa por prefixo (termo no meio de palavra ou com erro de digitação).
+    """
+
+    def __init__(self):
+        # Assinatura da tabela unidade quando o índice foi carregado (None: não carregado)
+        self.assinatura = None
+        self.nomes: Dict[int, str] = {}
+        self.normalizados: Dict[int, str] = {}
+        self.sufixos: List[Tuple[str, int]] = []
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+
+    @staticmethod
+    def _sufixos(normalizado: str) -> List[str]:
+        return [normalizado[i:] for i in range(len(normalizado)) if i == 0 or normalizado[i - 1] == " "]
+
+    def _indexar(self, unidade_id: int, nome: str) -> str:
+        normalizado = normalizar(nome)
+        self.nomes[unidade_id] = nome
+        self.normalizados[unidade_id] = normalizado
+        for trigrama in trigramas_nome(normalizado):
+            self.postings[trigrama].add(unidade_id)
+        return normalizado
+
+    def carregar(self, linhas, assinatura=None) -> None:
+        self.__init__()
+        for unidade_id, nome in linhas:
+            normalizado = self._indexar(unidade_id, nome)
+            self.sufixos.extend((sufixo, unidade_id) for sufixo in self._sufixos(normalizado))
+        self.sufixos.sort()
+        self.assinatura = assinatura
+
+    def _com_prefixo(self, prefixo: str) -> List[Tuple[str, int]]:
+        inicio = bisect.bisect_left(self.sufixos, (prefixo,))
+        fim = bisect.bisect_left(self.sufixos, (prefixo + "\uffff",))
+        return self.sufixos[inicio:fim]
+
+    def buscar(self, termo: str, limite: int) -> List[UnidadeSugestao]:
+        termo = normalizar(termo)
+        if not termo:
+            return []
+        # id -> (rank, similaridade)
+        encontrados: Dict[int, Tuple[int, float]] = {}
+        for sufixo, unidade_id in self._com_prefixo(termo):
+            rank = 3
+            if sufixo == self.normalizados[unidade_id]:
+                rank = 5 if sufixo == termo else 4
+            if encontrados.get(unidade_id, (0,))[0] < rank:
+                encontrados[unidade_id] = (rank, 1.0)
+
+        palavras = termo.split()
+        if len(palavras) > 1 and len(encontrados) < limite:
+            # Cada palavra do termo é início de alguma palavra do nome ("coord educ")
+            conjuntos = sorted(
+                ({unidade_id for _, unidade_id in self._com_prefixo(palavra)} for palavra in palavras),
+                key=len,
+            )
+            for unidade_id in conjuntos[0].intersection(*conjuntos[1:]):
+                encontrados.setdefault(unidade_id, (2, 1.0))
+
+        if not encontrados:
+            consulta = trigramas_termo(termo)
+            compartilhados = Counter()
+            for trigrama in consulta:
+                compartilhados.update(self.postings.get(trigrama, ()))
+            for unidade_id, n in compartilhados.items():
+                similaridade = n / len(consulta)
+                if unidade_id not in encontrados and similaridade >= SIMILARIDADE_MINIMA:
+                    rank = 1 if termo in self.normalizados[unidade_id] else 0
+                    encontrados[unidade_id] = (rank, similaridade)
+
+        melhores = heapq.nlargest(
+            limite,
+            encontrados.items(),
+            key=lambda item: (*item[1], -len(self.nomes[item[0]])),
+        )
+        return [UnidadeSugestao(id=unidade_id, nome_unidade=self.nomes[unidade_id]) for unidade_id, _ in melhores]
+
+
+indice = IndiceNgram()
+
+
+async def _buscar_em_memoria(session, termo: str, limite: int) -> List[UnidadeSugestao]:
+    atual = await assinatura(("unidade",), session)
+    if indice.assinatura != atual:
+        # Assinatura lida antes das linhas: uma escrita no meio só faz recarregar de novo
+        linhas = (await session.exec(select(Unidade.id, Unidade.nome_unidade))).all()
+        indice.carregar(linhas, atual)
+    return indice.buscar(termo, limite)
+
+
+async def _buscar_trigram(session, termo: str, limite: int) -> List[UnidadeSugestao]:
+    nome = func.f_unaccent(func.lower(Unidade.nome_unidade), type_=String)
+    termo = normalizar(termo)
+    padrao = termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    rank = case(
+        (nome == termo, 4),
+        (nome.like(padrao + "%"), 3),
+        (literal(" ").concat(nome).like("% " + padrao + "%"), 2),
+        (nome.like("%" + padrao + "%"), 1),
+        else_=0,
+    )
+    statement = (
+        select(Unidade.id, Unidade.nome_unidade)
+        # <% (word_similarity) e LIKE usam o índice GIN de trigramas
+        .where(or_(literal(termo).op("<%")(nome), nome.like("%" + padrao + "%")))
+        .order_by(rank.desc(), func.word_similarity(termo, nome).desc(), func.length(Unidade.nome_unidade))
+        .limit(limite)
+    )
+    linhas = (await session.exec(statement)).all()
+    return [UnidadeSugestao(id=unidade_id, nome_unidade=nome_unidade) for unidade_id, nome_unidade in linhas]
+
+
+async def buscar_unidades(session, termo: str, limite: int) -> List[UnidadeSugestao]:
+    """Unidades cujo nome casa com o termo, da mais para a menos relevante"""
+    if engine.dialect.name == "postgresql":
+        return await _buscar_trigram(session, termo, limite)
+    return await _buscar_em_memoria(session, termo, limite)
@@ -0,0 +1,170 @@
+"""Cache das respostas GET já serializadas, com ETag e invalidação por versão de tabela.
+
+A chave do cache inclui caminho, query string e, para as tabelas que o
+endpoint lê (declaradas com `@cacheado(...)`), a assinatura lida do banco
+(service/assinatura.py) e um contador de versão em memória que os routers
+incrementam com `invalidar(...)` depois de cada escrita. Qualquer escrita,
+inclusive de outro worker ou de um script que grava direto no banco, torna
+as entradas antigas inalcançáveis e elas saem pelo LRU. Um acerto custa a
+consulta da assinatura (agregados indexados) no lugar da consulta do endpoint.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from service.assinatura import assinatura
+from service.profiling import RotaPerfilada
+
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_MAX_ENTRADAS = int(os.getenv("CACHE_MAX_ENTRADAS", "512"))
+
+versoes: Dict[str, int] = {}
+
+
+def invalidar(*tabelas: str) -> None:
+    """Incrementa a versão das tabelas alteradas (chamar depois do commit)"""
+    for tabela in tabelas:
+        versoes[tabela] = versoes.get(tabela, 0) + 1
+
+
+def cacheado(*tabelas: str):
+    """Marca o endpoint como cacheável, dependente das tabelas informadas.
+
+    Deve ficar abaixo do decorator da rota (@router.get) e só tem efeito em
+    routers com route_class=RotaCacheada.
+    """
+    def decorator(endpoint):
+        endpoint.cache_tabelas = tabelas
+        return endpoint
+    return decorator
+
+
+class EntradaCache:
+    __slots__ = ("body", "headers", "etag")
+
+    def __init__(self, body: bytes, headers: Dict[str, str], etag: str):
+        self.body = body
+        self.headers = headers
+        self.etag = etag
+
+
+class RespostaCache:
+    """LRU limitado por número de entradas e pelo total de bytes"""
+
+    def __init__(self, max_bytes: int, max_entradas: int):
+        self.max_bytes = max_bytes
+        self.max_entradas = max_entradas
+        self.entradas: "OrderedDict[Tuple, EntradaCache]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.nao_modificados = 0
+        self.despejos = 0
+
+    def get(self, chave: Tuple) -> Optional[EntradaCache]:
+        entrada = self.entradas.get(chave)
+        if entrada is None:
+            self.misses += 1
+            return None
+        self.entradas.move_to_end(chave)
+        self.hits += 1
+        return entrada
+
+    def put(self, chave: Tuple, entrada: EntradaCache) -> None:
+        tamanho = len(entrada.body)
+        if tamanho > self.max_bytes:
+            return
+        anterior = self.entradas.pop(chave, None)
+        if anterior is not None:
+            self.bytes -= len(anterior.body)
+        self.entradas[chave] = entrada
+        self.bytes += tamanho
+        while self.bytes > self.max_bytes or len(self.entradas) > self.max_entradas:
+            _, removida = self.entradas.popitem(last=False)
+            self.bytes -= len(removida.body)
+            self.despejos += 1
+
+    def clear(self) -> None:
+        self.entradas.clear()
+        self.bytes = 0
+
+    def snapshot(self) -> dict:
+        consultas = self.hits + self.misses
+        return {
+            "entradas": len(self.entradas),
+            "bytes": self.bytes,
+            "max_entradas": self.max_entradas,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_acerto": round(self.hits / consultas, 4) if consultas else 0.0,
+            "nao_modificados": self.nao_modificados,
+            "despejos": self.despejos,
+            "versoes": dict(versoes),
+        }
+
+
+cache = RespostaCache(CACHE_MAX_BYTES, CACHE_MAX_ENTRADAS)
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _nao_modificado(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidatos = {valor.strip().removeprefix("W/") for valor in if_none_match.split(",")}
+    return etag in candidatos or "*" in candidatos
+
+
+def _responder(request: Request, entrada: EntradaCache) -> Response:
+    if _nao_modificado(request, entrada.etag):
+        cache.nao_modificados += 1
+        return Response(status_code=304, headers={"ETag": entrada.etag, "Cache-Control": "no-cache"})
+    return Response(content=entrada.body, headers=entrada.headers)
+
+
+class RotaCacheada(RotaPerfilada):
+    """Rota que serve GETs marcados com @cacheado a partir do cache, com ETag/304"""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        tabelas = getattr(self.endpoint, "cache_tabelas", None)
+        if not tabelas or "GET" not in self.methods:
+            return handler
+
+        async def handler_cacheado(request: Request):
+            # Versões e assinatura lidas antes de executar: uma escrita concorrente
+            # muda a chave e a entrada gravada aqui nunca mais é consultada
+            chave = (
+                request.url.path,
+                tuple(sorted(request.query_params.multi_items())),
+                tuple(versoes.get(tabela, 0) for tabela in tabelas),
+                await assinatura(tabelas),
+            )
+            entrada = cache.get(chave)
+            if entrada is not None:
+                return _responder(request, entrada)
+
+            response = await handler(request)
+            if response.status_code != 200 or not hasattr(response, "body"):
+                return response
+
+            etag = _etag(response.body)
+            headers = {
+                chave_header.decode("latin-1"): valor.decode("latin-1")
+                for chave_header, valor in response.raw_headers
+                if chave_header != b"content-length"
+            }
+            headers["ETag"] = etag
+            headers["Cache-Control"] = "no-cache"
+            entrada = EntradaCache(response.body, headers, etag)
+            cache.put(chave, entrada)
+            return _responder(request, entrada)
+
+        return handler_cacheado
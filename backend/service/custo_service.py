@@ -0,0 +1,64 @@
+from sqlalchemy import case, func
+from sqlmodel import select
+
+from models import (
+    CustoMes, CustoTotal, CustoUnidade, Evento, EventoAprovado, FiltrosEvento, MonthEnum,
+    Unidade
+)
+from service.evento_service import aplicar_filtros, juntar_aprovacao
+from service.precos import custo_expr
+
+
+def _select_totais(filtros: FiltrosEvento, *agrupamento):
+    """Somatórios de custo solicitado e aprovado, agrupados pelas colunas de `agrupamento`"""
+    statement = select(
+        *agrupamento,
+        func.count(Evento.id).label("eventos"),
+        func.coalesce(func.sum(custo_expr(Evento)), 0).label("custo_solicitado"),
+        func.count(EventoAprovado.id).label("eventos_aprovados"),
+        func.coalesce(func.sum(custo_expr(EventoAprovado)), 0).label("custo_aprovado"),
+    ).select_from(Evento)
+    statement = aplicar_filtros(juntar_aprovacao(statement), filtros)
+    if agrupamento:
+        statement = statement.group_by(*agrupamento)
+    return statement
+
+
+def select_custos_eventos(filtros: FiltrosEvento):
+    """Custo solicitado e aprovado (nulo se não aprovado) de cada evento"""
+    statement = select(
+        Evento.id,
+        Evento.nome,
+        Evento.mes_previsto,
+        Evento.unidade_id,
+        custo_expr(Evento).label("custo_solicitado"),
+        case(
+            (EventoAprovado.id.is_not(None), custo_expr(EventoAprovado)), else_=None
+        ).label("custo_aprovado"),
+    ).select_from(Evento)
+    return aplicar_filtros(juntar_aprovacao(statement), filtros).order_by(Evento.id)
+
+
+async def custos_eventos(session, statement) -> list[dict]:
+    """Linhas no formato CustoEvento, sem validar cada uma (os tipos vêm do banco)"""
+    rows = (await session.exec(statement)).all()
+    return [dict(row._mapping) for row in rows]
+
+
+async def custos_por_mes(session, filtros: FiltrosEvento) -> list[CustoMes]:
+    rows = (await session.exec(_select_totais(filtros, Evento.mes_previsto))).all()
+    custos = [CustoMes.model_validate(row._mapping) for row in rows]
+    return sorted(custos, key=lambda custo: list(MonthEnum).index(custo.mes_previsto))
+
+
+async def custos_por_unidade(session, filtros: FiltrosEvento) -> list[CustoUnidade]:
+    statement = _select_totais(filtros, Evento.unidade_id, Unidade.nome_unidade).outerjoin(
+        Unidade, Unidade.id == Evento.unidade_id
+    )
+    rows = (await session.exec(statement.order_by(Unidade.nome_unidade))).all()
+    return [CustoUnidade.model_validate(row._mapping) for row in rows]
+
+
+async def custo_total(session, filtros: FiltrosEvento) -> CustoTotal:
+    row = (await session.exec(_select_totais(filtros))).one()
+    return CustoTotal.model_validate(row._mapping)
@@ -0,0 +1,302 @@
+from datetime import datetime
+from operator import attrgetter
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, insert, literal, update
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+
+from db import upsert_insert
+from models import (
+    AprovacaoLoteItem, Evento, EventoAprovado, EventoRead, FiltrosEvento, FormSubmissionData, MonthEnum,
+    SelecaoEventos, Unidade, UnidadeRead, brasilia_now
+)
+
+
+# Linhas por INSERT de múltiplas linhas (13 colunas -> 13 mil parâmetros)
+LOTE_INSERT = 1000
+
+# Ids por cláusula IN (abaixo do limite de parâmetros do SQLite e do asyncpg)
+LOTE_IDS = 5000
+
+# Campos do evento que podem ser sobrescritos pela aprovação
+CAMPOS_APROVADOS = (
+    "nome",
+    "quantidade_pessoas",
+    "coffee_break_manha",
+    "coffee_break_tarde",
+    "almoco",
+    "jantar",
+    "cerimonial",
+)
+
+# Campos das respostas, lidos direto dos atributos do ORM
+CAMPOS_EVENTO = tuple(EventoRead.model_fields)
+CAMPOS_UNIDADE = tuple(UnidadeRead.model_fields)
+_valores_evento = attrgetter(*CAMPOS_EVENTO)
+_valores_unidade = attrgetter(*CAMPOS_UNIDADE)
+
+
+def juntar_aprovacao(statement, isouter: bool = True):
+    """Junta a aprovação do evento (no máximo uma: índice único em evento_id)"""
+    return statement.join(EventoAprovado, EventoAprovado.evento_id == Evento.id, isouter=isouter)
+
+
+def colunas_efetivas():
+    """Valores efetivos dos campos aprováveis: o aprovado, se houver, senão o solicitado"""
+    return [
+        func.coalesce(getattr(EventoAprovado, campo), getattr(Evento, campo)).label(campo)
+        for campo in CAMPOS_APROVADOS
+    ]
+
+
+def select_eventos_com_aprovacao():
+    """Consulta única de eventos com unidade e valores efetivos.
+
+    A unidade vem por joined eager load e a aprovação por outer join, já
+    resolvida em COALESCE no banco: cada linha é (evento, *valores efetivos
+    de CAMPOS_APROVADOS) e a listagem executa um único SELECT independente
+    do número de eventos.
+    """
+    return (
+        juntar_aprovacao(select(Evento, *colunas_efetivas()))
+        .options(joinedload(Evento.unidade))
+        .order_by(Evento.id)
+    )
+
+
+def select_exportacao():
+    """Mesma junção de select_eventos_com_aprovacao, mas em colunas (sem montar objetos ORM)"""
+    statement = (
+        select(
+            Evento.id,
+            Evento.nome,
+            Evento.unidade_responsavel,
+            Evento.nome_solicitante,
+            Evento.quantidade_pessoas,
+            Evento.mes_previsto,
+            Evento.coffee_break_manha,
+            Evento.coffee_break_tarde,
+            Evento.almoco,
+            Evento.jantar,
+            Evento.cerimonial,
+            Unidade.nome_unidade,
+            Evento.aprovado,
+            *[getattr(EventoAprovado, campo) for campo in CAMPOS_APROVADOS],
+            EventoAprovado.aprovado_at,
+        )
+        .select_from(Evento)
+        .outerjoin(Unidade, Unidade.id == Evento.unidade_id)
+    )
+    return juntar_aprovacao(statement).order_by(Evento.id)
+
+
+def condicoes_filtros(filtros: FiltrosEvento) -> list:
+    """Condições dos filtros da listagem (só colunas de evento)"""
+    condicoes = []
+    if filtros.mes is not None:
+        condicoes.append(Evento.mes_previsto == filtros.mes)
+    if filtros.unidade_id is not None:
+        condicoes.append(Evento.unidade_id == filtros.unidade_id)
+    if filtros.aprovado is not None:
+        condicoes.append(Evento.aprovado == filtros.aprovado)
+    if filtros.solicitante:
+        condicoes.append(Evento.nome_solicitante.icontains(filtros.solicitante, autoescape=True))
+    if filtros.data_inicio is not None:
+        condicoes.append(Evento.created_at >= filtros.data_inicio)
+    if filtros.data_fim is not None:
+        condicoes.append(Evento.created_at <= filtros.data_fim)
+    return condicoes
+
+
+def aplicar_filtros(statement, filtros: FiltrosEvento):
+    """Aplica os filtros da listagem na consulta de select_eventos_com_aprovacao"""
+    return statement.where(*condicoes_filtros(filtros))
+
+
+def condicao_selecao(selecao: SelecaoEventos):
+    """Condição única (ids + filtros) dos eventos de uma operação em lote; None se vazia"""
+    condicoes = condicoes_filtros(selecao)
+    if selecao.ids is not None:
+        condicoes.append(Evento.id.in_(selecao.ids))
+    return and_(*condicoes) if condicoes else None
+
+
+async def travar_eventos(session, filtro) -> list[int]:
+    """Ids dos eventos do filtro, travados (SELECT ... FOR UPDATE) até o fim da transação.
+
+    Chamado antes de retirar a contribuição atual do resumo: uma transação
+    concorrente no mesmo evento espera o commit desta e lê os valores já
+    novos, em vez de retirar a mesma contribuição duas vezes. A ordem por id
+    evita deadlock entre lotes. O SQLite não tem FOR UPDATE, mas só admite
+    uma transação de escrita por vez.
+    """
+    statement = select(Evento.id).where(filtro).order_by(Evento.id).with_for_update()
+    return list((await session.exec(statement)).all())
+
+
+def blocos(ids: list, tamanho: int = LOTE_IDS):
+    for inicio in range(0, len(ids), tamanho):
+        yield ids[inicio:inicio + tamanho]
+
+
+def evento_para_dict(evento: Evento) -> dict:
+    """Campos de EventoRead lidos do ORM, sem model_dump nem validação"""
+    return dict(zip(CAMPOS_EVENTO, _valores_evento(evento)))
+
+
+def unidade_para_dict(unidade: Unidade) -> dict:
+    """Campos de UnidadeRead lidos do ORM, sem model_dump nem validação"""
+    return dict(zip(CAMPOS_UNIDADE, _valores_unidade(unidade)))
+
+
+def to_evento_with_unidade(
+    evento: Evento, efetivos: Optional[tuple] = None, unidades: Optional[dict] = None
+) -> dict:
+    """Monta o evento de resposta (formato EventoWithUnidade) com os valores efetivos.
+
+    Os valores já vêm tipados do banco, então a linha é montada uma única vez
+    como dict; `unidades` reaproveita o dict de cada unidade entre as linhas.
+    """
+    evento_dict = evento_para_dict(evento)
+    if efetivos:
+        evento_dict.update(zip(CAMPOS_APROVADOS, efetivos))
+    unidade = evento.unidade
+    if unidade is None:
+        evento_dict["unidade"] = None
+    elif unidades is None:
+        evento_dict["unidade"] = unidade_para_dict(unidade)
+    else:
+        if unidade.id not in unidades:
+            unidades[unidade.id] = unidade_para_dict(unidade)
+        evento_dict["unidade"] = unidades[unidade.id]
+    return evento_dict
+
+
+async def listar_eventos(session, statement) -> list[dict]:
+    """Executa uma consulta de select_eventos_com_aprovacao e monta a resposta"""
+    rows = (await session.exec(statement)).all()
+    unidades = {}
+    return [to_evento_with_unidade(row[0], row[1:], unidades) for row in rows]
+
+
+async def montar_aprovacoes(session, itens: list[AprovacaoLoteItem]) -> tuple[list[dict], list[int]]:
+    """Valida (e trava, ver travar_eventos) os eventos em uma única consulta e aplica as
+    alterações sobre os valores solicitados.
+
+    Devolve (aprovações para upsert_aprovacoes, ids não encontrados); se um
+    evento aparece mais de uma vez, vale o último item.
+    """
+    por_evento = {item.evento_id: item for item in itens}
+    rows = (await session.exec(
+        select(Evento.id, *[getattr(Evento, campo) for campo in CAMPOS_APROVADOS])
+        .where(Evento.id.in_(list(por_evento)))
+        .order_by(Evento.id)
+        .with_for_update()
+    )).all()
+    aprovacoes = []
+    for evento_id, *solicitados in rows:
+        alteracoes = por_evento[evento_id].model_dump(exclude_none=True)
+        aprovacoes.append({**dict(zip(CAMPOS_APROVADOS, solicitados)), **alteracoes})
+    encontrados = {aprovacao["evento_id"] for aprovacao in aprovacoes}
+    return aprovacoes, [evento_id for evento_id in por_evento if evento_id not in encontrados]
+
+
+async def upsert_aprovacoes(session, aprovacoes: list[dict]) -> dict[int, int]:
+    """Grava as aprovações (uma por evento) e marca os eventos como aprovados (sem commit).
+
+    Cada item traz evento_id e os CAMPOS_APROVADOS; reaprovar sobrescreve a
+    aprovação anterior no mesmo INSERT ... ON CONFLICT (evento_id) DO UPDATE.
+    Devolve {evento_id: id da aprovação}.
+    """
+    tabela = EventoAprovado.__table__
+    agora = brasilia_now()
+    ids = {}
+    for inicio in range(0, len(aprovacoes), LOTE_INSERT):
+        statement = upsert_insert(tabela).values([
+            {**aprovacao, "aprovado_at": agora} for aprovacao in aprovacoes[inicio:inicio + LOTE_INSERT]
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=["evento_id"],
+            set_={coluna: statement.excluded[coluna] for coluna in (*CAMPOS_APROVADOS, "aprovado_at")},
+        ).returning(tabela.c.evento_id, tabela.c.id)
+        ids.update((await session.exec(statement)).all())
+    eventos = Evento.__table__
+    await session.exec(
+        update(eventos)
+        .where(eventos.c.id.in_(list(ids)))
+        .values(aprovado=True, updated_at=datetime.utcnow())
+    )
+    return ids
+
+
+async def aprovar_solicitados(session, filtro) -> None:
+    """Cria, com os valores solicitados, a aprovação dos eventos do filtro que ainda não têm uma"""
+    tabela = EventoAprovado.__table__
+    origem = select(
+        Evento.id,
+        *[getattr(Evento, campo) for campo in CAMPOS_APROVADOS],
+        literal(brasilia_now(), tabela.c.aprovado_at.type),
+    ).where(filtro)
+    statement = upsert_insert(tabela).from_select(("evento_id", *CAMPOS_APROVADOS, "aprovado_at"), origem)
+    await session.exec(statement.on_conflict_do_nothing(index_elements=["evento_id"]))
+
+
+async def remover_aprovacoes(session, filtro) -> None:
+    """Apaga a aprovação dos eventos do filtro (a condição é avaliada sobre evento)"""
+    await session.exec(
+        delete(EventoAprovado.__table__).where(EventoAprovado.evento_id.in_(select(Evento.id).where(filtro)))
+    )
+
+
+async def upsert_unidades(session, nomes: list[str]) -> dict[str, int]:
+    """Get-or-create das unidades por nome em um único INSERT ... ON CONFLICT ... RETURNING"""
+    nomes = list(dict.fromkeys(nomes))
+    agora = datetime.utcnow()
+    statement = upsert_insert(Unidade.__table__).values(
+        [{"nome_unidade": nome, "created_at": agora} for nome in nomes]
+    )
+    # DO UPDATE sem efeito para que as unidades já existentes também voltem no RETURNING
+    statement = statement.on_conflict_do_update(
+        index_elements=["nome_unidade"],
+        set_={"nome_unidade": statement.excluded.nome_unidade},
+    ).returning(Unidade.__table__.c.id, Unidade.__table__.c.nome_unidade)
+    rows = (await session.exec(statement)).all()
+    return {nome: unidade_id for unidade_id, nome in rows}
+
+
+async def inserir_eventos(session, linhas: list[dict]) -> list[int]:
+    """INSERT ... VALUES (...), (...) RETURNING id, em blocos de LOTE_INSERT linhas.
+
+    O bloco mantém o número de parâmetros por comando abaixo do limite do driver.
+    """
+    tabela = Evento.__table__
+    ids = []
+    for inicio in range(0, len(linhas), LOTE_INSERT):
+        statement = insert(tabela).values(linhas[inicio:inicio + LOTE_INSERT]).returning(tabela.c.id)
+        ids.extend((await session.exec(statement)).scalars())
+    return ids
+
+
+async def inserir_formularios(
+    session, formularios: list[FormSubmissionData]
+) -> tuple[dict[str, int], list[int]]:
+    """Cria unidades e eventos de um ou mais formulários (sem commit).
+
+    Os meses já devem ter sido validados contra MonthEnum.
+    """
+    unidades = await upsert_unidades(session, [form.nome_unidade for form in formularios])
+    agora = datetime.utcnow()
+    linhas = [
+        {
+            **evento_data.model_dump(),
+            "mes_previsto": MonthEnum(evento_data.mes_previsto),
+            "unidade_id": unidades[form.nome_unidade],
+            "aprovado": False,
+            "created_at": agora,
+            "updated_at": None,
+        }
+        for form in formularios
+        for evento_data in form.eventos
+    ]
+    return unidades, await inserir_eventos(session, linhas)
@@ -0,0 +1,173 @@
+import asyncio
+import csv
+import zlib
+from io import StringIO
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from sqlalchemy import case
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import engine
+from models import Evento, EventoAprovado, MonthEnum
+from service.evento_service import juntar_aprovacao
+from service.precos import PRECOS, custo_expr
+
+# Linhas buscadas por vez no cursor do servidor e bytes acumulados antes de enviar
+LOTE_CURSOR = 1000
+TAMANHO_CHUNK = 64 * 1024
+
+CABECALHO_CSV = [
+    "ID", "Nome", "Unidade Responsável", "Nome Solicitante", "Quantidade Pessoas",
+    "Mês Previsto", "Coffee Break Manhã", "Coffee Break Tarde", "Almoço", "Jantar", "Cerimonial", "Unidade",
+    "Aprovado", "Nome Aprovado", "Quantidade Pessoas Aprovada", "Coffee Break Manhã Aprovado",
+    "Coffee Break Tarde Aprovado", "Almoço Aprovado", "Jantar Aprovado", "Cerimonial Aprovado", "Aprovado Em"
+]
+
+# Planilha consolidada (layout do README), uma aba por mês; custos já calculados, sem fórmulas
+SERVICOS_PLANILHA = {
+    "coffee_break_manha": "COFFEE BREAK (MANHÃ) (SIM/NÃO)",
+    "coffee_break_tarde": "COFFEE BREAK (TARDE) (SIM/NÃO)",
+    "almoco": "ALMOÇO",
+    "jantar": "JANTAR",
+    "cerimonial": "CERIMONIAL (SIM/NÃO)",
+}
+CABECALHO_PLANILHA = [
+    "NOME DO EVENTO", "UNIDADE RESPONSÁVEL PELO EVENTO", "NOME DO SOLICITANTE", "PARA QUANTAS PESSOAS",
+    "MÊS PREVISTO PARA ACONTECER", *SERVICOS_PLANILHA.values(),
+    *[f"CUSTO {PRECOS[servico].descricao.upper()}" for servico in SERVICOS_PLANILHA],
+    "CUSTO TOTAL", "APROVADO (SIM/NÃO)", "CUSTO APROVADO",
+]
+CABECALHO_RESUMO = ["MÊS", "EVENTOS", "PESSOAS", "CUSTO TOTAL", "EVENTOS APROVADOS", "CUSTO APROVADO"]
+LARGURAS_PLANILHA = {"A": 40, "B": 40, "C": 28}
+
+
+def _formatar(valor):
+    if valor is None:
+        return ""
+    return getattr(valor, "value", valor)
+
+
+async def linhas_exportacao(statement):
+    """Itera as linhas de `statement` por um cursor do servidor, em lotes de LOTE_CURSOR.
+
+    Abre a própria sessão: o gerador é consumido pelo StreamingResponse depois
+    que a sessão da requisição já foi fechada.
+    """
+    async with AsyncSession(engine) as session:
+        result = await session.stream(statement.execution_options(yield_per=LOTE_CURSOR))
+        async for row in result:
+            yield row
+
+
+async def gerar_csv(statement, comprimir: bool = False):
+    """Gera o CSV em chunks de ~TAMANHO_CHUNK bytes, opcionalmente comprimido em gzip"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if comprimir else None
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    def esvaziar() -> bytes:
+        dados = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return compressor.compress(dados) if compressor else dados
+
+    writer.writerow(CABECALHO_CSV)
+    async for row in linhas_exportacao(statement):
+        writer.writerow([_formatar(valor) for valor in row])
+        if buffer.tell() >= TAMANHO_CHUNK:
+            chunk = esvaziar()
+            if chunk:
+                yield chunk
+
+    chunk = esvaziar()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def select_planilha():
+    """Eventos com o custo solicitado por serviço e o custo aprovado (nulo se não aprovado)"""
+    statement = select(
+        Evento.nome,
+        Evento.unidade_responsavel,
+        Evento.nome_solicitante,
+        Evento.quantidade_pessoas,
+        Evento.mes_previsto,
+        *[getattr(Evento, servico) for servico in SERVICOS_PLANILHA],
+        Evento.aprovado,
+        case((EventoAprovado.id.is_not(None), custo_expr(EventoAprovado)), else_=None).label("custo_aprovado"),
+    ).select_from(Evento)
+    return juntar_aprovacao(statement).order_by(Evento.id)
+
+
+def _sim_nao(valor: bool) -> str:
+    return "SIM" if valor else "NÃO"
+
+
+def _cabecalho(aba, titulos) -> None:
+    celulas = []
+    for titulo in titulos:
+        celula = WriteOnlyCell(aba, value=titulo)
+        celula.font = Font(bold=True)
+        celulas.append(celula)
+    aba.append(celulas)
+
+
+def _escrever_planilha(abas: dict, totais: dict, rows) -> None:
+    """Escreve um lote de linhas de select_planilha (roda fora do event loop)"""
+    for nome, unidade, solicitante, pessoas, mes, *servicos, aprovado, custo_aprovado in rows:
+        custos = [
+            (PRECOS[servico].valor * pessoas if PRECOS[servico].por_pessoa else PRECOS[servico].valor) if marcado else 0
+            for servico, marcado in zip(SERVICOS_PLANILHA, servicos)
+        ]
+        custo = sum(custos)
+        mes = MonthEnum(mes)
+        abas[mes].append([
+            nome, unidade, solicitante, pessoas, mes.value, *map(_sim_nao, servicos),
+            *custos, custo, _sim_nao(aprovado), custo_aprovado,
+        ])
+        total = totais[mes]
+        total[0] += 1
+        total[1] += pessoas
+        total[2] += custo
+        if custo_aprovado is not None:
+            total[3] += 1
+            total[4] += custo_aprovado
+
+
+async def gerar_xlsx(statement, destino: str) -> int:
+    """Grava a planilha consolidada em `destino` e devolve o número de eventos.
+
+    O workbook é write-only: cada aba vai para um arquivo temporário à medida
+    que as linhas chegam do cursor, então a memória não cresce com o número de
+    eventos. A escrita (CPU) roda em thread, um lote de LOTE_CURSOR por vez.
+    """
+    workbook = Workbook(write_only=True)
+    resumo = workbook.create_sheet("Resumo")
+    abas = {mes: workbook.create_sheet(mes.value) for mes in MonthEnum}
+    for aba in abas.values():
+        for coluna, largura in LARGURAS_PLANILHA.items():
+            aba.column_dimensions[coluna].width = largura
+        _cabecalho(aba, CABECALHO_PLANILHA)
+    # mês -> [eventos, pessoas, custo, eventos aprovados, custo aprovado]
+    totais = {mes: [0, 0, 0.0, 0, 0.0] for mes in MonthEnum}
+
+    lote = []
+    async for row in linhas_exportacao(statement):
+        lote.append(row)
+        if len(lote) >= LOTE_CURSOR:
+            await asyncio.to_thread(_escrever_planilha, abas, totais, lote)
+            lote = []
+    if lote:
+        await asyncio.to_thread(_escrever_planilha, abas, totais, lote)
+
+    resumo.column_dimensions["A"].width = 14
+    _cabecalho(resumo, CABECALHO_RESUMO)
+    for mes, (eventos, pessoas, custo, aprovados, custo_aprovado) in totais.items():
+        resumo.append([mes.value, eventos, pessoas, custo, aprovados, custo_aprovado])
+    await asyncio.to_thread(workbook.save, destino)
+    return sum(total[0] for total in totais.values())
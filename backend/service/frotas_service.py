@@ -0,0 +1,78 @@
+"""Pendências de manutenção e limpeza da frota (GET /api/frotas/pendencias).
+
+Um veículo está pendente quando faltam FROTAS_MARGEM_KM km ou menos para a
+próxima manutenção, ou quando a última limpeza tem mais de
+FROTAS_INTERVALO_LIMPEZA_DIAS - FROTAS_MARGEM_LIMPEZA_DIAS dias. O filtro
+usa os índices ix_veiculo_km_restantes (mesma expressão de km_restantes) e
+ix_veiculo_ultima_limpeza, e a ordenação por urgência também é feita no
+banco: só os veículos pendentes são lidos.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import DateTime, Float, case, cast, extract, func, literal, or_
+from sqlmodel import select
+
+from db import engine
+from models import StatusPendencia, Veiculo
+
+MARGEM_KM = int(os.getenv("FROTAS_MARGEM_KM", "1000"))
+INTERVALO_LIMPEZA = int(os.getenv("FROTAS_INTERVALO_LIMPEZA_DIAS", "30"))
+MARGEM_LIMPEZA = int(os.getenv("FROTAS_MARGEM_LIMPEZA_DIAS", "5"))
+
+# Mesma expressão do índice ix_veiculo_km_restantes
+km_restantes = Veiculo.proxima_manutencao - Veiculo.quilometragem
+
+
+def normalizar_placa(placa: str) -> str:
+    """ABC-1D23, abc 1d23 e ABC1D23 são a mesma placa (índice único)"""
+    return "".join(placa.split()).replace("-", "").upper()
+
+
+def dias_desde(coluna, agora: datetime, dialeto: Optional[str] = None):
+    """Dias (fracionários) entre `coluna` e `agora` (no dialeto do engine, se não informado)"""
+    agora = literal(agora, DateTime)
+    if (dialeto or engine.dialect.name) == "postgresql":
+        return extract("epoch", agora - coluna) / 86400
+    return func.julianday(agora) - func.julianday(coluna)
+
+
+def select_pendencias(margem_km: int, margem_dias: int, agora: datetime, limite: int):
+    """Veículos pendentes, do mais urgente para o menos urgente"""
+    dias = dias_desde(Veiculo.ultima_limpeza, agora)
+    urgencia_km = cast(km_restantes, Float) / margem_km
+    urgencia_limpeza = (INTERVALO_LIMPEZA - dias) / margem_dias
+    urgencia = case((urgencia_km < urgencia_limpeza, urgencia_km), else_=urgencia_limpeza)
+    limite_limpeza = agora - timedelta(days=INTERVALO_LIMPEZA - margem_dias)
+    return (
+        select(Veiculo, km_restantes.label("km_restantes"), dias.label("dias"), urgencia.label("urgencia"))
+        .where(or_(km_restantes <= margem_km, Veiculo.ultima_limpeza <= limite_limpeza))
+        .order_by(urgencia, Veiculo.id)
+        .limit(limite)
+    )
+
+
+def _status(restante: float, margem: int) -> StatusPendencia:
+    if restante <= 0:
+        return StatusPendencia.VENCIDA
+    if restante <= margem:
+        return StatusPendencia.PROXIMA
+    return StatusPendencia.EM_DIA
+
+
+async def listar_pendencias(session, margem_km: int, margem_dias: int, limite: int) -> list[dict]:
+    """Linhas no formato VeiculoPendencia"""
+    rows = (await session.exec(select_pendencias(margem_km, margem_dias, datetime.utcnow(), limite))).all()
+    pendencias = []
+    for veiculo, restantes, dias, urgencia in rows:
+        dias = float(dias)
+        pendencias.append({
+            **veiculo.model_dump(),
+            "km_restantes": restantes,
+            "dias_desde_limpeza": int(dias),
+            "manutencao": _status(restantes, margem_km),
+            "limpeza": _status(INTERVALO_LIMPEZA - dias, margem_dias),
+            "urgencia": round(float(urgencia), 4),
+        })
+    return pendencias
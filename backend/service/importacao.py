@@ -0,0 +1,317 @@
+"""Importação em massa de eventos a partir de CSV ou XLSX (POST /api/eventos/importar e importar.py).
+
+- O arquivo é lido em lotes de LOTE_IMPORTACAO linhas (csv.reader ou
+  openpyxl read-only), sem carregá-lo inteiro; leitura e validação de cada
+  lote rodam numa thread.
+- Cada linha é validada contra EventoFormData e MonthEnum. A que falha vai
+  para o relatório de erros (aba, linha e mensagens) e as demais seguem.
+- As unidades são resolvidas por um mapa nome -> id carregado uma vez; as
+  que faltam são criadas num único upsert por lote.
+- Os eventos são gravados em lote: COPY no Postgres (ids reservados antes na
+  sequence, para ajustar o resumo) e INSERT multi-VALUES nos demais bancos.
+- Tudo numa transação: ou entram todas as linhas válidas, ou nenhuma.
+
+Cabeçalhos aceitos: os do CSV exportado, os da planilha consolidada
+(README) e os nomes dos campos; maiúsculas e acentos não importam. A
+coluna "Unidade" (nome cadastrado da unidade) é obrigatória: o campo "unidade
+responsável" é texto livre e não serve para achar ou criar unidades.
+"""
+import asyncio
+import codecs
+import csv
+import io
+import os
+import unicodedata
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterator, Optional
+
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlmodel import select
+
+from db import engine
+from models import Evento, EventoFormData, MonthEnum, Unidade
+from service.evento_service import LOTE_INSERT, blocos, inserir_eventos, upsert_unidades
+from service.resumo_service import ajustar_resumo
+
+LOTE_IMPORTACAO = int(os.getenv("IMPORTACAO_LOTE", "5000"))
+# Erros devolvidos na resposta; o total vem em "rejeitados"
+MAX_ERROS_RESPOSTA = int(os.getenv("IMPORTACAO_MAX_ERROS", "1000"))
+
+SERVICOS = ("coffee_break_manha", "coffee_break_tarde", "almoco", "jantar", "cerimonial")
+COLUNAS = {
+    "nome": ("nome", "nome do evento", "evento"),
+    "unidade_responsavel": ("unidade_responsavel", "unidade responsável", "unidade responsável pelo evento"),
+    "nome_solicitante": ("nome_solicitante", "nome solicitante", "nome do solicitante", "solicitante"),
+    "quantidade_pessoas": ("quantidade_pessoas", "quantidade pessoas", "para quantas pessoas", "pessoas"),
+    "mes_previsto": ("mes_previsto", "mês previsto", "mês previsto para acontecer", "mês"),
+    "coffee_break_manha": ("coffee_break_manha", "coffee break manhã", "coffee break (manhã) (sim/não)"),
+    "coffee_break_tarde": ("coffee_break_tarde", "coffee break tarde", "coffee break (tarde) (sim/não)"),
+    "almoco": ("almoco", "almoço"),
+    "jantar": ("jantar",),
+    "cerimonial": ("cerimonial", "cerimonial (sim/não)"),
+    "nome_unidade": ("nome_unidade", "unidade"),
+}
+OBRIGATORIAS = ("nome", "unidade_responsavel", "nome_solicitante", "quantidade_pessoas", "mes_previsto")
+TEXTOS = ("nome", "unidade_responsavel", "nome_solicitante")
+COLUNAS_OBRIGATORIAS = (*OBRIGATORIAS, "nome_unidade")
+
+VERDADEIROS = {"sim", "s", "true", "1", "x", "yes"}
+FALSOS = {"nao", "n", "false", "0", "", "no"}
+
+
+def normalizar(texto) -> str:
+    """Minúsculas, sem acentos e com espaços simples (para cabeçalhos e meses)"""
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(texto.casefold().split())
+
+
+ALIASES = {normalizar(alias): campo for campo, aliases in COLUNAS.items() for alias in aliases}
+MESES = {
+    **{normalizar(mes.value): mes for mes in MonthEnum},
+    **{str(numero): mes for numero, mes in enumerate(MonthEnum, start=1)},
+}
+
+
+class ArquivoInvalido(ValueError):
+    """Problema no arquivo como um todo (formato, cabeçalho); erros de linha vão para o relatório"""
+
+
+def mapear_cabecalho(cabecalho) -> dict[str, int]:
+    """{campo: índice da coluna} das colunas reconhecidas"""
+    indices = {}
+    for indice, titulo in enumerate(cabecalho):
+        campo = ALIASES.get(normalizar(titulo)) if titulo is not None else None
+        if campo and campo not in indices:
+            indices[campo] = indice
+    return indices
+
+
+def _valor(valores, indice: Optional[int]):
+    if indice is None or indice >= len(valores):
+        return None
+    valor = valores[indice]
+    return valor.strip() if isinstance(valor, str) else valor
+
+
+def _booleano(valor):
+    if valor is None or isinstance(valor, bool):
+        return bool(valor)
+    texto = normalizar(valor)
+    if texto in VERDADEIROS:
+        return True
+    if texto in FALSOS:
+        return False
+    return valor  # o EventoFormData acusa o erro
+
+
+def validar_linha(indices: dict[str, int], valores) -> tuple[Optional[tuple[str, EventoFormData]], list[str]]:
+    """(nome da unidade, evento) da linha, ou a lista de erros"""
+    dados = {}
+    for campo in OBRIGATORIAS:
+        valor = _valor(valores, indices.get(campo))
+        if valor not in (None, ""):
+            # Célula numérica no xlsx (ex.: nome "2025") continua texto
+            dados[campo] = str(valor) if campo in TEXTOS and not isinstance(valor, str) else valor
+    for servico in SERVICOS:
+        dados[servico] = _booleano(_valor(valores, indices.get(servico)))
+    erros = []
+    mes = dados.get("mes_previsto")
+    if mes is not None:
+        if isinstance(mes, float) and mes.is_integer():
+            mes = int(mes)
+        dados["mes_previsto"] = MESES.get(normalizar(mes), mes)
+        if not isinstance(dados["mes_previsto"], MonthEnum):
+            erros.append(f"mes_previsto: Mês inválido: {mes}")
+    try:
+        evento = EventoFormData.model_validate(dados)
+    except ValidationError as e:
+        erros = [f"{'.'.join(map(str, erro['loc']))}: {erro['msg']}" for erro in e.errors()] + erros
+        return None, erros
+    if evento.quantidade_pessoas <= 0:
+        erros.append("quantidade_pessoas: deve ser maior que zero")
+    nome_unidade = _valor(valores, indices.get("nome_unidade"))
+    if nome_unidade in (None, ""):
+        erros.append("nome_unidade: Field required")
+    if erros:
+        return None, erros
+    evento.mes_previsto = MonthEnum(evento.mes_previsto).value
+    return (str(nome_unidade), evento), []
+
+
+def _conferir_cabecalho(indices: dict[str, int], onde: str) -> None:
+    faltando = [campo for campo in COLUNAS_OBRIGATORIAS if campo not in indices]
+    if faltando:
+        raise ArquivoInvalido(f"Colunas obrigatórias ausentes {onde}: {', '.join(faltando)}")
+
+
+def _texto_csv(arquivo) -> io.TextIOBase:
+    """UTF-8 (com ou sem BOM); se o início não decodificar, cp1252 (CSV salvo pelo Excel)"""
+    inicio = arquivo.read(64 * 1024)
+    arquivo.seek(0)
+    try:
+        codecs.getincrementaldecoder("utf-8-sig")().decode(inicio, final=False)
+        codificacao = "utf-8-sig"
+    except UnicodeDecodeError:
+        codificacao = "cp1252"
+    return io.TextIOWrapper(arquivo, encoding=codificacao, newline="")
+
+
+def ler_csv(arquivo) -> Iterator[tuple[Optional[str], int, dict, list]]:
+    texto = _texto_csv(arquivo)
+    primeira = texto.readline()
+    # Excel em português salva com ';'
+    delimitador = ";" if primeira.count(";") > primeira.count(",") else ","
+    cabecalho = next(csv.reader([primeira], delimiter=delimitador), [])
+    indices = mapear_cabecalho(cabecalho)
+    _conferir_cabecalho(indices, "no CSV")
+    leitor = csv.reader(texto, delimiter=delimitador)
+    for valores in leitor:
+        if any(valor.strip() for valor in valores):
+            # line_num conta a partir da segunda linha do arquivo (o cabeçalho já foi lido)
+            yield None, leitor.line_num + 1, indices, valores
+
+
+def ler_xlsx(arquivo) -> Iterator[tuple[Optional[str], int, dict, list]]:
+    """Todas as abas com cabeçalho de eventos; as demais (ex.: Resumo da planilha exportada) são ignoradas"""
+    try:
+        workbook = load_workbook(arquivo, read_only=True, data_only=True)
+    except Exception as e:
+        raise ArquivoInvalido(f"Arquivo xlsx inválido: {e}")
+    encontrou = False
+    try:
+        for aba in workbook.worksheets:
+            linhas = aba.iter_rows(values_only=True)
+            indices = mapear_cabecalho(next(linhas, ()))
+            if "nome" not in indices:
+                continue
+            _conferir_cabecalho(indices, f"na aba {aba.title}")
+            encontrou = True
+            for numero, valores in enumerate(linhas, start=2):
+                if any(valor not in (None, "") for valor in valores):
+                    yield aba.title, numero, indices, valores
+    finally:
+        workbook.close()
+    if not encontrou:
+        raise ArquivoInvalido("Nenhuma aba com o cabeçalho de eventos")
+
+
+LEITORES = {"csv": ler_csv, "xlsx": ler_xlsx}
+
+
+def formato_arquivo(nome: str) -> str:
+    formato = os.path.splitext(nome or "")[1].lower().lstrip(".")
+    if formato not in LEITORES:
+        raise ArquivoInvalido("Formato não suportado: envie .csv ou .xlsx")
+    return formato
+
+
+def lotes_validados(arquivo, formato: str):
+    """Gera (válidos, erros) por lote de LOTE_IMPORTACAO linhas"""
+    linhas = LEITORES[formato](arquivo)
+    while True:
+        lote = list(islice(linhas, LOTE_IMPORTACAO))
+        if not lote:
+            return
+        validos, erros = [], []
+        for aba, numero, indices, valores in lote:
+            resultado, mensagens = validar_linha(indices, valores)
+            if resultado is None:
+                erros.append({"aba": aba, "linha": numero, "erros": mensagens} if aba else
+                             {"linha": numero, "erros": mensagens})
+            else:
+                validos.append(resultado)
+        yield validos, erros
+
+
+async def mapa_unidades(session) -> dict[str, int]:
+    rows = (await session.exec(select(Unidade.nome_unidade, Unidade.id))).all()
+    return {nome: unidade_id for nome, unidade_id in rows}
+
+
+async def copiar_eventos(session, linhas: list[dict]) -> list[int]:
+    """COPY no Postgres: reserva os ids na sequence e copia as linhas com id explícito"""
+    sequence = func.pg_get_serial_sequence("evento", "id")
+    ids = list((await session.exec(
+        select(func.nextval(sequence)).select_from(func.generate_series(1, len(linhas)))
+    )).scalars())
+    colunas = ["id", *linhas[0]]
+    registros = [
+        # Enum do SQLAlchemy guarda o nome do membro (JANEIRO, MARCO, ...)
+        (evento_id, *[valor.name if isinstance(valor, MonthEnum) else valor for valor in linha.values()])
+        for evento_id, linha in zip(ids, linhas)
+    ]
+    conexao = await (await session.connection()).get_raw_connection()
+    await conexao.driver_connection.copy_records_to_table("evento", columns=colunas, records=registros)
+    return ids
+
+
+async def gravar_eventos(session, linhas: list[dict]) -> list[int]:
+    if engine.dialect.name == "postgresql":
+        return await copiar_eventos(session, linhas)
+    return await inserir_eventos(session, linhas)
+
+
+async def importar_eventos(
+    session,
+    arquivo,
+    formato: str,
+    simular: bool = False,
+    registrar_erro: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Importa os eventos de `arquivo` (binário, com seek) sem commit.
+
+    Com `simular`, só valida e conta o que seria gravado. Todos os erros de
+    linha passam por `registrar_erro`; a resposta guarda os primeiros
+    MAX_ERROS_RESPOSTA. Erros do arquivo como um todo levantam ArquivoInvalido.
+    """
+    lotes = lotes_validados(arquivo, formato)
+    unidades = await mapa_unidades(session)
+    criadas: dict[str, Optional[int]] = {}
+    resultado = {"importados": 0, "rejeitados": 0, "unidades_criadas": criadas, "erros": []}
+    agora = datetime.utcnow()
+
+    while True:
+        lote = await asyncio.to_thread(next, lotes, None)
+        if lote is None:
+            break
+        validos, erros = lote
+        resultado["rejeitados"] += len(erros)
+        for erro in erros:
+            if len(resultado["erros"]) < MAX_ERROS_RESPOSTA:
+                resultado["erros"].append(erro)
+            if registrar_erro:
+                registrar_erro(erro)
+        if not validos:
+            continue
+
+        novas = list(dict.fromkeys(nome for nome, _ in validos if nome not in unidades))
+        if novas and not simular:
+            for inicio in range(0, len(novas), LOTE_INSERT):
+                novas_ids = await upsert_unidades(session, novas[inicio:inicio + LOTE_INSERT])
+                unidades.update(novas_ids)
+                criadas.update(novas_ids)
+        elif novas:
+            criadas.update(dict.fromkeys(novas))
+            unidades.update(dict.fromkeys(novas))
+
+        resultado["importados"] += len(validos)
+        if simular:
+            continue
+        linhas = [
+            {
+                **evento.model_dump(),
+                "mes_previsto": MonthEnum(evento.mes_previsto),
+                "unidade_id": unidades[nome_unidade],
+                "aprovado": False,
+                "created_at": agora,
+                "updated_at": None,
+            }
+            for nome_unidade, evento in validos
+        ]
+        ids = await gravar_eventos(session, linhas)
+        for bloco in blocos(ids):
+            await ajustar_resumo(session, Evento.id.in_(bloco), 1)
+    return resultado
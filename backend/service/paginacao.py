@@ -0,0 +1,77 @@
+import base64
+import json
+import os
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlmodel import SQLModel
+
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "500"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "5000"))
+
+# Header com o token da próxima página (ausente na última página)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Paginacao(SQLModel):
+    cursor: Optional[str] = None
+    limit: int = PAGE_SIZE
+
+    @property
+    def ultimo_id(self) -> Optional[int]:
+        return decode_cursor(self.cursor) if self.cursor else None
+
+
+def get_paginacao(
+    cursor: Optional[str] = Query(None, description="Token retornado em X-Next-Cursor"),
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Paginacao:
+    return Paginacao(cursor=cursor, limit=limit)
+
+
+def get_paginacao_opcional(
+    cursor: Optional[str] = Query(None, description="Token retornado em X-Next-Cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Ausente (e sem cursor): lista completa"),
+) -> Optional[Paginacao]:
+    """Como get_paginacao, mas sem limit nem cursor não pagina (None): para listas pequenas
+    que os clientes consomem inteiras"""
+    if cursor is None and limit is None:
+        return None
+    return Paginacao(cursor=cursor, limit=limit or PAGE_SIZE)
+
+
+def encode_cursor(ultimo_id: int, **chaves) -> str:
+    """Token opaco com o id da última linha (e outras chaves de ordenação, se houver)"""
+    raw = json.dumps({"id": ultimo_id, **chaves}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor_chaves(token: str) -> dict:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        chaves = json.loads(base64.urlsafe_b64decode(padded))
+        chaves["id"] = int(chaves["id"])
+        return chaves
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def decode_cursor(token: str) -> int:
+    return decode_cursor_chaves(token)["id"]
+
+
+def paginar(statement, id_column, paginacao: Paginacao):
+    """Aplica keyset pagination por id (busca uma linha a mais para saber se há próxima página)"""
+    if paginacao.ultimo_id is not None:
+        statement = statement.where(id_column > paginacao.ultimo_id)
+    return statement.order_by(None).order_by(id_column).limit(paginacao.limit + 1)
+
+
+def fechar_pagina(itens: list, paginacao: Paginacao, response: Response) -> list:
+    """Corta a linha extra e publica o cursor da próxima página no header"""
+    if len(itens) > paginacao.limit:
+        itens = itens[:paginacao.limit]
+        ultimo = itens[-1]
+        ultimo_id = ultimo["id"] if isinstance(ultimo, dict) else ultimo.id
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(ultimo_id)
+    return itens
@@ -0,0 +1,114 @@
+"""Métricas do pool de conexões, coletadas a partir dos eventos do SQLAlchemy.
+
+O tempo de espera no checkout é medido em `InstrumentedAsyncPool._do_get`
+(o SQLAlchemy não tem evento "antes do checkout"): inclui a espera por uma
+conexão livre e, quando o pool cresce, a abertura da nova conexão.
+"""
+import bisect
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Limites superiores (ms) dos baldes do histograma de espera no checkout
+BALDES_ESPERA_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.checkins = 0
+        self.conexoes_abertas = 0
+        self.invalidacoes = 0
+        self.timeouts = 0
+        self.falhas_pre_ping = 0
+        self.checkouts_em_overflow = 0
+        self.pico_overflow = 0
+        self.espera_total_ms = 0.0
+        self.espera_max_ms = 0.0
+        self.histograma_espera = [0] * (len(BALDES_ESPERA_MS) + 1)
+
+    def registrar_espera(self, ms: float) -> None:
+        self.espera_total_ms += ms
+        self.espera_max_ms = max(self.espera_max_ms, ms)
+        self.histograma_espera[bisect.bisect_left(BALDES_ESPERA_MS, ms)] += 1
+
+    def snapshot(self, pool) -> dict:
+        esperas = sum(self.histograma_espera)
+        limites = [f"<={limite}ms" for limite in BALDES_ESPERA_MS] + [f">{BALDES_ESPERA_MS[-1]}ms"]
+        return {
+            "pool": type(pool).__name__,
+            "tamanho": _chamar(pool, "size"),
+            "max_overflow": getattr(pool, "_max_overflow", None),
+            "timeout": getattr(pool, "_timeout", None),
+            "em_uso": _chamar(pool, "checkedout"),
+            "livres": _chamar(pool, "checkedin"),
+            # QueuePool.overflow() começa em -pool_size; só o excedente interessa
+            "overflow_atual": max(_chamar(pool, "overflow") or 0, 0),
+            "pico_overflow": self.pico_overflow,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "checkouts_em_overflow": self.checkouts_em_overflow,
+            "conexoes_abertas": self.conexoes_abertas,
+            "invalidacoes": self.invalidacoes,
+            "timeouts": self.timeouts,
+            "falhas_pre_ping": self.falhas_pre_ping,
+            "espera_media_ms": round(self.espera_total_ms / esperas, 3) if esperas else 0.0,
+            "espera_max_ms": round(self.espera_max_ms, 3),
+            "histograma_espera": dict(zip(limites, self.histograma_espera)),
+        }
+
+
+def _chamar(pool, metodo: str):
+    return getattr(pool, metodo)() if hasattr(pool, metodo) else None
+
+
+metrics = PoolMetrics()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mede quanto tempo cada checkout esperou"""
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.registrar_espera((time.perf_counter() - inicio) * 1000)
+
+
+def instrumentar(engine) -> None:
+    """Registra os listeners de pool/engine no engine síncrono por trás do AsyncEngine"""
+    sync_engine = engine.sync_engine
+    pool = sync_engine.pool
+
+    @event.listens_for(pool, "connect")
+    def _connect(dbapi_connection, connection_record):
+        metrics.conexoes_abertas += 1
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        overflow = _chamar(pool, "overflow") or 0
+        if overflow > 0:
+            metrics.checkouts_em_overflow += 1
+            metrics.pico_overflow = max(metrics.pico_overflow, overflow)
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+
+    @event.listens_for(pool, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidacoes += 1
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(context):
+        if context.is_pre_ping:
+            metrics.falhas_pre_ping += 1
@@ -0,0 +1,36 @@
+import json
+import os
+from pathlib import Path
+
+from sqlalchemy import case, literal
+
+from models import Preco
+
+# Tabela de preços (serviço -> valor); pode ser trocada sem alterar código via PRECOS_PATH
+PRECOS_PATH = Path(os.getenv("PRECOS_PATH", Path(__file__).resolve().parent.parent / "precos.json"))
+
+
+def carregar_precos(path: Path = PRECOS_PATH) -> dict[str, Preco]:
+    with open(path, encoding="utf-8") as f:
+        return {servico: Preco(servico=servico, **dados) for servico, dados in json.load(f).items()}
+
+
+PRECOS = carregar_precos()
+
+
+def custo_expr(fonte):
+    """Expressão SQL do custo de um evento a partir das colunas de `fonte`"""
+    parcelas = []
+    for servico, preco in PRECOS.items():
+        valor = fonte.quantidade_pessoas * preco.valor if preco.por_pessoa else literal(preco.valor)
+        parcelas.append(case((getattr(fonte, servico), valor), else_=0))
+    return sum(parcelas[1:], parcelas[0])
+
+
+def custo_resumo(resumo):
+    """Custo de linhas de resumomensal pelos preços atuais (contagem ou pessoas de cada serviço)"""
+    parcelas = []
+    for servico, preco in PRECOS.items():
+        quantidade = getattr(resumo, f"pessoas_{servico}") if preco.por_pessoa else getattr(resumo, servico)
+        parcelas.append(quantidade * preco.valor)
+    return sum(parcelas[1:], parcelas[0])
@@ -0,0 +1,155 @@
+"""Perfil de cada requisição: consultas SQL, tempo no banco, no handler e total.
+
+- `PerfilMiddleware` cria o perfil da requisição e devolve o header
+  Server-Timing (db, app, ser, total);
+- `instrumentar_sql` conta cada comando executado pelo engine (eventos
+  before/after_cursor_execute) no perfil da requisição corrente;
+- `RotaPerfilada` (route_class dos routers) separa o tempo do endpoint do
+  restante da rota: resolução de dependências, validação e serialização
+  da resposta.
+
+Requisições acima de SLOW_REQUEST_MS ou de SLOW_REQUEST_QUERIES consultas
+(detector de N+1) vão para o logger "sead.lento" com o SQL executado.
+"""
+import asyncio
+import functools
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "20"))
+# Máximo de comandos distintos guardados por requisição para o log
+MAX_SQL_LOG = 50
+
+logger = logging.getLogger("sead.lento")
+
+
+class PerfilRequisicao:
+    def __init__(self):
+        self.consultas = 0
+        self.db_ms = 0.0
+        self.handler_ms = 0.0
+        self.rota_ms = 0.0
+        self.sql = Counter()
+
+    def registrar_sql(self, statement: str, ms: float) -> None:
+        self.consultas += 1
+        self.db_ms += ms
+        if statement in self.sql or len(self.sql) < MAX_SQL_LOG:
+            self.sql[statement] += 1
+
+    def server_timing(self, total_ms: float) -> str:
+        serializacao_ms = max(self.rota_ms - self.handler_ms, 0.0)
+        return ", ".join([
+            f'db;dur={self.db_ms:.1f};desc="{self.consultas} consultas"',
+            f"app;dur={self.handler_ms:.1f}",
+            f"ser;dur={serializacao_ms:.1f}",
+            f"total;dur={total_ms:.1f}",
+        ])
+
+
+_perfil: ContextVar[Optional[PerfilRequisicao]] = ContextVar("perfil_requisicao", default=None)
+
+
+def instrumentar_sql(engine) -> None:
+    """Conta os comandos e o tempo de banco no perfil da requisição corrente"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("perfil_inicio", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["perfil_inicio"].pop()
+        perfil = _perfil.get()
+        if perfil is not None:
+            perfil.registrar_sql(statement, (time.perf_counter() - inicio) * 1000)
+
+
+class RotaPerfilada(APIRoute):
+    """APIRoute que mede o tempo do endpoint e o tempo total da rota"""
+
+    def get_route_handler(self):
+        endpoint = self.dependant.call
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def endpoint_medido(*args, **kwargs):
+                inicio = time.perf_counter()
+                try:
+                    return await endpoint(*args, **kwargs)
+                finally:
+                    _registrar("handler_ms", inicio)
+        else:
+            @functools.wraps(endpoint)
+            def endpoint_medido(*args, **kwargs):
+                inicio = time.perf_counter()
+                try:
+                    return endpoint(*args, **kwargs)
+                finally:
+                    _registrar("handler_ms", inicio)
+
+        self.dependant.call = endpoint_medido
+        handler = super().get_route_handler()
+
+        async def rota_medida(request):
+            inicio = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                _registrar("rota_ms", inicio)
+
+        return rota_medida
+
+
+def _registrar(campo: str, inicio: float) -> None:
+    perfil = _perfil.get()
+    if perfil is not None:
+        setattr(perfil, campo, (time.perf_counter() - inicio) * 1000)
+
+
+class PerfilMiddleware:
+    """Middleware ASGI que publica o Server-Timing e registra requisições lentas"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        perfil = PerfilRequisicao()
+        token = _perfil.set(perfil)
+        inicio = time.perf_counter()
+
+        async def send_com_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - inicio) * 1000
+                MutableHeaders(scope=message).append("Server-Timing", perfil.server_timing(total_ms))
+                if total_ms >= SLOW_REQUEST_MS or perfil.consultas >= SLOW_REQUEST_QUERIES:
+                    _log_lento(scope, perfil, total_ms)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_com_timing)
+        finally:
+            _perfil.reset(token)
+
+
+def _log_lento(scope, perfil: PerfilRequisicao, total_ms: float) -> None:
+    caminho = scope["path"] + ("?" + scope["query_string"].decode() if scope["query_string"] else "")
+    linhas = [
+        f"{scope['method']} {caminho}: {total_ms:.1f}ms total, "
+        f"{perfil.consultas} consultas, {perfil.db_ms:.1f}ms no banco"
+    ]
+    for statement, vezes in perfil.sql.most_common():
+        linhas.append(f"  [{vezes}x] {' '.join(statement.split())}")
+    logger.warning("\n".join(linhas))
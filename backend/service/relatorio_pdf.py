@@ -0,0 +1,147 @@
+"""Renderização do relatório em PDF de eventos e custos de uma unidade.
+
+Roda nos processos do pool de tarefas (service/tarefas.py): recebe só dados
+simples (dicts, tuplas, strings e números), não acessa o banco e não importa
+o resto da aplicação.
+"""
+from fpdf import FPDF
+
+# (título, largura em mm, alinhamento) das colunas da tabela de eventos; A4 paisagem
+COLUNAS_EVENTOS = (
+    ("Evento", 97, "L"),
+    ("Mês", 24, "L"),
+    ("Pessoas", 18, "R"),
+    ("Serviços", 52, "L"),
+    ("Custo solicitado", 32, "R"),
+    ("Aprovado", 20, "C"),
+    ("Custo aprovado", 32, "R"),
+)
+COLUNAS_MESES = (
+    ("Mês", 40, "L"),
+    ("Eventos", 25, "R"),
+    ("Pessoas", 25, "R"),
+    ("Custo solicitado", 40, "R"),
+    ("Aprovados", 25, "R"),
+    ("Custo aprovado", 40, "R"),
+)
+ALTURA_LINHA = 6
+
+
+# Pontuação tipográfica comum fora do latin-1
+EQUIVALENTES = str.maketrans({"\u2013": "-", "\u2014": "-", "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+                              "\u2026": "..."})
+
+
+def _texto(valor) -> str:
+    """As fontes padrão do PDF só têm latin-1; o que não couber vira '?'"""
+    return str(valor).translate(EQUIVALENTES).encode("latin-1", "replace").decode("latin-1")
+
+
+def _moeda(valor) -> str:
+    if valor is None:
+        return "-"
+    return "R$ " + f"{valor:,.2f}".translate(str.maketrans(",.", ".,"))
+
+
+def _ajustar(pdf: FPDF, texto: str, largura: float) -> str:
+    """Corta o texto com reticências para caber na coluna"""
+    texto = _texto(texto)
+    if pdf.get_string_width(texto) <= largura - 2:
+        return texto
+    while texto and pdf.get_string_width(texto + "...") > largura - 2:
+        texto = texto[:-1]
+    return texto + "..."
+
+
+class RelatorioPDF(FPDF):
+    def __init__(self, titulo: str, gerado_em: str):
+        super().__init__(orientation="L", unit="mm", format="A4")
+        self.titulo = _texto(titulo)
+        self.gerado_em = _texto(gerado_em)
+        self.set_auto_page_break(True, margin=15)
+
+    def header(self):
+        self.set_font("Arial", "B", 13)
+        self.cell(0, 8, self.titulo, 0, 1)
+        self.set_font("Arial", "", 8)
+        self.cell(0, 5, _texto(f"Gerado em {self.gerado_em}"), 0, 1)
+        self.ln(2)
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font("Arial", "", 8)
+        self.cell(0, 5, _texto(f"Página {self.page_no()}"), 0, 0, "R")
+
+    def tabela(self, colunas, linhas, destacar_ultima: bool = False) -> None:
+        def cabecalho():
+            self.set_font("Arial", "B", 8)
+            self.set_fill_color(220, 220, 220)
+            for titulo, largura, _ in colunas:
+                self.cell(largura, ALTURA_LINHA, _texto(titulo), 1, 0, "C", True)
+            self.ln()
+            self.set_font("Arial", "", 8)
+
+        cabecalho()
+        for posicao, linha in enumerate(linhas):
+            if self.get_y() + ALTURA_LINHA > self.page_break_trigger:
+                self.add_page()
+                cabecalho()
+            if destacar_ultima and posicao == len(linhas) - 1:
+                self.set_font("Arial", "B", 8)
+            for (_, largura, alinhamento), valor in zip(colunas, linha):
+                self.cell(largura, ALTURA_LINHA, _ajustar(self, valor, largura), 1, 0, alinhamento)
+            self.ln()
+
+
+def renderizar_relatorio_unidade(dados: dict, destino: str) -> int:
+    """Grava em `destino` o PDF de eventos e custos de uma unidade; devolve o total de eventos.
+
+    `dados`:
+    - unidade, gerado_em: textos do cabeçalho;
+    - meses: nomes dos meses na ordem do ano;
+    - servicos: {sigla: descrição} dos serviços, na ordem das colunas de cada linha;
+    - eventos: tuplas (nome, mês, pessoas, *serviços, aprovado, custo solicitado,
+      custo aprovado ou None), já ordenadas por mês.
+    """
+    siglas = list(dados["servicos"])
+    totais = {mes: [0, 0, 0.0, 0, 0.0] for mes in dados["meses"]}
+    linhas = []
+    for nome, mes, pessoas, *resto in dados["eventos"]:
+        servicos, (aprovado, custo_solicitado, custo_aprovado) = resto[:len(siglas)], resto[len(siglas):]
+        total = totais[mes]
+        total[0] += 1
+        total[1] += pessoas
+        total[2] += custo_solicitado
+        if aprovado:
+            total[3] += 1
+            total[4] += custo_aprovado or 0
+        linhas.append((
+            nome, mes, pessoas,
+            ", ".join(sigla for sigla, marcado in zip(siglas, servicos) if marcado) or "-",
+            _moeda(custo_solicitado), "Sim" if aprovado else "Não",
+            _moeda(custo_aprovado if aprovado else None),
+        ))
+
+    geral = [sum(total[i] for total in totais.values()) for i in range(5)]
+    resumo = [
+        (mes, eventos, pessoas, _moeda(custo), aprovados, _moeda(custo_aprovado))
+        for mes, (eventos, pessoas, custo, aprovados, custo_aprovado) in totais.items()
+        if eventos
+    ]
+    resumo.append(("Total", geral[0], geral[1], _moeda(geral[2]), geral[3], _moeda(geral[4])))
+
+    pdf = RelatorioPDF(f"Eventos e custos - {dados['unidade']}", dados["gerado_em"])
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(0, 7, _texto("Resumo por mês"), 0, 1)
+    pdf.tabela(COLUNAS_MESES, resumo, destacar_ultima=True)
+    pdf.ln(4)
+    pdf.set_font("Arial", "", 8)
+    legenda = "; ".join(f"{sigla} = {descricao}" for sigla, descricao in dados["servicos"].items())
+    pdf.multi_cell(0, 5, _texto(f"Serviços: {legenda}"))
+    pdf.ln(2)
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(0, 7, "Eventos", 0, 1)
+    pdf.tabela(COLUNAS_EVENTOS, linhas)
+    pdf.output(destino, "F")
+    return len(linhas)
@@ -0,0 +1,132 @@
+"""Manutenção da tabela resumomensal.
+
+Toda escrita que altera eventos ou aprovações chama `ajustar_resumo` na
+mesma transação: com sinal -1 antes da alteração (retira a contribuição
+atual dos eventos afetados) e com sinal +1 depois (soma a nova). Cada
+chamada é um único INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE
+por variante, independente de quantos eventos são afetados.
+
+Os eventos afetados são travados antes do -1 (travar_eventos, SELECT ...
+FOR UPDATE) e as três etapas usam os mesmos ids: no READ COMMITTED do
+Postgres, duas escritas concorrentes no mesmo evento retirariam a mesma
+contribuição duas vezes.
+
+Uso pela linha de comando (a partir de backend/):
+
+    python -m service.resumo_service verificar
+    python -m service.resumo_service reconstruir
+"""
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import func, literal, true
+from sqlmodel import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import engine, upsert_insert
+from models import Evento, EventoAprovado, ResumoMensal, VarianteResumo
+from service.evento_service import juntar_aprovacao
+
+CHAVE = ("variante", "mes_previsto", "unidade_id")
+SERVICOS = ("coffee_break_manha", "coffee_break_tarde", "almoco", "jantar", "cerimonial")
+# Contagem e pessoas de cada serviço: o custo é calculado na leitura (custo_resumo),
+# então uma troca da tabela de preços vale na hora, sem reconstruir o resumo
+CONTADORES = ("eventos", "pessoas", *SERVICOS, *[f"pessoas_{servico}" for servico in SERVICOS])
+
+
+def select_contribuicoes(variante: VarianteResumo, filtro=true(), sinal: int = 1):
+    """Totais por mês/unidade dos eventos que atendem `filtro`, multiplicados por `sinal`"""
+    fonte = Evento if variante == VarianteResumo.SOLICITADO else EventoAprovado
+    unidade_id = func.coalesce(Evento.unidade_id, 0)
+    statement = select(
+        literal(variante, ResumoMensal.__table__.c.variante.type).label("variante"),
+        Evento.mes_previsto,
+        unidade_id.label("unidade_id"),
+        (func.count() * sinal).label("eventos"),
+        (func.coalesce(func.sum(fonte.quantidade_pessoas), 0) * sinal).label("pessoas"),
+        *[(func.count().filter(getattr(fonte, servico)) * sinal).label(servico) for servico in SERVICOS],
+        *[
+            (func.coalesce(func.sum(fonte.quantidade_pessoas).filter(getattr(fonte, servico)), 0) * sinal)
+            .label(f"pessoas_{servico}")
+            for servico in SERVICOS
+        ],
+    ).select_from(Evento)
+    if variante == VarianteResumo.APROVADO:
+        statement = juntar_aprovacao(statement, isouter=False)
+    return statement.where(filtro).group_by(Evento.mes_previsto, unidade_id)
+
+
+async def ajustar_resumo(session, filtro, sinal: int, variantes=tuple(VarianteResumo)):
+    """Soma (sinal=1) ou retira (sinal=-1) do resumo a contribuição dos eventos do filtro"""
+    tabela = ResumoMensal.__table__
+    for variante in variantes:
+        statement = upsert_insert(tabela).from_select(
+            CHAVE + CONTADORES, select_contribuicoes(variante, filtro, sinal)
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=list(CHAVE),
+            set_={c: tabela.c[c] + statement.excluded[c] for c in CONTADORES},
+        )
+        await session.exec(statement)
+
+
+async def reconstruir_resumo(session) -> None:
+    """Recalcula a tabela inteira a partir de evento/eventoaprovado"""
+    await session.exec(delete(ResumoMensal))
+    await ajustar_resumo(session, true(), 1)
+
+
+async def verificar_resumo(session) -> list[dict]:
+    """Compara a tabela com o recálculo completo e devolve as divergências"""
+    esperado = {}
+    for variante in VarianteResumo:
+        for row in (await session.exec(select_contribuicoes(variante))).all():
+            esperado[tuple(row[:3])] = dict(zip(CONTADORES, row[3:]))
+    atual = {
+        tuple(getattr(r, c) for c in CHAVE): {c: getattr(r, c) for c in CONTADORES}
+        for r in (await session.exec(select(ResumoMensal))).all()
+    }
+    zero = dict.fromkeys(CONTADORES, 0)
+    divergencias = []
+    for chave in esperado.keys() | atual.keys():
+        valores_esperados = esperado.get(chave, zero)
+        valores_atuais = atual.get(chave, zero)
+        diferentes = {
+            c: {"esperado": valores_esperados[c], "atual": valores_atuais[c]}
+            for c in CONTADORES
+            if valores_esperados[c] != valores_atuais[c]
+        }
+        if diferentes:
+            valores_chave = (getattr(v, "value", v) for v in chave)
+            divergencias.append({"chave": dict(zip(CHAVE, valores_chave)), "campos": diferentes})
+    return divergencias
+
+
+async def executar(acao: str) -> int:
+    try:
+        async with AsyncSession(engine) as session:
+            if acao == "reconstruir":
+                await reconstruir_resumo(session)
+                await session.commit()
+                print("Resumo reconstruído")
+                return 0
+
+            divergencias = await verificar_resumo(session)
+            for divergencia in divergencias:
+                print(divergencia)
+            print(f"{len(divergencias)} divergência(s) encontrada(s)")
+            return 1 if divergencias else 0
+    finally:
+        await engine.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verifica ou reconstrói a tabela resumomensal")
+    parser.add_argument("acao", choices=["verificar", "reconstruir"])
+    args = parser.parse_args(argv)
+    return asyncio.run(executar(args.acao))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
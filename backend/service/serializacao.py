@@ -0,0 +1,34 @@
+"""Resposta JSON codificada com orjson, sem a validação do response_model.
+
+Quando o endpoint devolve um `Response`, o FastAPI o envia como está: as
+listagens montam as linhas uma única vez, direto dos atributos do ORM, e não
+passam de novo por validação + serialização + json.dumps. O response_model
+continua no decorator para a documentação (OpenAPI).
+"""
+from decimal import Decimal
+from typing import Optional
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+# Headers que pertencem ao corpo e não devem ser copiados do Response injetado
+HEADERS_DO_CORPO = (b"content-length", b"content-type")
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+
+def resposta_json(conteudo, response: Optional[Response] = None) -> Response:
+    """Codifica com orjson e copia os headers já definidos em `response` (ex.: X-Next-Cursor)"""
+    resposta = Response(orjson.dumps(conteudo, default=_default), media_type="application/json")
+    if response is not None:
+        resposta.raw_headers.extend(
+            (chave, valor) for chave, valor in response.raw_headers if chave not in HEADERS_DO_CORPO
+        )
+    return resposta
@@ -0,0 +1,123 @@
+"""Sincronização incremental de eventos (GET /api/eventos/changes).
+
+O cliente guarda o token da última resposta e pede só o que mudou desde
+então:
+
+- eventos criados ou alterados, pela ordem de coalesce(updated_at, created_at)
+  (índice ix_evento_alterado_em) e id;
+- eventos deletados, pelos registros de eventoremovido (tombstones).
+
+Os horários vêm do relógio da aplicação, e uma transação pode gravar o
+horário e só confirmar depois. Por isso nenhum token passa de agora menos
+SYNC_MARGEM_SEGUNDOS (nem o da última página, nem o das intermediárias), e
+as alterações mais recentes podem vir de novo na chamada seguinte (reaplicar
+a mesma alteração não muda o resultado).
+
+Renomear uma unidade atualiza updated_at dos seus eventos (tocar_eventos),
+para que eles voltem na sincronização com o nome novo.
+
+Os tombstones são guardados por SYNC_RETENCAO_DIAS: os mais antigos são
+apagados a cada remoção, e um token anterior a esse prazo recebe 410 (o
+cliente refaz a carga completa, que não traz tombstones).
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, func, insert, or_, update
+from sqlmodel import select
+
+from models import Evento, EventoRemovido
+from service.evento_service import LOTE_INSERT, listar_eventos, select_eventos_com_aprovacao
+from service.paginacao import decode_cursor_chaves, encode_cursor
+
+MARGEM_SYNC = timedelta(seconds=float(os.getenv("SYNC_MARGEM_SEGUNDOS", "5")))
+RETENCAO_REMOVIDOS = timedelta(days=float(os.getenv("SYNC_RETENCAO_DIAS", "30")))
+
+# Mesma expressão do índice ix_evento_alterado_em
+alterado_em = func.coalesce(Evento.updated_at, Evento.created_at)
+
+
+async def registrar_remocoes(session, ids: list[int]) -> None:
+    """Grava o tombstone dos eventos deletados (na mesma transação do DELETE)"""
+    agora = datetime.utcnow()
+    tabela = EventoRemovido.__table__
+    await session.exec(delete(tabela).where(tabela.c.removido_at < agora - RETENCAO_REMOVIDOS))
+    for inicio in range(0, len(ids), LOTE_INSERT):
+        await session.exec(insert(tabela).values([
+            {"evento_id": evento_id, "removido_at": agora} for evento_id in ids[inicio:inicio + LOTE_INSERT]
+        ]))
+
+
+async def tocar_eventos(session, filtro, horario: datetime) -> None:
+    """Marca os eventos do filtro como alterados em `horario` (antes do commit)"""
+    await session.exec(update(Evento).where(filtro).values(updated_at=horario))
+
+
+def decode_token(token: Optional[str]) -> Tuple[Optional[datetime], int]:
+    """(horário, último id) do token; (None, 0) sem token, ou seja, carga completa"""
+    if not token:
+        return None, 0
+    chaves = decode_cursor_chaves(token)
+    try:
+        return datetime.fromisoformat(chaves["t"]), chaves["id"]
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Token inválido")
+
+
+def encode_token(horario: datetime, ultimo_id: int = 0) -> str:
+    return encode_cursor(ultimo_id, t=horario.isoformat())
+
+
+async def buscar_alteracoes(session, token: Optional[str], limite: int) -> dict:
+    """Eventos alterados e removidos desde o token (formato EventoAlteracoes)"""
+    desde, ultimo_id = decode_token(token)
+    agora = datetime.utcnow()
+    # Horário até o qual as transações já confirmaram: nenhum token passa dele
+    confirmado = agora - MARGEM_SYNC
+    if desde is not None and desde < agora - RETENCAO_REMOVIDOS:
+        raise HTTPException(status_code=410, detail="Token expirado: refaça a carga completa (sem since)")
+
+    statement = select_eventos_com_aprovacao()
+    if desde is not None:
+        statement = statement.where(or_(
+            alterado_em > desde,
+            and_(alterado_em == desde, Evento.id > ultimo_id),
+        ))
+    statement = statement.order_by(None).order_by(alterado_em, Evento.id).limit(limite + 1)
+    eventos = await listar_eventos(session, statement)
+
+    mais = len(eventos) > limite
+    ate = None
+    if mais:
+        # Próxima página a partir do último evento; os removidos vão até o mesmo horário.
+        # Se ele passou do horário confirmado, a próxima página recomeça desse horário
+        # (os eventos seguintes vêm de novo, e nada confirmado depois fica para trás).
+        eventos = eventos[:limite]
+        ultimo = eventos[-1]
+        ate = ultimo["updated_at"] or ultimo["created_at"]
+        if ate <= confirmado:
+            novo_token = encode_token(ate, ultimo["id"])
+        else:
+            novo_token = encode_token(confirmado)
+    elif desde is not None and desde >= confirmado:
+        novo_token = token
+    else:
+        novo_token = encode_token(confirmado)
+
+    removidos = []
+    if desde is not None:
+        # Na carga completa não há o que remover no cliente
+        statement = select(EventoRemovido.evento_id, EventoRemovido.removido_at).where(
+            EventoRemovido.removido_at > desde
+        )
+        if ate is not None:
+            statement = statement.where(EventoRemovido.removido_at <= ate)
+        removidos = (await session.exec(statement.order_by(EventoRemovido.removido_at))).all()
+    return {
+        "eventos": eventos,
+        "removidos": [{"evento_id": evento_id, "removido_at": removido_at} for evento_id, removido_at in removidos],
+        "token": novo_token,
+        "mais": mais,
+    }
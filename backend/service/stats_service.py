@@ -0,0 +1,71 @@
+from sqlalchemy import func
+from sqlmodel import select
+
+from models import EventoStats, MonthEnum, ResumoMensal, Unidade, VarianteResumo
+from service.precos import custo_resumo
+
+
+# Nome exibido -> coluna de contagem do serviço
+SERVICOS = {
+    "Coffee Break Manhã": "coffee_break_manha",
+    "Coffee Break Tarde": "coffee_break_tarde",
+    "Almoço": "almoco",
+    "Jantar": "jantar",
+    "Cerimonial": "cerimonial",
+}
+
+ORDEM_MESES = {mes: i for i, mes in enumerate(MonthEnum)}
+
+
+def _select_resumo_por_mes(variante: VarianteResumo):
+    """Soma as linhas de resumomensal (mês x unidade) por mês"""
+    return (
+        select(
+            ResumoMensal.mes_previsto,
+            func.sum(ResumoMensal.eventos).label("eventos"),
+            func.sum(ResumoMensal.pessoas).label("pessoas"),
+            func.sum(custo_resumo(ResumoMensal)).label("custo"),
+            *[
+                func.sum(getattr(ResumoMensal, coluna)).label(coluna)
+                for coluna in SERVICOS.values()
+            ],
+        )
+        .where(ResumoMensal.variante == variante)
+        .group_by(ResumoMensal.mes_previsto)
+        .having(func.sum(ResumoMensal.eventos) > 0)
+    )
+
+
+def _montar_stats(rows, total_unidades: int) -> EventoStats:
+    rows = sorted(rows, key=lambda row: ORDEM_MESES[MonthEnum(row.mes_previsto)])
+    return EventoStats(
+        total_eventos=sum(row.eventos for row in rows),
+        total_unidades=total_unidades,
+        eventos_por_mes={MonthEnum(row.mes_previsto).value: row.eventos for row in rows},
+        pessoas_por_mes={MonthEnum(row.mes_previsto).value: row.pessoas for row in rows},
+        servicos_mais_solicitados={
+            nome: sum(getattr(row, coluna) for row in rows)
+            for nome, coluna in SERVICOS.items()
+        },
+        custo_por_mes={MonthEnum(row.mes_previsto).value: row.custo for row in rows},
+    )
+
+
+async def calcular_stats(session) -> EventoStats:
+    """Estatísticas dos valores solicitados"""
+    rows = (await session.exec(_select_resumo_por_mes(VarianteResumo.SOLICITADO))).all()
+    total_unidades = (await session.exec(select(func.count(Unidade.id)))).one()
+    return _montar_stats(rows, total_unidades)
+
+
+async def calcular_stats_aprovados(session) -> EventoStats:
+    """Estatísticas apenas dos eventos aprovados, com os valores de EventoAprovado"""
+    rows = (await session.exec(_select_resumo_por_mes(VarianteResumo.APROVADO))).all()
+    total_unidades = (await session.exec(
+        select(func.count(func.distinct(ResumoMensal.unidade_id))).where(
+            ResumoMensal.variante == VarianteResumo.APROVADO,
+            ResumoMensal.unidade_id != 0,
+            ResumoMensal.eventos > 0,
+        )
+    )).one()
+    return _montar_stats(rows, total_unidades)
@@ -0,0 +1,338 @@
+"""Fila de tarefas em segundo plano para relatórios pesados (POST /api/relatorios).
+
+O pedido vira uma tarefa: a requisição devolve o id na hora, o cliente
+consulta GET /api/relatorios/{id} e baixa o arquivo em .../download.
+
+- O PDF por unidade (CPU) é renderizado num pool de processos
+  (TAREFAS_PROCESSOS). Com TAREFAS_PROCESSOS=0 a renderização roda numa
+  thread do próprio processo: backend local, sem pool, para testes e
+  ambientes onde criar processos não é possível.
+- A planilha xlsx já escreve em threads (gerar_xlsx) e roda no processo da API.
+- No máximo TAREFAS_SIMULTANEAS tarefas executam ao mesmo tempo; as demais
+  ficam pendentes.
+- Os arquivos ficam em cache no disco (TAREFAS_PASTA) por
+  RELATORIOS_TTL_SEGUNDOS. A chave é o pedido mais uma assinatura dos dados
+  calculada no banco (contagens e última alteração de eventos, unidades e
+  tombstones) e da tabela de preços, então o cache vale entre workers e
+  reinícios. Pedidos iguais em andamento compartilham a mesma tarefa.
+- O estado de cada tarefa fica na memória e num .json na mesma pasta:
+  qualquer worker do host responde o status e o download.
+"""
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import orjson
+from sqlalchemy import case
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import engine
+from models import (
+    Evento, EventoAprovado, FiltrosEvento, MonthEnum, RelatorioPedido, StatusTarefa,
+    TipoRelatorio, Unidade
+)
+from service.assinatura import assinatura
+from service.evento_service import aplicar_filtros, juntar_aprovacao
+from service.export_service import gerar_xlsx, select_planilha
+from service.precos import PRECOS, custo_expr
+from service.relatorio_pdf import renderizar_relatorio_unidade
+
+PASTA = Path(os.getenv("TAREFAS_PASTA", Path(tempfile.gettempdir()) / "sead_relatorios"))
+TTL = float(os.getenv("RELATORIOS_TTL_SEGUNDOS", "3600"))
+PROCESSOS = int(os.getenv("TAREFAS_PROCESSOS", str(min(4, os.cpu_count() or 1))))
+SIMULTANEAS = int(os.getenv("TAREFAS_SIMULTANEAS", str(max(PROCESSOS, 1))))
+
+EXTENSOES = {TipoRelatorio.PDF_UNIDADE: "pdf", TipoRelatorio.XLSX: "xlsx"}
+MEDIA_TYPES = {
+    TipoRelatorio.PDF_UNIDADE: "application/pdf",
+    TipoRelatorio.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+SIGLAS_SERVICOS = {
+    "coffee_break_manha": "CBM", "coffee_break_tarde": "CBT", "almoco": "ALM", "jantar": "JAN", "cerimonial": "CER"
+}
+ORDEM_MESES = {mes: posicao for posicao, mes in enumerate(MonthEnum)}
+
+logger = logging.getLogger("sead.tarefas")
+
+
+class Tarefa:
+    __slots__ = ("id", "tipo", "status", "criada_em", "concluida_em", "do_cache", "arquivo", "tamanho", "erro",
+                 "caminho")
+
+    def __init__(self, tipo: TipoRelatorio, caminho: str, arquivo: str, **campos):
+        self.id = campos.get("id") or uuid.uuid4().hex
+        self.tipo = TipoRelatorio(tipo)
+        self.status = StatusTarefa(campos.get("status", StatusTarefa.PENDENTE))
+        self.criada_em = campos.get("criada_em") or datetime.utcnow()
+        self.concluida_em = campos.get("concluida_em")
+        self.do_cache = campos.get("do_cache", False)
+        self.arquivo = arquivo
+        self.tamanho = campos.get("tamanho")
+        self.erro = campos.get("erro")
+        self.caminho = caminho
+
+    def para_dict(self) -> dict:
+        """Formato TarefaRead"""
+        return {campo: getattr(self, campo) for campo in self.__slots__ if campo != "caminho"}
+
+    @classmethod
+    def de_dict(cls, dados: dict) -> "Tarefa":
+        for campo in ("criada_em", "concluida_em"):
+            if dados.get(campo):
+                dados[campo] = datetime.fromisoformat(dados[campo])
+        return cls(**dados)
+
+
+def nome_arquivo(pedido: RelatorioPedido) -> str:
+    """Nome sugerido no download"""
+    if pedido.tipo == TipoRelatorio.PDF_UNIDADE:
+        return f"eventos_unidade_{pedido.filtros.unidade_id}.pdf"
+    return "eventos.xlsx"
+
+
+async def assinatura_dados(session) -> list:
+    """Muda a cada escrita em evento, aprovação ou unidade (service/assinatura.py)"""
+    return list(await assinatura(("evento", "eventoaprovado", "unidade"), session))
+
+
+def chave_pedido(pedido: RelatorioPedido, assinatura: list) -> str:
+    conteudo = orjson.dumps(
+        [pedido.tipo, pedido.filtros.model_dump(mode="json"), assinatura,
+         [preco.model_dump() for preco in PRECOS.values()]],
+        default=str,
+    )
+    return hashlib.blake2b(conteudo, digest_size=16).hexdigest()
+
+
+async def dados_relatorio_unidade(filtros: FiltrosEvento) -> dict:
+    """Linhas do PDF da unidade, só com tipos simples (vão para outro processo)"""
+    statement = select(
+        Evento.nome,
+        Evento.mes_previsto,
+        Evento.quantidade_pessoas,
+        *[getattr(Evento, servico) for servico in SIGLAS_SERVICOS],
+        Evento.aprovado,
+        custo_expr(Evento),
+        case((EventoAprovado.id.is_not(None), custo_expr(EventoAprovado)), else_=None),
+    ).select_from(Evento)
+    statement = aplicar_filtros(juntar_aprovacao(statement), filtros).order_by(Evento.id)
+    async with AsyncSession(engine) as session:
+        unidade = await session.get(Unidade, filtros.unidade_id)
+        rows = (await session.exec(statement)).all()
+    eventos = [
+        (nome, mes.value, pessoas, *servicos, aprovado, float(custo),
+         None if custo_aprovado is None else float(custo_aprovado))
+        for nome, mes, pessoas, *servicos, aprovado, custo, custo_aprovado in sorted(
+            rows, key=lambda row: ORDEM_MESES[row.mes_previsto]
+        )
+    ]
+    return {
+        "unidade": unidade.nome_unidade if unidade else f"Unidade {filtros.unidade_id}",
+        "gerado_em": datetime.now().strftime("%d/%m/%Y %H:%M"),
+        "meses": [mes.value for mes in MonthEnum],
+        "servicos": {sigla: PRECOS[servico].descricao for servico, sigla in SIGLAS_SERVICOS.items()},
+        "eventos": eventos,
+    }
+
+
+class FilaTarefas:
+    def __init__(self, pasta: Path, ttl: float, processos: int, simultaneas: int):
+        self.pasta_arquivos = pasta / "arquivos"
+        self.pasta_tarefas = pasta / "tarefas"
+        self.ttl = ttl
+        self.processos = processos
+        self.simultaneas = simultaneas
+        self.tarefas: Dict[str, Tarefa] = {}
+        self.em_andamento: Dict[str, Tarefa] = {}
+        self.acertos_cache = 0
+        self.geradas = 0
+        self.erros = 0
+        self.removidos = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._execucoes: set[asyncio.Task] = set()
+
+    def _caminho_tarefa(self, tarefa_id: str) -> Path:
+        return self.pasta_tarefas / f"{tarefa_id}.json"
+
+    def _salvar(self, tarefa: Tarefa) -> None:
+        """Grava o estado da tarefa (arquivo temporário + rename: quem lê nunca vê metade)"""
+        self.pasta_tarefas.mkdir(parents=True, exist_ok=True)
+        destino = self._caminho_tarefa(tarefa.id)
+        temporario = destino.with_suffix(".tmp")
+        temporario.write_bytes(orjson.dumps({**tarefa.para_dict(), "caminho": tarefa.caminho}))
+        os.replace(temporario, destino)
+
+    def _valido(self, caminho: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(caminho) < self.ttl
+        except OSError:
+            return False
+
+    async def enviar(self, session, pedido: RelatorioPedido) -> Tarefa:
+        """Cria a tarefa do pedido; se o arquivo já está em cache ela nasce concluída"""
+        self.limpar()
+        chave = chave_pedido(pedido, await assinatura_dados(session))
+        if chave in self.em_andamento:
+            return self.em_andamento[chave]
+
+        self.pasta_arquivos.mkdir(parents=True, exist_ok=True)
+        caminho = str(self.pasta_arquivos / f"{chave}.{EXTENSOES[pedido.tipo]}")
+        tarefa = Tarefa(pedido.tipo, caminho, nome_arquivo(pedido))
+        self.tarefas[tarefa.id] = tarefa
+        if self._valido(caminho):
+            # O TTL conta da conclusão da tarefa: o arquivo reaproveitado vale de novo por inteiro
+            os.utime(caminho)
+            self.acertos_cache += 1
+            tarefa.status = StatusTarefa.CONCLUIDA
+            tarefa.concluida_em = tarefa.criada_em
+            tarefa.do_cache = True
+            tarefa.tamanho = os.path.getsize(caminho)
+        else:
+            self.em_andamento[chave] = tarefa
+            execucao = asyncio.get_running_loop().create_task(self._executar(chave, tarefa, pedido))
+            self._execucoes.add(execucao)
+            execucao.add_done_callback(self._execucoes.discard)
+        self._salvar(tarefa)
+        return tarefa
+
+    async def _executar(self, chave: str, tarefa: Tarefa, pedido: RelatorioPedido) -> None:
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.simultaneas)
+        # Gera num arquivo parcial: um arquivo pela metade nunca vira acerto de cache
+        parcial = tarefa.caminho + ".parcial"
+        try:
+            async with self._semaforo:
+                tarefa.status = StatusTarefa.EXECUTANDO
+                self._salvar(tarefa)
+                await GERADORES[pedido.tipo](self, pedido.filtros, parcial)
+                os.replace(parcial, tarefa.caminho)
+                # O TTL do arquivo conta da conclusão, não da última escrita no parcial
+                os.utime(tarefa.caminho)
+                tarefa.tamanho = os.path.getsize(tarefa.caminho)
+                tarefa.status = StatusTarefa.CONCLUIDA
+                self.geradas += 1
+        except Exception as erro:
+            logger.exception("Falha ao gerar o relatório %s (%s)", tarefa.id, pedido.tipo.value)
+            tarefa.status = StatusTarefa.ERRO
+            tarefa.erro = str(erro) or type(erro).__name__
+            self.erros += 1
+        finally:
+            if tarefa.status in (StatusTarefa.PENDENTE, StatusTarefa.EXECUTANDO):
+                # Cancelada pelo encerrar() (CancelledError não passa pelo except): sem isso
+                # o .json ficaria "executando" para sempre para os outros workers
+                tarefa.status = StatusTarefa.ERRO
+                tarefa.erro = "Geração interrompida: a API foi encerrada"
+                self.erros += 1
+            if tarefa.status == StatusTarefa.ERRO and os.path.exists(parcial):
+                os.remove(parcial)
+            tarefa.concluida_em = datetime.utcnow()
+            self.em_andamento.pop(chave, None)
+            self._salvar(tarefa)
+
+    async def renderizar(self, funcao, *args):
+        """Executa `funcao` no pool de processos (ou numa thread, com TAREFAS_PROCESSOS=0)"""
+        loop = asyncio.get_running_loop()
+        if self.processos <= 0:
+            return await loop.run_in_executor(None, funcao, *args)
+        if self._pool is None:
+            # spawn: o processo da API tem threads (driver do banco, to_thread) que fork não copiaria
+            self._pool = ProcessPoolExecutor(self.processos, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            return await loop.run_in_executor(self._pool, funcao, *args)
+        except BrokenProcessPool:
+            # Um processo morreu (ex.: falta de memória): o próximo relatório cria um pool novo
+            self._pool = None
+            raise
+
+    def obter(self, tarefa_id: str) -> Optional[Tarefa]:
+        """Tarefa deste processo ou, pelo .json, de outro worker do mesmo host"""
+        tarefa = self.tarefas.get(tarefa_id)
+        if tarefa is not None:
+            return tarefa
+        if not tarefa_id.isalnum():
+            return None
+        try:
+            return Tarefa.de_dict(orjson.loads(self._caminho_tarefa(tarefa_id).read_bytes()))
+        except (OSError, ValueError):
+            return None
+
+    def arquivo_disponivel(self, tarefa: Tarefa) -> bool:
+        return tarefa.status == StatusTarefa.CONCLUIDA and self._valido(tarefa.caminho)
+
+    def limpar(self) -> None:
+        """Remove arquivos e tarefas concluídas há mais de TTL segundos.
+
+        O .json é regravado na conclusão, então a idade dele conta da conclusão.
+        O arquivo parcial e o .json das tarefas em andamento ficam, mesmo numa
+        geração mais longa que o TTL.
+        """
+        gerando = set()
+        for tarefa in self.em_andamento.values():
+            gerando.update((tarefa.caminho + ".parcial", str(self._caminho_tarefa(tarefa.id))))
+        for pasta in (self.pasta_arquivos, self.pasta_tarefas):
+            if not pasta.is_dir():
+                continue
+            for entrada in os.scandir(pasta):
+                if entrada.path in gerando or self._valido(entrada.path):
+                    continue
+                try:
+                    os.remove(entrada.path)
+                    self.removidos += 1
+                except OSError:
+                    pass
+        limite = datetime.utcnow() - timedelta(seconds=self.ttl)
+        for tarefa_id, tarefa in list(self.tarefas.items()):
+            if tarefa.concluida_em is not None and tarefa.concluida_em < limite:
+                del self.tarefas[tarefa_id]
+
+    def encerrar(self) -> None:
+        for execucao in self._execucoes:
+            execucao.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def snapshot(self) -> dict:
+        arquivos = [entrada for entrada in os.scandir(self.pasta_arquivos)] if self.pasta_arquivos.is_dir() else []
+        return {
+            "processos": self.processos,
+            "simultaneas": self.simultaneas,
+            "ttl_segundos": self.ttl,
+            "pendentes": sum(t.status == StatusTarefa.PENDENTE for t in self.em_andamento.values()),
+            "executando": sum(t.status == StatusTarefa.EXECUTANDO for t in self.em_andamento.values()),
+            "geradas": self.geradas,
+            "erros": self.erros,
+            "acertos_cache": self.acertos_cache,
+            "arquivos": len(arquivos),
+            "bytes": sum(entrada.stat().st_size for entrada in arquivos),
+            "removidos": self.removidos,
+        }
+
+
+async def gerar_pdf_unidade(fila: FilaTarefas, filtros: FiltrosEvento, destino: str) -> None:
+    dados = await dados_relatorio_unidade(filtros)
+    await fila.renderizar(renderizar_relatorio_unidade, dados, destino)
+
+
+async def gerar_planilha(fila: FilaTarefas, filtros: FiltrosEvento, destino: str) -> None:
+    await gerar_xlsx(aplicar_filtros(select_planilha(), filtros), destino)
+
+
+GERADORES = {
+    TipoRelatorio.PDF_UNIDADE: gerar_pdf_unidade,
+    TipoRelatorio.XLSX: gerar_planilha,
+}
+
+fila_tarefas = FilaTarefas(PASTA, TTL, PROCESSOS, SIMULTANEAS)
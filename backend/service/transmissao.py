@@ -0,0 +1,187 @@
+"""Transmissão dos totais mensais por Server-Sent Events (GET /api/eventos/stream/resumo).
+
+Ao conectar, o cliente recebe o retrato atual ("resumo") e, depois, só as
+diferenças por mês ("delta": eventos, pessoas e custo, por variante).
+
+- Depois de cada escrita confirmada, os routers chamam `hub_resumo.notificar()`.
+  O hub relê os totais de resumomensal numa única consulta, compartilhada por
+  todos os clientes, e escritas próximas (SSE_AGRUPAR_MS) viram uma releitura só.
+- Cliente parado não gera consulta: o retrato vem da memória do hub.
+- Cada cliente tem uma fila limitada (SSE_FILA mensagens). Quem enche a fila
+  é desconectado; o EventSource reconecta e recebe um retrato novo.
+- Com vários workers cada processo tem o seu hub: escritas de outro processo
+  aparecem na releitura periódica (SSE_RELEITURA_SEGUNDOS, 0 desliga).
+
+O cliente aplica apenas deltas com seq maior que o do retrato recebido.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+import orjson
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db import engine
+from models import ResumoMensal
+from service.precos import custo_resumo
+
+TAMANHO_FILA = int(os.getenv("SSE_FILA", "32"))
+AGRUPAR = float(os.getenv("SSE_AGRUPAR_MS", "100")) / 1000
+RELEITURA = float(os.getenv("SSE_RELEITURA_SEGUNDOS", "30"))
+KEEPALIVE = float(os.getenv("SSE_KEEPALIVE_SEGUNDOS", "15"))
+
+CAMPOS = ("eventos", "pessoas", "custo")
+COMENTARIO_KEEPALIVE = b": keepalive\n\n"
+
+logger = logging.getLogger("sead.sse")
+
+
+def formatar_sse(evento: str, dados: dict, seq: int) -> bytes:
+    return b"event: %s\nid: %d\ndata: %s\n\n" % (evento.encode(), seq, orjson.dumps(dados))
+
+
+def diferencas(antigos: dict, novos: dict) -> dict:
+    """{variante: {mês: {campo: diferença}}} só dos meses que mudaram"""
+    deltas = {}
+    for variante in antigos.keys() | novos.keys():
+        meses_antigos = antigos.get(variante, {})
+        meses_novos = novos.get(variante, {})
+        for mes in meses_antigos.keys() | meses_novos.keys():
+            antes = meses_antigos.get(mes, {})
+            depois = meses_novos.get(mes, {})
+            delta = {campo: round(depois.get(campo, 0) - antes.get(campo, 0), 2) for campo in CAMPOS}
+            if any(delta.values()):
+                deltas.setdefault(variante, {})[mes] = delta
+    return deltas
+
+
+class HubResumo:
+    def __init__(self):
+        self.assinantes: set[asyncio.Queue] = set()
+        self.totais: Optional[dict] = None
+        self.seq = 0
+        self.descartados = 0
+        self.releituras = 0
+        self._agendado = False
+        self._lock = asyncio.Lock()
+        self._tarefas: set[asyncio.Task] = set()
+        self._manutencao: Optional[asyncio.Task] = None
+
+    async def _ler_totais(self) -> dict:
+        statement = select(
+            ResumoMensal.variante,
+            ResumoMensal.mes_previsto,
+            func.sum(ResumoMensal.eventos),
+            func.sum(ResumoMensal.pessoas),
+            func.sum(custo_resumo(ResumoMensal)),
+        ).group_by(ResumoMensal.variante, ResumoMensal.mes_previsto)
+        async with AsyncSession(engine) as session:
+            rows = (await session.exec(statement)).all()
+        totais = {}
+        for variante, mes, eventos, pessoas, custo in rows:
+            if eventos:
+                totais.setdefault(variante.value, {})[mes.value] = {
+                    "eventos": int(eventos), "pessoas": int(pessoas), "custo": round(float(custo), 2)
+                }
+        return totais
+
+    async def atualizar(self) -> None:
+        """Relê os totais e publica as diferenças para todos os clientes"""
+        async with self._lock:
+            novos = await self._ler_totais()
+            self.releituras += 1
+            if self.totais is not None:
+                deltas = diferencas(self.totais, novos)
+                if deltas:
+                    self.seq += 1
+                    self.publicar(formatar_sse("delta", {"seq": self.seq, "deltas": deltas}, self.seq))
+            self.totais = novos
+
+    def publicar(self, mensagem: bytes) -> None:
+        for fila in list(self.assinantes):
+            try:
+                fila.put_nowait(mensagem)
+            except asyncio.QueueFull:
+                self._descartar(fila)
+
+    def _descartar(self, fila: asyncio.Queue) -> None:
+        """Desconecta o cliente lento: esvazia a fila e deixa só o sinal de fim"""
+        self.assinantes.discard(fila)
+        self.descartados += 1
+        while not fila.empty():
+            fila.get_nowait()
+        fila.put_nowait(None)
+
+    def _iniciar(self, coro) -> asyncio.Task:
+        tarefa = asyncio.get_running_loop().create_task(coro)
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+        return tarefa
+
+    def notificar(self) -> None:
+        """Chamado depois do commit de uma escrita; não bloqueia a requisição"""
+        if not self.assinantes:
+            # Ninguém ouvindo: o próximo cliente relê os totais ao conectar
+            self.totais = None
+            return
+        if not self._agendado:
+            self._agendado = True
+            self._iniciar(self._atualizar_agrupado())
+
+    async def _atualizar_agrupado(self) -> None:
+        await asyncio.sleep(AGRUPAR)
+        self._agendado = False
+        try:
+            await self.atualizar()
+        except Exception:
+            logger.exception("Falha ao reler os totais do resumo")
+
+    async def _manter(self) -> None:
+        """Enquanto houver clientes: keepalive para todos e releitura periódica.
+
+        O keepalive passa pelas mesmas filas, então conexões mortas também
+        acabam descartadas; um único timer serve todos os clientes.
+        """
+        ultima_releitura = time.monotonic()
+        while self.assinantes:
+            await asyncio.sleep(KEEPALIVE)
+            self.publicar(COMENTARIO_KEEPALIVE)
+            if RELEITURA > 0 and time.monotonic() - ultima_releitura >= RELEITURA and self.assinantes:
+                ultima_releitura = time.monotonic()
+                await self._atualizar_agrupado()
+
+    async def assinar(self):
+        """Stream de um cliente: retrato inicial, deltas e keepalives"""
+        if self.totais is None:
+            await self.atualizar()
+        fila = asyncio.Queue(maxsize=TAMANHO_FILA)
+        # Retrato e inscrição sem await entre eles: nenhum delta fica de fora
+        inicial = formatar_sse("resumo", {"seq": self.seq, "totais": self.totais}, self.seq)
+        self.assinantes.add(fila)
+        if self._manutencao is None or self._manutencao.done():
+            self._manutencao = self._iniciar(self._manter())
+        try:
+            yield inicial
+            while True:
+                mensagem = await fila.get()
+                if mensagem is None:
+                    break
+                yield mensagem
+        finally:
+            self.assinantes.discard(fila)
+
+    def snapshot(self) -> dict:
+        return {
+            "clientes": len(self.assinantes),
+            "max_fila": TAMANHO_FILA,
+            "seq": self.seq,
+            "releituras": self.releituras,
+            "descartados": self.descartados,
+        }
+
+
+hub_resumo = HubResumo()
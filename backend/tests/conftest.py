@@ -0,0 +1,114 @@
+"""Configuração comum dos testes (a partir de backend/: python -m pytest -q tests).
+
+Os testes usam um banco SQLite temporário; com TEST_DATABASE_URL rodam
+contra outro banco (ex.: um Postgres descartável, que é apagado). Cada
+módulo de teste começa com o banco vazio e com os caches em memória limpos.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+PASTA = tempfile.mkdtemp(prefix="sead_testes_")
+ARQUIVO_BANCO = os.path.join(PASTA, "testes.db")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{ARQUIVO_BANCO}"
+os.environ["TAREFAS_PASTA"] = os.path.join(PASTA, "relatorios")
+os.environ.setdefault("TAREFAS_PROCESSOS", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from db import engine  # noqa: E402
+from main import app  # noqa: E402
+from service.busca_unidades import indice as indice_unidades  # noqa: E402
+from service.cache import cache, versoes  # noqa: E402
+from service.resumo_service import verificar_resumo  # noqa: E402
+from service.transmissao import hub_resumo  # noqa: E402
+
+
+def _apagar_banco() -> None:
+    if engine.dialect.name == "sqlite":
+        if os.path.exists(ARQUIVO_BANCO):
+            os.remove(ARQUIVO_BANCO)
+        return
+
+    async def apagar():
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+        await engine.dispose()
+
+    asyncio.run(apagar())
+
+
+def _limpar_memoria() -> None:
+    cache.clear()
+    versoes.clear()
+    indice_unidades.__init__()
+    hub_resumo.totais = None
+
+
+@pytest.fixture(scope="module")
+def client():
+    """App com banco vazio (as tabelas são criadas pelo lifespan)"""
+    _apagar_banco()
+    _limpar_memoria()
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def rodar(client):
+    """Executa uma corrotina no event loop do app (o engine assíncrono é ligado a ele)"""
+    return lambda funcao, *args: client.portal.call(funcao, *args)
+
+
+@pytest.fixture
+def comandos():
+    """Comandos SQL executados enquanto o fixture está ativo"""
+    executados = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        executados.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", registrar)
+    yield executados
+    event.remove(engine.sync_engine, "before_cursor_execute", registrar)
+
+
+def formulario(unidade: str, eventos: int, mes: str = "Março", **servicos) -> dict:
+    """FormSubmissionData com `eventos` eventos da unidade"""
+    return {
+        "nome_unidade": unidade,
+        "nome_solicitante": f"Solicitante {unidade}",
+        "eventos": [
+            {
+                "nome": f"Evento {unidade} {i}",
+                "unidade_responsavel": unidade,
+                "nome_solicitante": f"Solicitante {unidade}",
+                "quantidade_pessoas": 10 + i,
+                "mes_previsto": mes,
+                "coffee_break_manha": servicos.get("coffee_break_manha", i % 2 == 0),
+                "coffee_break_tarde": servicos.get("coffee_break_tarde", False),
+                "almoco": servicos.get("almoco", i % 3 == 0),
+                "jantar": servicos.get("jantar", False),
+                "cerimonial": servicos.get("cerimonial", False),
+            }
+            for i in range(eventos)
+        ],
+    }
+
+
+async def divergencias() -> list:
+    """Diferenças entre resumomensal e o recálculo completo (vazia = consistente)"""
+    async with AsyncSession(engine) as session:
+        return await verificar_resumo(session)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(PASTA, ignore_errors=True)
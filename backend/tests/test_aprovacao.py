@@ -0,0 +1,49 @@
+"""POST /api/eventos/aprovados: validação da entrada e upsert da aprovação."""
+from sqlalchemy import text
+
+from conftest import divergencias, formulario
+from db import engine
+
+
+async def aprovacoes() -> list:
+    async with engine.connect() as conn:
+        return (await conn.execute(text(
+            "SELECT id, evento_id, quantidade_pessoas, almoco FROM eventoaprovado ORDER BY id"
+        ))).all()
+
+
+def test_entrada_validada(client):
+    client.post("/api/eventos/lote", json=[formulario("Aprovação Entrada", 1)])
+    evento_id = client.get("/api/eventos").json()[0]["id"]
+
+    # Id em texto é convertido (antes gravava e falhava com KeyError depois do commit)
+    resposta = client.post("/api/eventos/aprovados", json={"evento_id": str(evento_id)})
+    assert resposta.status_code == 200 and resposta.json()["success"]
+
+    assert client.post("/api/eventos/aprovados", json={"evento_id": "doze"}).status_code == 422
+    assert client.post("/api/eventos/aprovados", json={}).status_code == 422
+    assert client.post("/api/eventos/aprovados", json={"evento_id": evento_id, "quantidade_pessoas": 0}).status_code == 422
+    assert client.post("/api/eventos/aprovados", json={"evento_id": 999999}).status_code == 404
+
+
+def test_reaprovacao_substitui_a_anterior(client, rodar):
+    client.post("/api/eventos/lote", json=[formulario("Aprovação Upsert", 2, almoco=False)])
+    evento = client.get("/api/eventos", params={"limit": 1000}).json()[-1]
+
+    primeira = client.post("/api/eventos/aprovados", json={"evento_id": evento["id"]}).json()
+    aprovado_id = primeira["data"]["evento_aprovado_id"]
+    linha = [a for a in rodar(aprovacoes) if a.evento_id == evento["id"]]
+    # Campos omitidos ficam com o valor solicitado
+    assert [(a.id, a.quantidade_pessoas, a.almoco) for a in linha] == [
+        (aprovado_id, evento["quantidade_pessoas"], False)
+    ]
+
+    segunda = client.post(
+        "/api/eventos/aprovados", json={"evento_id": evento["id"], "quantidade_pessoas": 3, "almoco": True}
+    ).json()
+    assert segunda["data"]["evento_aprovado_id"] == aprovado_id
+    linha = [a for a in rodar(aprovacoes) if a.evento_id == evento["id"]]
+    assert [(a.id, a.quantidade_pessoas, a.almoco) for a in linha] == [(aprovado_id, 3, True)]
+
+    assert client.get(f"/api/eventos/{evento['id']}").json()["aprovado"] is True
+    assert rodar(divergencias) == []
@@ -0,0 +1,82 @@
+"""GET /api/eventos/search: busca textual por prefixo, relevância e paginação."""
+import pytest
+
+from conftest import formulario
+from db import engine
+from service.paginacao import NEXT_CURSOR_HEADER
+
+
+def cadastrar(client, unidade: str, *eventos: tuple[str, str, str, str]) -> None:
+    """Eventos (nome, unidade responsável, solicitante, mês) de uma unidade"""
+    dados = formulario(unidade, len(eventos))
+    for evento, (nome, responsavel, solicitante, mes) in zip(dados["eventos"], eventos):
+        evento.update(nome=nome, unidade_responsavel=responsavel, nome_solicitante=solicitante, mes_previsto=mes)
+    assert client.post("/api/eventos/lote", json=[dados]).json()["success"]
+
+
+def buscar(client, q: str, **params) -> list[str]:
+    resposta = client.get("/api/eventos/search", params={"q": q, **params})
+    assert resposta.status_code == 200, resposta.text
+    return [e["nome"] for e in resposta.json()]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def eventos(client):
+    cadastrar(
+        client, "Busca Saúde",
+        ("Saúde em Foco", "Gabinete", "Ana", "Março"),
+        ("Reunião de planejamento anual do gabinete", "Secretaria de Saúde", "Ana", "Março"),
+        ("Seminário de Saúde Mental", "Gabinete", "Ana", "Abril"),
+        ("Formatura", "Escola de Governo", "Saulo", "Abril"),
+    )
+
+
+def test_prefixo_sem_acentos_e_todas_as_palavras(client):
+    assert set(buscar(client, "saud")) == {
+        "Saúde em Foco", "Reunião de planejamento anual do gabinete", "Seminário de Saúde Mental"
+    }
+    assert buscar(client, "semin") == ["Seminário de Saúde Mental"]
+    assert buscar(client, "SEMINARIO saude") == ["Seminário de Saúde Mental"]
+    assert buscar(client, "saude formatura") == []
+    # Solicitante também entra na busca
+    assert buscar(client, "saulo") == ["Formatura"]
+    assert buscar(client, "!!!") == []
+
+
+def test_relevancia_e_filtros(client):
+    # Termo no nome (peso maior) antes do termo só na unidade responsável
+    resultado = buscar(client, "saude")
+    assert resultado.index("Saúde em Foco") < resultado.index("Reunião de planejamento anual do gabinete")
+    assert resultado[-1] == "Reunião de planejamento anual do gabinete"
+    assert buscar(client, "saude", mes="Abril") == ["Seminário de Saúde Mental"]
+
+
+def test_paginacao_segue_a_relevancia(client):
+    completo = buscar(client, "saude")
+    paginas, params = [], {"limit": 1}
+    while True:
+        resposta = client.get("/api/eventos/search", params={"q": "saude", **params})
+        paginas.extend(e["nome"] for e in resposta.json())
+        if NEXT_CURSOR_HEADER not in resposta.headers:
+            break
+        params = {"limit": 1, "cursor": resposta.headers[NEXT_CURSOR_HEADER]}
+    assert paginas == completo
+
+
+def test_indice_acompanha_alteracoes(client):
+    evento = next(e for e in client.get("/api/eventos").json() if e["nome"] == "Formatura")
+    assert client.put(f"/api/eventos/{evento['id']}", json={"nome": "Colação de grau"}).json()["success"]
+    assert buscar(client, "formatura") == []
+    assert buscar(client, "colacao") == ["Colação de grau"]
+
+    assert client.delete(f"/api/eventos/{evento['id']}").json()["success"]
+    assert buscar(client, "colacao") == []
+
+
+def test_sqlite_usa_fts5(client, comandos):
+    if engine.dialect.name != "sqlite":
+        pytest.skip("caminho FTS5 do SQLite")
+    buscar(client, "saude")
+    consultas = [sql for sql in comandos if "MATCH" in sql]
+    assert len(consultas) == 1
+    assert "evento_fts" in consultas[0] and "bm25" in consultas[0]
@@ -0,0 +1,65 @@
+"""Cache de respostas GET: ETag/304 e invalidação por escritas da API e direto no banco."""
+from datetime import datetime
+
+from sqlalchemy import text
+
+from conftest import formulario
+from db import engine
+
+
+async def inserir_unidade_direto(nome: str) -> None:
+    """Escrita que não passa pelos routers (script, outro worker)"""
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO unidade (nome_unidade, created_at) VALUES (:nome, :agora)"),
+            {"nome": nome, "agora": datetime.utcnow()},
+        )
+
+
+async def alterar_resumo_direto() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("UPDATE resumomensal SET eventos = eventos + 1"))
+
+
+def nomes(response) -> list:
+    return [unidade["nome_unidade"] for unidade in response.json()]
+
+
+def test_etag_e_304(client):
+    client.post("/api/unidades/", json={"nome_unidade": "Cache A"})
+    primeira = client.get("/api/unidades/")
+    assert primeira.status_code == 200
+    etag = primeira.headers["etag"]
+
+    segunda = client.get("/api/unidades/", headers={"If-None-Match": etag})
+    assert segunda.status_code == 304
+    assert segunda.headers["etag"] == etag
+    assert client.get("/api/unidades/").content == primeira.content
+
+
+def test_escrita_pela_api_invalida(client):
+    etag = client.get("/api/unidades/").headers["etag"]
+    client.post("/api/unidades/", json={"nome_unidade": "Cache B"})
+    resposta = client.get("/api/unidades/", headers={"If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert "Cache B" in nomes(resposta)
+
+
+def test_escrita_direto_no_banco_invalida(client, rodar):
+    etag = client.get("/api/unidades/").headers["etag"]
+    rodar(inserir_unidade_direto, "Cache Fora da API")
+    resposta = client.get("/api/unidades/", headers={"If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert "Cache Fora da API" in nomes(resposta)
+
+
+def test_resumo_alterado_direto_no_banco_invalida_estatisticas(client, rodar):
+    client.post("/api/eventos", json=formulario("Cache Stats", 2))
+    antes = client.get("/api/eventos/stats/resumo")
+    assert client.get("/api/eventos/stats/resumo", headers={"If-None-Match": antes.headers["etag"]}).status_code == 304
+
+    # Ex.: `python -m service.resumo_service reconstruir` em outro processo
+    rodar(alterar_resumo_direto)
+    depois = client.get("/api/eventos/stats/resumo", headers={"If-None-Match": antes.headers["etag"]})
+    assert depois.status_code == 200
+    assert depois.json()["total_eventos"] == antes.json()["total_eventos"] + 1
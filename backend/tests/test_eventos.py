@@ -0,0 +1,38 @@
+"""Listagem de eventos: o número de comandos SQL por requisição não depende
+de quantos eventos (unidades, aprovações) são devolvidos.
+"""
+from conftest import formulario
+
+
+def contar(client, comandos, url: str) -> tuple[int, list]:
+    comandos.clear()
+    response = client.get(url, params={"limit": 500})
+    assert response.status_code == 200
+    return len(comandos), response.json()
+
+
+URLS = ("/api/eventos", "/api/eventos/mes/Março")
+
+
+def test_comandos_por_listagem_nao_dependem_do_numero_de_eventos(client, comandos):
+    response = client.post("/api/eventos/lote", json=[formulario("Unidade Teste", 1)])
+    assert response.json()["success"]
+    com_um = {}
+    for url in URLS:
+        com_um[url], eventos = contar(client, comandos, url)
+        assert len(eventos) == 1
+        assert com_um[url] >= 1  # não veio do cache de respostas
+
+    # Mais eventos, espalhados por várias unidades e metade deles aprovados
+    response = client.post("/api/eventos/lote", json=[formulario(f"Unidade {u}", 10) for u in range(5)])
+    assert response.json()["success"]
+    ids = [e["id"] for e in client.get("/api/eventos", params={"limit": 500}).json()]
+    aprovacoes = [{"evento_id": evento_id, "quantidade_pessoas": 5} for evento_id in ids[::2]]
+    assert client.post("/api/eventos/aprovados/lote", json=aprovacoes).json()["success"]
+
+    for url in URLS:
+        com_varios, eventos = contar(client, comandos, url)
+        assert len(eventos) == 51
+        assert len({e["unidade"]["id"] for e in eventos}) == 6
+        assert sum(e["quantidade_pessoas"] == 5 for e in eventos) == 26
+        assert com_varios == com_um[url], (url, com_um[url], com_varios)
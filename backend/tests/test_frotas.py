@@ -0,0 +1,131 @@
+"""Frotas: placa normalizada e única, pendências de manutenção/limpeza e a migração do índice de placas."""
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from conftest import PASTA
+from models import Veiculo
+from service.frotas_service import dias_desde, normalizar_placa
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def veiculo(placa: str, km_restantes: int, dias_limpeza: float, **campos) -> dict:
+    return {
+        "modelo": f"Modelo {placa}",
+        "placa": placa,
+        "quilometragem": 10000,
+        "proxima_manutencao": 10000 + km_restantes,
+        "ultima_limpeza": (datetime.utcnow() - timedelta(days=dias_limpeza)).isoformat(),
+        **campos,
+    }
+
+
+def test_normalizar_placa():
+    assert normalizar_placa("abc-1d23") == "ABC1D23"
+    assert normalizar_placa(" ABC 1234 ") == "ABC1234"
+    assert normalizar_placa("ABC1234") == "ABC1234"
+
+
+def test_cadastro_normaliza_e_recusa_placa_repetida(client):
+    resposta = client.post("/api/frotas", json=veiculo("abc-1234", 5000, 1))
+    assert resposta.status_code == 200
+    assert resposta.json()["placa"] == "ABC1234"
+
+    repetida = client.post("/api/frotas", json=veiculo("ABC 1234", 5000, 1))
+    assert repetida.status_code == 409
+    assert "ABC1234" in repetida.json()["detail"]
+
+    assert client.post("/api/frotas", json=veiculo("NEG0001", 5000, 1, quilometragem=-1)).status_code == 422
+    assert [v["placa"] for v in client.get("/api/frotas").json()] == ["ABC1234"]
+
+
+def test_pendencias_ordenadas_por_urgencia(client):
+    client.post("/api/frotas", json=veiculo("KMV0001", -10, 1))      # manutenção vencida
+    client.post("/api/frotas", json=veiculo("KMP0002", 500, 2))      # manutenção próxima
+    client.post("/api/frotas", json=veiculo("LMP0003", 5000, 27))    # limpeza próxima (faltam 3 dias)
+    client.post("/api/frotas", json=veiculo("LMV0004", 5000, 40))    # limpeza vencida
+    client.post("/api/frotas", json=veiculo("EMD0005", 5000, 10))    # em dia
+
+    pendencias = client.get("/api/frotas/pendencias").json()
+    assert [p["placa"] for p in pendencias] == ["LMV0004", "KMV0001", "KMP0002", "LMP0003"]
+
+    por_placa = {p["placa"]: p for p in pendencias}
+    assert por_placa["LMV0004"]["limpeza"] == "vencida"
+    assert por_placa["LMV0004"]["manutencao"] == "em_dia"
+    assert por_placa["LMV0004"]["dias_desde_limpeza"] == 40
+    assert por_placa["LMV0004"]["urgencia"] == -2
+    assert por_placa["KMV0001"]["manutencao"] == "vencida"
+    assert por_placa["KMV0001"]["km_restantes"] == -10
+    assert por_placa["KMP0002"]["manutencao"] == "proxima"
+    assert por_placa["KMP0002"]["limpeza"] == "em_dia"
+    assert por_placa["LMP0003"]["limpeza"] == "proxima"
+    assert por_placa["LMP0003"]["dias_desde_limpeza"] == 27
+
+    # Margens maiores incluem o veículo em dia; o limite corta os menos urgentes
+    placas = [p["placa"] for p in client.get("/api/frotas/pendencias?margem_km=6000").json()]
+    assert "EMD0005" in placas and "ABC1234" in placas
+    assert [p["placa"] for p in client.get("/api/frotas/pendencias?limit=2").json()] == ["LMV0004", "KMV0001"]
+
+
+def test_dias_desde_por_dialeto():
+    agora = datetime(2026, 3, 1)
+    postgres = dias_desde(Veiculo.ultima_limpeza, agora, "postgresql").compile(dialect=postgresql.dialect())
+    assert "EXTRACT(epoch FROM %(param_1)s - veiculo.ultima_limpeza) /" in str(postgres)
+    assert list(postgres.params.values()) == [agora, 86400]
+
+    sql_sqlite = str(dias_desde(Veiculo.ultima_limpeza, agora, "sqlite").compile(dialect=sqlite.dialect()))
+    assert "julianday(veiculo.ultima_limpeza)" in sql_sqlite
+
+
+def migrar_frota(placas: list[str]) -> tuple[subprocess.CompletedProcess, str]:
+    """Cria veiculo como antes de c9e4a1f7b352 (sem índice único) e aplica a migração"""
+    arquivo = os.path.join(PASTA, "migracao_frotas.db")
+    if os.path.exists(arquivo):
+        os.remove(arquivo)
+    with sqlite3.connect(arquivo) as conn:
+        conn.execute(
+            "CREATE TABLE veiculo (id INTEGER PRIMARY KEY, modelo VARCHAR(255), placa VARCHAR(10), "
+            "quilometragem INTEGER, proxima_manutencao INTEGER, ultima_limpeza DATETIME)"
+        )
+        conn.executemany(
+            "INSERT INTO veiculo (modelo, placa, quilometragem, proxima_manutencao, ultima_limpeza) "
+            "VALUES ('Modelo', ?, 0, 1000, '2026-01-01 00:00:00')",
+            [(placa,) for placa in placas],
+        )
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{arquivo}"}
+
+    def alembic(*args):
+        return subprocess.run(
+            [sys.executable, "-m", "alembic", *args],
+            cwd=BACKEND, env=env, capture_output=True, text=True, timeout=120,
+        )
+
+    assert alembic("stamp", "b3d8f2a6c415").returncode == 0
+    return alembic("upgrade", "c9e4a1f7b352"), arquivo
+
+
+def test_migracao_para_com_placas_repetidas():
+    resultado, arquivo = migrar_frota(["abc-1234", "ABC 1234", "XYZ9876"])
+    assert resultado.returncode != 0
+    assert "ABC1234: veículo 1 (placa 'abc-1234')" in resultado.stderr
+    assert "ABC1234: veículo 2 (placa 'ABC 1234')" in resultado.stderr
+    assert "XYZ9876" not in resultado.stderr
+    # Nada foi removido nem alterado
+    with sqlite3.connect(arquivo) as conn:
+        assert conn.execute("SELECT placa FROM veiculo ORDER BY id").fetchall() == [
+            ("abc-1234",), ("ABC 1234",), ("XYZ9876",)
+        ]
+
+
+def test_migracao_normaliza_placas():
+    resultado, arquivo = migrar_frota(["abc-1234", "xyz 9876"])
+    assert resultado.returncode == 0, resultado.stderr
+    with sqlite3.connect(arquivo) as conn:
+        assert conn.execute("SELECT placa FROM veiculo ORDER BY id").fetchall() == [("ABC1234",), ("XYZ9876",)]
+        indices = {nome for (nome,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"ix_veiculo_placa", "ix_veiculo_ultima_limpeza", "ix_veiculo_km_restantes"} <= indices
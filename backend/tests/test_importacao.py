@@ -0,0 +1,142 @@
+"""Importação de eventos por CSV/XLSX (POST /api/eventos/importar e importar.py)."""
+import csv
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+from openpyxl import Workbook
+
+from conftest import PASTA, divergencias
+from db import engine
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CABECALHO = ["nome", "unidade_responsavel", "nome_solicitante", "quantidade_pessoas", "mes_previsto", "almoco",
+             "Unidade"]
+
+
+def texto_csv(linhas: list[list], cabecalho=CABECALHO, delimitador=",") -> bytes:
+    saida = io.StringIO()
+    writer = csv.writer(saida, delimiter=delimitador)
+    writer.writerow(cabecalho)
+    writer.writerows(linhas)
+    return saida.getvalue().encode()
+
+
+def importar(client, nome: str, conteudo: bytes, **params):
+    return client.post("/api/eventos/importar", params=params, files={"arquivo": (nome, conteudo)})
+
+
+def nomes_eventos(client) -> set:
+    return {e["nome"] for e in client.get("/api/eventos", params={"limit": 5000}).json()}
+
+
+def test_csv_com_erros_por_linha(client, rodar):
+    conteudo = texto_csv([
+        ["Posse", "Gabinete", "Ana", "30", "Março", "sim", "Import Gabinete"],
+        ["Sem pessoas", "Gabinete", "Ana", "0", "Março", "não", "Import Gabinete"],
+        ["Mês errado", "Gabinete", "Ana", "10", "Marte", "", "Import Gabinete"],
+        ["Sem unidade", "Gabinete", "Ana", "10", "Abril", "", ""],
+        ["", "Gabinete", "Ana", "10", "Abril", "x", "Import Gabinete"],
+        ["Seminário", "Ensino", "Bia", "12", "4", "talvez", "Import Ensino"],
+        ["Formatura", "Ensino", "Bia", "80", "abril", "x", "Import Ensino"],
+    ])
+    resposta = importar(client, "eventos.csv", conteudo).json()
+    assert resposta["success"]
+    dados = resposta["data"]
+    assert dados["importados"] == 2 and dados["rejeitados"] == 5
+    assert sorted(dados["unidades_criadas"]) == ["Import Ensino", "Import Gabinete"]
+
+    erros = {erro["linha"]: " | ".join(erro["erros"]) for erro in dados["erros"]}
+    assert sorted(erros) == [3, 4, 5, 6, 7]
+    assert "quantidade_pessoas" in erros[3]
+    assert "Mês inválido: Marte" in erros[4]
+    assert "nome_unidade: Field required" in erros[5]
+    assert erros[6].startswith("nome:")
+    assert erros[7].startswith("almoco:")
+
+    assert {"Posse", "Formatura"} <= nomes_eventos(client)
+    assert rodar(divergencias) == []
+
+
+def test_coluna_unidade_obrigatoria(client):
+    sem_unidade = texto_csv([["Posse", "Gabinete", "Ana", "30", "Março", "sim"]], cabecalho=CABECALHO[:-1])
+    resposta = importar(client, "eventos.csv", sem_unidade)
+    assert resposta.status_code == 400
+    assert "nome_unidade" in resposta.json()["detail"]
+
+    assert importar(client, "eventos.txt", b"qualquer coisa").status_code == 400
+    assert importar(client, "eventos.xlsx", b"nao e xlsx").status_code == 400
+
+
+def test_xlsx_e_simulacao(client, rodar):
+    workbook = Workbook()
+    workbook.active.title = "Resumo"
+    workbook.active.append(["Mês", "Total"])
+    aba = workbook.create_sheet("Maio")
+    aba.append(["Nome do evento", "Unidade responsável", "Solicitante", "Pessoas", "Mês", "Almoço", "Unidade"])
+    aba.append(["Palestra XLSX", "Gabinete", "Caio", 25, "Maio", "Sim", "Import Gabinete"])
+    aba.append([2025, "Gabinete", "Caio", 15, 5, "Não", "Import Gabinete"])
+    aba.append(["Inválido XLSX", "Gabinete", "Caio", -3, "Maio", "Não", "Import Gabinete"])
+    conteudo = io.BytesIO()
+    workbook.save(conteudo)
+
+    simulado = importar(client, "planilha.xlsx", conteudo.getvalue(), simular="true").json()["data"]
+    assert simulado["importados"] == 2 and simulado["rejeitados"] == 1
+    assert "Palestra XLSX" not in nomes_eventos(client)
+
+    dados = importar(client, "planilha.xlsx", conteudo.getvalue()).json()["data"]
+    assert dados["importados"] == 2
+    assert dados["erros"] == [{"aba": "Maio", "linha": 4, "erros": ["quantidade_pessoas: deve ser maior que zero"]}]
+    assert {"Palestra XLSX", "2025"} <= nomes_eventos(client)
+    assert rodar(divergencias) == []
+
+
+def test_insert_em_lote_fora_do_postgres(client, comandos):
+    if engine.dialect.name == "postgresql":
+        pytest.skip("no Postgres a gravação usa COPY (test_copy_no_postgres)")
+    linhas = [[f"Lote {i}", "Gabinete", "Ana", "10", "Junho", "", "Import Gabinete"] for i in range(30)]
+    assert importar(client, "lote.csv", texto_csv(linhas)).json()["data"]["importados"] == 30
+    inserts = [sql for sql in comandos if sql.lstrip().upper().startswith("INSERT INTO EVENTO ")]
+    assert len(inserts) == 1
+
+
+def test_copy_no_postgres(client, rodar):
+    if engine.dialect.name != "postgresql":
+        pytest.skip("COPY só existe no Postgres")
+    linhas = [[f"Copy {i}", "Gabinete", "Ana", str(10 + i), "Julho", "sim", "Import Gabinete"] for i in range(50)]
+    dados = importar(client, "copy.csv", texto_csv(linhas, delimitador=";")).json()["data"]
+    assert dados["importados"] == 50
+    eventos = [e for e in client.get("/api/eventos", params={"limit": 5000}).json() if e["nome"].startswith("Copy ")]
+    assert len(eventos) == 50 and {e["mes_previsto"] for e in eventos} == {"Julho"}
+    assert rodar(divergencias) == []
+
+    # Ids reservados na sequence: um insert comum depois do COPY não colide
+    assert client.post("/api/eventos", json={
+        "nome": "Depois do COPY", "unidade_responsavel": "Gabinete", "nome_solicitante": "Ana",
+        "quantidade_pessoas": 5, "mes_previsto": "Julho",
+    }).json()["success"]
+
+
+def test_linha_de_comando(client):
+    antes = nomes_eventos(client)  # resposta em cache
+    arquivo = os.path.join(PASTA, "cli.csv")
+    relatorio = os.path.join(PASTA, "cli_erros.csv")
+    with open(arquivo, "wb") as saida:
+        saida.write(texto_csv([
+            ["Pela CLI", "Gabinete", "Ana", "10", "Agosto", "", "Import CLI"],
+            ["Rejeitado CLI", "Gabinete", "Ana", "10", "Agosto", "", ""],
+        ]))
+    resultado = subprocess.run(
+        [sys.executable, "importar.py", arquivo, "--erros", relatorio],
+        cwd=BACKEND, env=os.environ.copy(), capture_output=True, text=True, timeout=120,
+    )
+    assert resultado.returncode == 0, resultado.stderr
+    assert "1 eventos importados" in resultado.stdout
+    with open(relatorio, newline="", encoding="utf-8") as entrada:
+        assert list(csv.reader(entrada)) == [["aba", "linha", "erros"], ["", "3", "nome_unidade: Field required"]]
+
+    # A CLI grava direto no banco: o cache da API percebe pela assinatura do banco
+    assert "Pela CLI" not in antes
+    assert nomes_eventos(client) == antes | {"Pela CLI"}
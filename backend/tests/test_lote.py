@@ -0,0 +1,63 @@
+"""PATCH/DELETE /api/eventos: operações em lote por ids e por filtros."""
+from conftest import divergencias, formulario
+
+
+def eventos(client, **filtros) -> list:
+    return client.get("/api/eventos", params={"limit": 1000, **filtros}).json()
+
+
+def unidade_id(client, nome: str) -> int:
+    return client.get(f"/api/unidades/nome/{nome}").json()["id"]
+
+
+def test_selecao_vazia_e_recusada(client):
+    assert client.patch("/api/eventos", json={"selecao": {}, "valores": {"jantar": True}}).status_code == 400
+    assert client.request("DELETE", "/api/eventos", json={}).status_code == 400
+    resposta = client.patch("/api/eventos", json={"selecao": {"ids": [1]}, "valores": {}})
+    assert resposta.status_code == 400
+
+
+def test_atualizacao_por_ids_e_por_filtro(client, rodar):
+    client.post("/api/eventos/lote", json=[formulario("Lote A", 5, jantar=False), formulario("Lote B", 4, jantar=False)])
+    ids = [e["id"] for e in eventos(client)]
+
+    resposta = client.patch("/api/eventos", json={"selecao": {"ids": ids[:2]}, "valores": {"jantar": True}}).json()
+    assert resposta["success"] and sorted(resposta["data"]["ids"]) == ids[:2]
+    assert [e["id"] for e in eventos(client) if e["jantar"]] == ids[:2]
+
+    # Por filtro: o mês muda, então o filtro deixa de valer depois do UPDATE
+    lote_b = unidade_id(client, "Lote B")
+    resposta = client.patch("/api/eventos", json={
+        "selecao": {"unidade_id": lote_b, "mes": "Março"}, "valores": {"mes_previsto": "Agosto"},
+    }).json()
+    assert resposta["data"]["atualizados"] == 4
+    assert {e["unidade_id"] for e in eventos(client, mes="Agosto")} == {lote_b}
+    assert rodar(divergencias) == []
+
+    # aprovado=true aprova com os valores solicitados; aprovado=false desfaz
+    resposta = client.patch("/api/eventos", json={"selecao": {"mes": "Agosto"}, "valores": {"aprovado": True}})
+    assert resposta.json()["data"]["atualizados"] == 4
+    aprovados = client.get("/api/eventos/stats/resumo/aprovados").json()
+    assert aprovados["eventos_por_mes"] == {"Agosto": 4}
+    assert rodar(divergencias) == []
+
+    client.patch("/api/eventos", json={"selecao": {"unidade_id": lote_b, "aprovado": True}, "valores": {"aprovado": False}})
+    assert client.get("/api/eventos/stats/resumo/aprovados").json()["eventos_por_mes"] == {}
+    assert rodar(divergencias) == []
+
+
+def test_remocao_por_ids_e_por_filtro(client, rodar):
+    client.post("/api/eventos/lote", json=[formulario("Remover", 6), formulario("Manter", 3, mes="Maio")])
+    ids = [e["id"] for e in eventos(client, unidade_id=unidade_id(client, "Remover"))]
+    client.post("/api/eventos/aprovados/lote", json=[{"evento_id": evento_id} for evento_id in ids])
+    antes = len(eventos(client))
+
+    resposta = client.request("DELETE", "/api/eventos", json={"ids": ids[:2]}).json()
+    assert resposta["success"] and sorted(resposta["data"]["ids"]) == ids[:2]
+    assert len(eventos(client)) == antes - 2
+
+    resposta = client.request("DELETE", "/api/eventos", json={"unidade_id": unidade_id(client, "Remover")}).json()
+    assert sorted(resposta["data"]["ids"]) == ids[2:]
+    assert all(e["unidade"]["nome_unidade"] != "Remover" for e in eventos(client))
+    assert rodar(divergencias) == []
+
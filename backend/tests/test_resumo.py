@@ -0,0 +1,71 @@
+"""resumomensal: mantido a cada escrita e conferido/reconstruído pela linha de comando."""
+import os
+import subprocess
+import sys
+
+from sqlalchemy import text
+
+from conftest import divergencias, formulario
+from db import engine
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def corromper_resumo() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("UPDATE resumomensal SET eventos = eventos + 5, pessoas_almoco = pessoas_almoco + 1"))
+
+
+def linha_de_comando(acao: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "service.resumo_service", acao],
+        cwd=BACKEND, env=os.environ.copy(), capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_resumo_acompanha_as_escritas(client, rodar):
+    assert client.post("/api/eventos/lote", json=[formulario("Unidade A", 4), formulario("Unidade B", 3)]).json()["success"]
+    assert rodar(divergencias) == []
+    ids = [e["id"] for e in client.get("/api/eventos").json()]
+
+    # Alteração de valores e de mês (a contribuição muda de linha no resumo)
+    assert client.put(f"/api/eventos/{ids[0]}", json={"quantidade_pessoas": 99, "jantar": True}).json()["success"]
+    assert client.put(f"/api/eventos/{ids[1]}", json={"mes_previsto": "Julho"}).json()["success"]
+    assert rodar(divergencias) == []
+
+    # Aprovação, reaprovação com outros valores e aprovação em lote
+    aprovacao = {"evento_id": ids[2], "quantidade_pessoas": 7}
+    assert client.post("/api/eventos/aprovados", json=aprovacao).json()["success"]
+    assert client.post("/api/eventos/aprovados", json={**aprovacao, "quantidade_pessoas": 8, "almoco": True}).json()["success"]
+    lote = [{"evento_id": evento_id} for evento_id in ids[3:6]]
+    assert client.post("/api/eventos/aprovados/lote", json=lote).json()["success"]
+    assert rodar(divergencias) == []
+
+    stats = client.get("/api/eventos/stats/resumo/aprovados").json()
+    assert sum(stats["eventos_por_mes"].values()) == 4
+
+    # Desaprovação pelo PUT e remoção
+    assert client.put(f"/api/eventos/{ids[3]}", json={"aprovado": False}).json()["success"]
+    assert client.delete(f"/api/eventos/{ids[2]}").json()["success"]
+    assert client.delete(f"/api/eventos/{ids[4]}").json()["success"]
+    assert rodar(divergencias) == []
+
+    stats = client.get("/api/eventos/stats/resumo").json()
+    assert sum(stats["eventos_por_mes"].values()) == len(ids) - 2
+    stats = client.get("/api/eventos/stats/resumo/aprovados").json()
+    assert sum(stats["eventos_por_mes"].values()) == 1
+
+
+def test_linha_de_comando_verifica_e_reconstroi(client, rodar):
+    client.post("/api/eventos/lote", json=[formulario("Unidade CLI", 3, cerimonial=True)])
+    assert linha_de_comando("verificar").returncode == 0
+
+    rodar(corromper_resumo)
+    resultado = linha_de_comando("verificar")
+    assert resultado.returncode == 1
+    assert "divergência(s) encontrada(s)" in resultado.stdout
+    assert rodar(divergencias) != []
+
+    assert linha_de_comando("reconstruir").returncode == 0
+    assert linha_de_comando("verificar").returncode == 0
+    assert rodar(divergencias) == []
@@ -0,0 +1,121 @@
+"""GET /api/eventos/changes: tokens, paginação, tombstones e retenção."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from conftest import formulario
+from db import engine
+from service import sincronizacao
+from service.sincronizacao import decode_token, encode_token
+
+
+def alteracoes(client, token=None, limit=100) -> dict:
+    params = {"limit": limit}
+    if token:
+        params["since"] = token
+    resposta = client.get("/api/eventos/changes", params=params)
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()
+
+
+def sincronizar(client, token=None, limit=100) -> tuple[dict, set, str]:
+    """Segue as páginas até mais=false: (eventos por id, removidos, token final)"""
+    eventos, removidos = {}, set()
+    while True:
+        pagina = alteracoes(client, token, limit)
+        eventos.update({e["id"]: e for e in pagina["eventos"]})
+        removidos.update(r["evento_id"] for r in pagina["removidos"])
+        token = pagina["token"]
+        if not pagina["mais"]:
+            return eventos, removidos, token
+
+
+@pytest.fixture
+def sem_margem(monkeypatch):
+    monkeypatch.setattr(sincronizacao, "MARGEM_SYNC", timedelta(0))
+
+
+def test_tokens_nao_passam_da_margem(client):
+    client.post("/api/eventos/lote", json=[formulario("Sync Margem", 5)])
+    antes = datetime.utcnow()
+
+    # Os eventos acabaram de ser gravados: a página intermediária também recua a margem
+    pagina = alteracoes(client, limit=2)
+    assert pagina["mais"]
+    horario, ultimo_id = decode_token(pagina["token"])
+    assert horario <= antes - sincronizacao.MARGEM_SYNC + timedelta(seconds=1)
+    assert ultimo_id == 0
+    # ...e os mesmos eventos vêm de novo na chamada seguinte
+    assert [e["id"] for e in alteracoes(client, pagina["token"], 2)["eventos"]] == [e["id"] for e in pagina["eventos"]]
+
+    final = alteracoes(client)
+    assert not final["mais"]
+    assert decode_token(final["token"])[0] <= datetime.utcnow() - sincronizacao.MARGEM_SYNC
+
+
+def test_paginacao_entrega_todos_os_eventos(client, sem_margem):
+    client.post("/api/eventos/lote", json=[formulario("Sync Paginas", 7)])
+    todos = {e["id"] for e in client.get("/api/eventos", params={"limit": 1000}).json()}
+
+    eventos, removidos, token = sincronizar(client, limit=2)
+    assert set(eventos) == todos
+    assert removidos == set()
+
+    # Nada mudou: a próxima sincronização não traz nada
+    eventos, removidos, _ = sincronizar(client, token, limit=2)
+    assert eventos == {} and removidos == set()
+
+
+def test_tombstones(client, sem_margem):
+    client.post("/api/eventos/lote", json=[formulario("Sync Remocao", 3)])
+    _, _, token = sincronizar(client)
+    ids = [e["id"] for e in client.get("/api/eventos", params={"limit": 1000}).json()]
+
+    assert client.delete(f"/api/eventos/{ids[0]}").json()["success"]
+    eventos, removidos, token = sincronizar(client, token)
+    assert removidos == {ids[0]}
+    assert ids[0] not in eventos
+
+    # A carga completa não traz tombstones
+    eventos, removidos, _ = sincronizar(client)
+    assert removidos == set()
+    assert ids[0] not in eventos and ids[1] in eventos
+
+
+def test_retencao_dos_tombstones(client, rodar):
+    antigo = datetime.utcnow() - sincronizacao.RETENCAO_REMOVIDOS - timedelta(days=1)
+    resposta = client.get("/api/eventos/changes", params={"since": encode_token(antigo)})
+    assert resposta.status_code == 410
+
+    async def tombstones():
+        async with engine.begin() as conn:
+            return (await conn.execute(text("SELECT evento_id FROM eventoremovido ORDER BY evento_id"))).scalars().all()
+
+    async def tombstone_antigo():
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("INSERT INTO eventoremovido (evento_id, removido_at) VALUES (-1, :antigo)"), {"antigo": antigo}
+            )
+
+    rodar(tombstone_antigo)
+    assert -1 in rodar(tombstones)
+    client.post("/api/eventos/lote", json=[formulario("Sync Retencao", 1)])
+    evento_id = client.get("/api/eventos", params={"limit": 1000}).json()[-1]["id"]
+    assert client.delete(f"/api/eventos/{evento_id}").json()["success"]
+
+    restantes = rodar(tombstones)
+    assert -1 not in restantes and evento_id in restantes
+
+
+def test_renomear_unidade_reenvia_os_eventos(client, sem_margem):
+    client.post("/api/eventos/lote", json=[formulario("Sync Nome Antigo", 2), formulario("Sync Outra", 2)])
+    _, _, token = sincronizar(client)
+    unidade = client.get("/api/unidades/nome/Sync Nome Antigo").json()
+
+    resposta = client.put(f"/api/unidades/{unidade['id']}", json={"nome_unidade": "Sync Nome Novo"}).json()
+    assert resposta["success"]
+    eventos, _, _ = sincronizar(client, token)
+    assert {e["unidade_id"] for e in eventos.values()} == {unidade["id"]}
+    assert len(eventos) == 2
+    assert {e["unidade"]["nome_unidade"] for e in eventos.values()} == {"Sync Nome Novo"}
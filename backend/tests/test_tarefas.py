@@ -0,0 +1,85 @@
+"""Fila de relatórios: limpeza por TTL e reaproveitamento do cache em disco."""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+from models import RelatorioPedido, StatusTarefa, TipoRelatorio
+from service import tarefas
+from service.tarefas import FilaTarefas, Tarefa, fila_tarefas
+
+TTL = 60
+
+
+def envelhecer(caminho, segundos: float = TTL * 2) -> None:
+    antigo = time.time() - segundos
+    os.utime(caminho, (antigo, antigo))
+
+
+def criar_tarefa(fila: FilaTarefas, nome: str, status: StatusTarefa, concluida_em=None) -> Tarefa:
+    fila.pasta_arquivos.mkdir(parents=True, exist_ok=True)
+    tarefa = Tarefa(
+        TipoRelatorio.XLSX, str(fila.pasta_arquivos / f"{nome}.xlsx"), "eventos.xlsx",
+        status=status, concluida_em=concluida_em,
+    )
+    fila.tarefas[tarefa.id] = tarefa
+    fila._salvar(tarefa)
+    envelhecer(fila._caminho_tarefa(tarefa.id))
+    return tarefa
+
+
+def test_limpar_preserva_tarefas_em_andamento(tmp_path, monkeypatch):
+    fila = FilaTarefas(tmp_path, TTL, processos=0, simultaneas=1)
+    antiga = datetime.utcnow() - timedelta(seconds=TTL * 2)
+
+    # Concluída há mais de TTL: sai o arquivo, o .json e a tarefa da memória
+    concluida = criar_tarefa(fila, "concluida", StatusTarefa.CONCLUIDA, concluida_em=antiga)
+    with open(concluida.caminho, "wb") as arquivo:
+        arquivo.write(b"xlsx")
+    envelhecer(concluida.caminho)
+
+    # Geração mais longa que o TTL: o parcial e o .json da tarefa ficam velhos durante a execução
+    executando = criar_tarefa(fila, "executando", StatusTarefa.PENDENTE)
+    durante = {}
+
+    async def gerar_devagar(fila_, filtros, destino):
+        with open(destino, "wb") as arquivo:
+            arquivo.write(b"xlsx")
+        envelhecer(destino)
+        envelhecer(fila._caminho_tarefa(executando.id))
+        fila.limpar()
+        durante["parcial"] = os.path.exists(destino)
+        durante["tarefa"] = fila._caminho_tarefa(executando.id).exists()
+
+    monkeypatch.setitem(tarefas.GERADORES, TipoRelatorio.XLSX, gerar_devagar)
+    fila.em_andamento["chave"] = executando
+    asyncio.run(fila._executar("chave", executando, RelatorioPedido(tipo=TipoRelatorio.XLSX)))
+
+    assert durante == {"parcial": True, "tarefa": True}
+    assert not os.path.exists(concluida.caminho)
+    assert not fila._caminho_tarefa(concluida.id).exists()
+    assert concluida.id not in fila.tarefas
+
+    # O TTL do arquivo e do .json conta da conclusão
+    fila.limpar()
+    assert executando.status == StatusTarefa.CONCLUIDA
+    assert fila.arquivo_disponivel(fila.obter(executando.id))
+
+
+def test_acerto_de_cache_renova_o_prazo(client):
+    pedido = {"tipo": "xlsx"}
+    tarefa = client.post("/api/relatorios", json=pedido).json()
+    for _ in range(100):
+        tarefa = client.get(f"/api/relatorios/{tarefa['id']}").json()
+        if tarefa["status"] != "pendente" and tarefa["status"] != "executando":
+            break
+        time.sleep(0.05)
+    assert tarefa["status"] == "concluida"
+
+    # Arquivo gerado quase no fim do TTL: o pedido igual reaproveita e o prazo recomeça
+    caminho = fila_tarefas.tarefas[tarefa["id"]].caminho
+    envelhecer(caminho, fila_tarefas.ttl - 1)
+    repetida = client.post("/api/relatorios", json=pedido).json()
+    assert repetida["do_cache"] and repetida["status"] == "concluida"
+    assert time.time() - os.path.getmtime(caminho) < 60
+    assert client.get(f"/api/relatorios/{repetida['id']}/download").status_code == 200
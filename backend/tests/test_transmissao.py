@@ -0,0 +1,90 @@
+"""Hub SSE dos totais mensais: descarte de clientes lentos e payload dos deltas."""
+import asyncio
+
+import orjson
+import pytest
+
+from conftest import formulario
+from service.transmissao import TAMANHO_FILA, HubResumo, diferencas, hub_resumo
+
+
+def ler_sse(mensagem: bytes) -> tuple[str, dict]:
+    campos = dict(linha.split(": ", 1) for linha in mensagem.decode().strip().split("\n"))
+    return campos["event"], orjson.loads(campos["data"])
+
+
+def test_diferencas_so_dos_meses_alterados():
+    antigos = {"solicitado": {"Março": {"eventos": 2, "pessoas": 20, "custo": 100.0},
+                              "Abril": {"eventos": 1, "pessoas": 5, "custo": 10.0}}}
+    novos = {"solicitado": {"Março": {"eventos": 3, "pessoas": 30, "custo": 150.5},
+                            "Abril": {"eventos": 1, "pessoas": 5, "custo": 10.0}},
+             "aprovado": {"Maio": {"eventos": 1, "pessoas": 8, "custo": 40.0}}}
+    assert diferencas(antigos, novos) == {
+        "solicitado": {"Março": {"eventos": 1, "pessoas": 10, "custo": 50.5}},
+        "aprovado": {"Maio": {"eventos": 1, "pessoas": 8, "custo": 40.0}},
+    }
+    # Mês que some vira delta negativo
+    assert diferencas(novos, antigos)["aprovado"] == {"Maio": {"eventos": -1, "pessoas": -8, "custo": -40.0}}
+    assert diferencas(antigos, antigos) == {}
+
+
+def test_cliente_lento_e_descartado():
+    async def cenario():
+        hub = HubResumo()
+        hub.totais = {}  # retrato em memória: assinar não consulta o banco
+        lento, rapido = hub.assinar(), hub.assinar()
+        assert ler_sse(await lento.__anext__())[0] == "resumo"
+        assert ler_sse(await rapido.__anext__())[0] == "resumo"
+
+        for seq in range(TAMANHO_FILA):
+            hub.publicar(b"mensagem %d" % seq)
+        for seq in range(TAMANHO_FILA):
+            assert await rapido.__anext__() == b"mensagem %d" % seq
+
+        # A fila do lento está cheia: a próxima mensagem o desconecta, o rápido segue
+        hub.publicar(b"mais uma")
+        assert hub.descartados == 1 and len(hub.assinantes) == 1
+        assert await rapido.__anext__() == b"mais uma"
+        with pytest.raises(StopAsyncIteration):
+            await lento.__anext__()
+
+        await rapido.aclose()
+        assert not hub.assinantes
+        hub._manutencao.cancel()
+
+    asyncio.run(cenario())
+
+
+def test_delta_depois_de_uma_escrita(client, rodar):
+    assinatura = hub_resumo.assinar()
+
+    async def proxima():
+        return ler_sse(await asyncio.wait_for(assinatura.__anext__(), 5))
+
+    evento, inicial = rodar(proxima)
+    assert evento == "resumo"
+
+    client.post("/api/eventos/lote", json=[formulario("SSE", 3, mes="Maio", almoco=True, cerimonial=False)])
+    evento, delta = rodar(proxima)
+    assert evento == "delta"
+    assert delta["seq"] == inicial["seq"] + 1
+    assert list(delta["deltas"]) == ["solicitado"]
+    maio = delta["deltas"]["solicitado"]["Maio"]
+    assert maio["eventos"] == 3 and maio["pessoas"] == 10 + 11 + 12 and maio["custo"] > 0
+
+    # Retrato inicial + delta = retrato novo
+    rodar(assinatura.aclose)
+    nova = hub_resumo.assinar()
+
+    async def retrato():
+        try:
+            return ler_sse(await nova.__anext__())[1]
+        finally:
+            await nova.aclose()
+
+    atual = rodar(retrato)
+    assert atual["seq"] == delta["seq"]
+    anterior = inicial["totais"].get("solicitado", {}).get("Maio", {"eventos": 0, "pessoas": 0, "custo": 0})
+    assert atual["totais"]["solicitado"]["Maio"] == {
+        campo: round(anterior[campo] + maio[campo], 2) for campo in ("eventos", "pessoas", "custo")
+    }
@@ -0,0 +1,84 @@
+"""/api/unidades: listagem completa ou paginada e autocomplete."""
+from datetime import datetime
+
+from sqlalchemy import delete, insert
+
+from db import engine
+from models import Unidade
+from service.paginacao import NEXT_CURSOR_HEADER, PAGE_SIZE
+
+TOTAL = PAGE_SIZE + 20
+
+
+async def inserir_unidades(nomes: list[str]) -> None:
+    async with engine.begin() as conn:
+        agora = datetime.utcnow()
+        await conn.execute(insert(Unidade.__table__), [{"nome_unidade": nome, "created_at": agora} for nome in nomes])
+
+
+def test_listagem_completa_sem_paginacao(client, rodar):
+    rodar(inserir_unidades, [f"Unidade Lista {i:04d}" for i in range(TOTAL)])
+
+    resposta = client.get("/api/unidades/")
+    assert len(resposta.json()) == TOTAL
+    assert NEXT_CURSOR_HEADER not in resposta.headers
+    ids = [u["id"] for u in resposta.json()]
+    assert ids == sorted(ids)
+
+    # Com limit: páginas por id, seguindo X-Next-Cursor
+    paginas, params = [], {"limit": 200}
+    while True:
+        resposta = client.get("/api/unidades/", params=params)
+        paginas.append([u["id"] for u in resposta.json()])
+        if NEXT_CURSOR_HEADER not in resposta.headers:
+            break
+        params = {"limit": 200, "cursor": resposta.headers[NEXT_CURSOR_HEADER]}
+    assert [len(pagina) for pagina in paginas[:-1]] == [200] * (len(paginas) - 1)
+    assert [i for pagina in paginas for i in pagina] == ids
+
+    # Só o cursor: páginas do tamanho padrão
+    resposta = client.get("/api/unidades/", params={"cursor": client.get(
+        "/api/unidades/", params={"limit": 1}
+    ).headers[NEXT_CURSOR_HEADER]})
+    assert len(resposta.json()) == PAGE_SIZE
+
+
+def sugestoes(client, termo: str, limit: int = 10) -> list[str]:
+    resposta = client.get("/api/unidades/autocomplete", params={"q": termo, "limit": limit})
+    return [u["nome_unidade"] for u in resposta.json()]
+
+
+def test_autocomplete_sem_acentos_e_por_relevancia(client, rodar):
+    rodar(inserir_unidades, [
+        "Centro de Saúde da Família", "Secretaria de Saúde", "Saúde Bucal", "Saúde", "Secretaria de Educação",
+    ])
+    assert sugestoes(client, "saude") == ["Saúde", "Saúde Bucal", "Secretaria de Saúde", "Centro de Saúde da Família"]
+    assert sugestoes(client, "SAÚDE b") == ["Saúde Bucal"]
+    # Cada palavra do termo inicia uma palavra do nome
+    assert sugestoes(client, "sec saude") == ["Secretaria de Saúde"]
+    assert sugestoes(client, "educacao") == ["Secretaria de Educação"]
+    # Sem prefixo: trigramas (erro de digitação), o nome mais curto primeiro no empate
+    assert sugestoes(client, "secretria", 1) == ["Secretaria de Saúde"]
+    assert sugestoes(client, "saude", 2) == ["Saúde", "Saúde Bucal"]
+
+
+def test_autocomplete_acompanha_escritas(client, rodar):
+    assert sugestoes(client, "ouvid") == []
+    assert client.post("/api/unidades/", json={"nome_unidade": "Ouvidoria Geral"}).json()["success"]
+    assert sugestoes(client, "ouvid") == ["Ouvidoria Geral"]
+
+    unidade_id = client.get("/api/unidades/nome/Ouvidoria Geral").json()["id"]
+    assert client.put(f"/api/unidades/{unidade_id}", json={"nome_unidade": "Corregedoria"}).json()["success"]
+    assert sugestoes(client, "ouvid") == []
+    assert sugestoes(client, "corregedoria") == ["Corregedoria"]
+
+    # Escrita de outro worker ou de um script, direto no banco
+    rodar(inserir_unidades, ["Procuradoria Jurídica"])
+    assert sugestoes(client, "juridica") == ["Procuradoria Jurídica"]
+
+    async def apagar_direto():
+        async with engine.begin() as conn:
+            await conn.execute(delete(Unidade.__table__).where(Unidade.__table__.c.nome_unidade == "Corregedoria"))
+
+    rodar(apagar_direto)
+    assert sugestoes(client, "corregedoria") == []
@@ -1,5 +1,5 @@
-import React from 'react';
-import type { ApiEventData } from '../services/api';
+import React, { useEffect, useState } from 'react';
+import { apiService, type ApiEventData, type ResumoTotais } from '../services/api';
 import { BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, CartesianGrid } from 'recharts';
 
 interface ContractExecutionProps {
@@ -28,18 +28,25 @@ const ContractExecution: React.FC<ContractExecutionProps> = ({
   contractTotal,
   events
 }) => {
+  // Custos por mês calculados no servidor e atualizados ao vivo (SSE); até o
+  // primeiro retrato chegar, a estimativa sai da lista de eventos
+  const [resumo, setResumo] = useState<ResumoTotais | null>(null);
+  useEffect(() => apiService.subscribeResumo(setResumo), []);
+
+  const custoMes = (month: string, aprovado: boolean) => {
+    if (resumo) {
+      return resumo[aprovado ? 'aprovado' : 'solicitado']?.[month]?.custo ?? 0;
+    }
+    const monthEvents = events.filter(e => e.mes_previsto === month && (!aprovado || e.aprovado));
+    return monthEvents.reduce((sum, e) => sum + calcularCustoEstimado(e), 0);
+  };
+
   // Consumo acumulado mês a mês
   let saldo = contractTotal;
   let saldoAprovado = contractTotal;
   const chartData = monthOrder.map(month => {
-    const monthEvents = events.filter(e => e.mes_previsto === month);
-    const consumed = monthEvents.reduce((sum, e) => sum + calcularCustoEstimado(e), 0);
-
-    const monthApprovedEvents = monthEvents.filter(e => e.aprovado);
-    const approvedConsumed = monthApprovedEvents.reduce((sum, e) => sum + calcularCustoEstimado(e), 0);
-
-    saldo -= consumed;
-    saldoAprovado -= approvedConsumed;
+    saldo -= custoMes(month, false);
+    saldoAprovado -= custoMes(month, true);
 
     return {
       month,
@@ -49,17 +56,12 @@ const ContractExecution: React.FC<ContractExecutionProps> = ({
   });
 
   // Agrupa consumo por mês
-  const consumptions = monthOrder.map(month => {
-    const monthEvents = events.filter(e => e.mes_previsto === month);
-    const consumed = monthEvents.reduce((sum, e) => sum + calcularCustoEstimado(e), 0);
-    return { month, consumed };
-  });
+  const consumptions = monthOrder.map(month => ({ month, consumed: custoMes(month, false) }));
 
   const totalConsumed = consumptions.reduce((sum, m) => sum + m.consumed, 0);
   const contractBalance = contractTotal - totalConsumed;
 
-  const approvedEvents = events.filter(e => e.aprovado);
-  const approvedConsumed = approvedEvents.reduce((sum, e) => sum + calcularCustoEstimado(e), 0);
+  const approvedConsumed = monthOrder.reduce((sum, month) => sum + custoMes(month, true), 0);
   const approvedBalance = contractTotal - approvedConsumed;
 
   return (
@@ -12,8 +12,19 @@ interface Veiculo {
   ultima_limpeza: string; 
 }
 
+type StatusPendencia = "vencida" | "proxima" | "em_dia";
+
+interface VeiculoPendencia extends Veiculo {
+  km_restantes: number;
+  dias_desde_limpeza: number;
+  manutencao: StatusPendencia;
+  limpeza: StatusPendencia;
+  urgencia: number;
+}
+
 const Frotas: React.FC = () => {
   const [veiculos, setVeiculos] = useState<Veiculo[]>([]);
+  const [pendencias, setPendencias] = useState<Record<number, VeiculoPendencia>>({});
   const [form, setForm] = useState({
     modelo: "",
     placa: "",
@@ -25,11 +36,20 @@ const Frotas: React.FC = () => {
   const [loading, setLoading] = useState(false);
   const [feedback, setFeedback] = useState<string | null>(null);
 
+  // Pendências calculadas no servidor (vencidas ou próximas, por urgência)
+  const fetchPendencias = async () => {
+    const res = await apiService.request<VeiculoPendencia[]>("/frotas/pendencias?limit=5000");
+    if (res.success && res.data) {
+      setPendencias(Object.fromEntries(res.data.map((p) => [p.id, p])));
+    }
+  };
+
   useEffect(() => {
     const fetchVeiculos = async () => {
       setLoading(true);
-      const res = await apiService.request<Veiculo[]>("/frotas");
+      const res = await apiService.requestAllPages<Veiculo>("/frotas");
       if (res.success && res.data) setVeiculos(res.data);
+      await fetchPendencias();
       setLoading(false);
     };
     fetchVeiculos();
@@ -55,6 +75,7 @@ const Frotas: React.FC = () => {
     });
     if (res.success && res.data) {
       setVeiculos([...veiculos, res.data]);
+      await fetchPendencias();
       setFeedback("Veículo cadastrado com sucesso!");
     } else {
       setFeedback(res.message || "Erro ao cadastrar veículo.");
@@ -71,13 +92,8 @@ const Frotas: React.FC = () => {
     setTimeout(() => setFeedback(null), 3000);
   };
 
-  const verificarManutencao = (veiculo: Veiculo) => veiculo.quilometragem >= veiculo.proxima_manutencao;
-  const verificarLimpeza = (veiculo: Veiculo) => {
-    const ultima = new Date(veiculo.ultima_limpeza);
-    const hoje = new Date();
-    const diff = hoje.getTime() - ultima.getTime();
-    return diff > 30 * 24 * 60 * 60 * 1000;
-  };
+  const verificarManutencao = (veiculo: Veiculo) => pendencias[veiculo.id]?.manutencao === "vencida";
+  const verificarLimpeza = (veiculo: Veiculo) => pendencias[veiculo.id]?.limpeza === "vencida";
 
   return (
     <div className="frotas-container">
@@ -30,6 +30,7 @@ export interface ApiResponse<T> {
   data?: T;
   message?: string;
   errors?: Record<string, string[]>;
+  nextCursor?: string;
 }
 
 export interface ApiApprovedEventData {
@@ -43,6 +44,15 @@ export interface ApiApprovedEventData {
   cerimonial: boolean;
 }
 
+// Totais por mês do stream /eventos/stream/resumo: variante -> mês -> valores
+export interface ResumoMes {
+  eventos: number;
+  pessoas: number;
+  custo: number;
+}
+
+export type ResumoTotais = Record<string, Record<string, ResumoMes>>;
+
 class ApiService {
   async request<T>(
     endpoint: string, 
@@ -75,6 +85,7 @@ class ApiService {
         return {
           success: true,
           data,
+          nextCursor: response.headers.get('X-Next-Cursor') ?? undefined,
         };
       } catch (error) {
         // Aguarda antes de tentar novamente
@@ -104,6 +115,7 @@ class ApiService {
       return {
         success: true,
         data,
+        nextCursor: response.headers.get('X-Next-Cursor') ?? undefined,
       };
     } catch (error) {
       return {
@@ -120,8 +132,30 @@ class ApiService {
     });
   }
 
+  // Percorre as páginas (keyset) seguindo o header X-Next-Cursor
+  async requestAllPages<T>(endpoint: string, pageSize = 1000): Promise<ApiResponse<T[]>> {
+    const items: T[] = [];
+    let cursor: string | undefined;
+    const separator = endpoint.includes('?') ? '&' : '?';
+
+    do {
+      const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+      const page = await this.request<T[]>(`${endpoint}${separator}limit=${pageSize}${cursorParam}`);
+      if (!page.success) {
+        return page;
+      }
+      items.push(...(page.data || []));
+      cursor = page.nextCursor;
+    } while (cursor);
+
+    return {
+      success: true,
+      data: items,
+    };
+  }
+
   async getEvents(): Promise<ApiResponse<ApiEventData[]>> {
-    return this.request('/eventos');
+    return this.requestAllPages<ApiEventData>('/eventos');
   }
 
   async getEventById(id: string): Promise<ApiResponse<ApiEventData>> {
@@ -142,6 +176,43 @@ class ApiService {
     });
   }
 
+  // Totais mensais ao vivo (SSE): aplica os deltas sobre o retrato inicial e
+  // chama onChange a cada mudança. Retorna a função que fecha a conexão.
+  subscribeResumo(onChange: (totais: ResumoTotais) => void): () => void {
+    const source = new EventSource(`${API_BASE_URL}/eventos/stream/resumo`);
+    let totais: ResumoTotais = {};
+    let seq = 0;
+
+    source.addEventListener('resumo', (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      totais = data.totais;
+      seq = data.seq;
+      onChange(totais);
+    });
+
+    source.addEventListener('delta', (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      if (data.seq <= seq) return;
+      seq = data.seq;
+      const novos: ResumoTotais = { ...totais };
+      for (const [variante, meses] of Object.entries(data.deltas as ResumoTotais)) {
+        novos[variante] = { ...novos[variante] };
+        for (const [mes, delta] of Object.entries(meses)) {
+          const atual = novos[variante][mes] || { eventos: 0, pessoas: 0, custo: 0 };
+          novos[variante][mes] = {
+            eventos: atual.eventos + delta.eventos,
+            pessoas: atual.pessoas + delta.pessoas,
+            custo: atual.custo + delta.custo,
+          };
+        }
+      }
+      totais = novos;
+      onChange(totais);
+    });
+
+    return () => source.close();
+  }
+
   // Método para testar conexão com o backend
   async healthCheck(): Promise<ApiResponse<{ status: string }>> {
     return this.request('/health');